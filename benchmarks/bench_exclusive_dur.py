@@ -0,0 +1,88 @@
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+from typing import Any, Dict, List
+
+from chakra.src.trace_link.chakra_device_trace_loader import ChakraDeviceTraceLoader
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+from tqdm.contrib.concurrent import process_map
+
+
+def make_events(num_ops: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Create a single thread of profiler steps, each holding nested operators down to six levels deep."""
+    rng = random.Random(seed)
+    events: List[Dict[str, Any]] = []
+
+    def add(timestamp: float, dur: float, depth: int) -> None:
+        events.append({"cat": "cpu_op", "name": f"op{depth}", "ts": timestamp, "dur": dur, "tid": 1})
+        child_ts = timestamp
+        for _ in range(rng.randint(1, 4) if depth < 6 else 0):
+            if child_ts + dur / 6 > timestamp + dur:
+                break
+            add(child_ts, dur / 6 * rng.random(), depth + 1)
+            child_ts += dur / 5
+
+    step_ts = 1.7e12
+    while len(events) < num_ops:
+        add(step_ts, 9e4, 0)
+        step_ts += 1e5
+    return events[:num_ops]
+
+
+def pickled_loader(loader: ChakraDeviceTraceLoader, ops_by_tid: Dict[int, List[KinetoOperator]]) -> None:
+    """Run the previous process pool, which pickled the loader and all of its operators into every task chunk."""
+    for tid, ops in ops_by_tid.items():
+        loader.sorted_kineto_ops[tid] = sorted(ops, key=lambda op: (op.timestamp, op.inclusive_dur))
+        exclusive_durs = process_map(
+            loader.get_exclusive_dur_for_op,
+            ((tid, i) for i in range(len(ops))),
+            chunksize=max(1, len(ops) // 1000),
+            total=len(ops),
+            disable=True,
+        )
+        for op, exclusive_dur in zip(loader.sorted_kineto_ops[tid], exclusive_durs):
+            op.exclusive_dur = exclusive_dur
+
+
+def run(mode: str, num_ops: int, queue: multiprocessing.Queue) -> None:
+    ops_by_tid = {1: [KinetoOperator(event) for event in make_events(num_ops)]}
+    loader = ChakraDeviceTraceLoader()
+    start = time.perf_counter()
+    if mode == "pickled":
+        pickled_loader(loader, ops_by_tid)
+    elif mode == "shared":
+        loader.calculate_exclusive_dur(ops_by_tid)
+    else:
+        loader.calculate_exclusive_dur_sweep(ops_by_tid)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    worker_peak_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    queue.put((elapsed, peak_kb / 1e3, worker_peak_kb / 1e3, sum(op.exclusive_dur for op in ops_by_tid[1])))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the exclusive duration calculation of the device loader.")
+    parser.add_argument("--num-ops", type=int, default=10_000, help="Number of Kineto CPU operators")
+    parser.add_argument(
+        "--modes", type=str, default="pickled,shared,sweep", help="Comma-separated implementations to run"
+    )
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for mode in args.modes.split(","):
+        # Every implementation runs in a fresh process so that peak memory is measured separately.
+        queue = context.Queue()
+        process = context.Process(target=run, args=(mode, args.num_ops, queue))
+        process.start()
+        elapsed, peak_mb, worker_peak_mb, total = queue.get()
+        process.join()
+        print(
+            f"{mode:>8}: {elapsed:8.3f} s, peak RSS {peak_mb:8.1f} MB, worker peak RSS {worker_peak_mb:8.1f} MB, "
+            f"total exclusive {total:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import copy
+import os
+import time
+from typing import Any, Dict, List
+
+import orjson
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+from chakra.src.trace_link.trace_linker import TraceLinker
+
+
+def make_cpu_op(op_id: int, num_tensors: int) -> Dict[str, Any]:
+    """Create a host trace node with tensor inputs and outputs and the attributes recorded by PyTorch."""
+    tensors = [[op_id * 100 + i, op_id, 0, 4096, 4, "cuda:0"] for i in range(num_tensors)]
+    return {
+        "id": op_id,
+        "name": "aten::linear",
+        "ctrl_deps": 1,
+        "inputs": {
+            "values": tensors,
+            "shapes": [[64, 1024]] * num_tensors,
+            "types": ["Tensor(c10::BFloat16)"] * num_tensors,
+        },
+        "outputs": {"values": tensors[:1], "shapes": [[64, 1024]], "types": ["Tensor(c10::BFloat16)"]},
+        "attrs": [
+            {"name": name, "type": "uint64", "value": op_id}
+            for name in ("rf_id", "fw_parent", "seq_id", "scope", "tid", "fw_tid", "op_schema")
+        ],
+    }
+
+
+def make_gpu_ops(num_kernels: int) -> List[KinetoOperator]:
+    return [
+        KinetoOperator(
+            {"cat": "kernel", "name": "sm90_xmma_gemm", "ph": "X", "ts": 1000 + i, "dur": 7, "args": {"stream": 7}}
+        )
+        for i in range(num_kernels)
+    ]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def deep_copied_gpu_ops(
+    trace_linker: TraceLinker, cpu_op: Dict[str, Any], gpu_ops: List[KinetoOperator]
+) -> List[Dict[str, Any]]:
+    """Run the previous implementation, which deep copied the CPU operator for every GPU operator."""
+    gpu_nodes = []
+    for gpu_op in sorted(gpu_ops, key=lambda x: x.timestamp):
+        gpu_node = copy.deepcopy(cpu_op)
+        gpu_node.update(
+            {
+                "id": trace_linker.id_assigner.generate_new_id(),
+                "ctrl_deps": cpu_op["id"],
+                "inputs": cpu_op["inputs"],
+                "outputs": cpu_op["outputs"],
+                "cat": gpu_op.category,
+                "name": gpu_op.name,
+                "ph": gpu_op.phase,
+                "inclusive_dur": gpu_op.inclusive_dur,
+                "exclusive_dur": gpu_op.exclusive_dur,
+                "ts": gpu_op.timestamp,
+                "stream": gpu_op.stream,
+            }
+        )
+        gpu_nodes.append(gpu_node)
+    return gpu_nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the synthesis of GPU nodes from their CPU operators.")
+    parser.add_argument("--num-cpu-ops", type=int, default=20_000, help="Number of CPU operators launching kernels")
+    parser.add_argument("--kernels-per-op", type=int, default=10, help="Number of GPU kernels per CPU operator")
+    parser.add_argument("--num-tensors", type=int, default=4, help="Number of input tensors per CPU operator")
+    args = parser.parse_args()
+
+    cpu_ops = [make_cpu_op(op_id, args.num_tensors) for op_id in range(2, args.num_cpu_ops + 2)]
+    gpu_ops = make_gpu_ops(args.kernels_per_op)
+    print(f"{args.num_cpu_ops * args.kernels_per_op:,} GPU nodes")
+
+    results = {}
+    for mode in ("deepcopy", "shallow"):
+        trace_linker = TraceLinker()
+        before = rss_mb()
+        start = time.perf_counter()
+        if mode == "deepcopy":
+            gpu_nodes = [node for op in cpu_ops for node in deep_copied_gpu_ops(trace_linker, op, gpu_ops)]
+        else:
+            gpu_nodes = [
+                node
+                for op in cpu_ops
+                for node in trace_linker.process_dependent_gpu_ops(op, op["id"], {op["id"]: gpu_ops})
+            ]
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>10}: {elapsed:8.3f} s, {rss_mb() - before:8.1f} MB retained")
+        results[mode] = orjson.dumps(gpu_nodes)
+        del gpu_nodes
+    assert results["deepcopy"] == results["shallow"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+from chakra.src.trace_link.cpu_timeline_index import CpuTimelineIndex
+from chakra.src.trace_link.inter_thread_order import enforce_inter_thread_order
+from chakra.src.trace_link.trace_linker import TraceLinker
+
+
+class Op:
+    """Stand-in for KinetoOperator with only the fields read by inter-thread ordering, to fit 10M events in memory."""
+
+    __slots__ = ("timestamp", "inclusive_dur", "category", "rf_id", "name", "inter_thread_dep")
+
+    def __init__(self, timestamp: int, inclusive_dur: int, category: str, rf_id: int) -> None:
+        self.timestamp = timestamp
+        self.inclusive_dur = inclusive_dur
+        self.category = category
+        self.rf_id = rf_id
+        self.name = "aten::op"
+        self.inter_thread_dep: Optional[int] = None
+
+
+def make_ops_by_tid(num_ops: int, num_threads: int, seed: int = 0) -> Dict[int, List[Op]]:
+    """Create threads of back-to-back operators with occasional idle gaps longer than the default threshold."""
+    rng = random.Random(seed)
+    ops_by_tid = {}
+    rf_id = 1
+    for tid in range(1, num_threads + 1):
+        ops = []
+        timestamp = rng.randint(0, 1000)
+        for _ in range(num_ops // num_threads):
+            dur = rng.randint(1, 50)
+            ops.append(Op(timestamp, dur, "cpu_op" if rng.random() < 0.8 else "cuda_runtime", rf_id))
+            timestamp += dur + (rng.randint(1001, 5000) if rng.random() < 0.05 else rng.randint(0, 20))
+            rf_id += 1
+        ops_by_tid[tid] = ops
+    return ops_by_tid
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def per_thread(ops_by_tid: Dict[int, List[Op]]) -> None:
+    """Run the previous implementation, processing every thread on its own against a shared timeline index."""
+    trace_linker = TraceLinker()
+    timeline_index = CpuTimelineIndex(ops_by_tid)
+    for tid, ops in ops_by_tid.items():
+        trace_linker.process_thread_inter_thread_order(tid, ops, ops_by_tid, 1000, timeline_index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized inter-thread ordering.")
+    parser.add_argument(
+        "--sizes", type=str, default="100000,1000000,10000000", help="Comma-separated numbers of Kineto events"
+    )
+    parser.add_argument("--num-threads", type=int, default=16, help="Number of CPU threads")
+    parser.add_argument(
+        "--max-per-thread-size", type=int, default=1_000_000, help="Largest size also run with the per-thread path"
+    )
+    args = parser.parse_args()
+
+    for size in map(int, args.sizes.split(",")):
+        before = rss_mb()
+        ops_by_tid = make_ops_by_tid(size, args.num_threads)
+        print(f"{size:>11,} events ({rss_mb() - before:8.1f} MB of operators)")
+
+        before = rss_mb()
+        start = time.perf_counter()
+        enforce_inter_thread_order(ops_by_tid)
+        print(f"{'vectorized':>16}: {time.perf_counter() - start:8.3f} s, {rss_mb() - before:8.1f} MB retained")
+        vectorized = [op.inter_thread_dep for ops in ops_by_tid.values() for op in ops]
+
+        if size <= args.max_per_thread_size:
+            for ops in ops_by_tid.values():
+                for op in ops:
+                    op.inter_thread_dep = None
+            start = time.perf_counter()
+            per_thread(ops_by_tid)
+            print(f"{'per-thread':>16}: {time.perf_counter() - start:8.3f} s")
+            assert vectorized == [op.inter_thread_dep for ops in ops_by_tid.values() for op in ops]
+        del ops_by_tid, vectorized
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import orjson
+from chakra.src.trace_link.inter_thread_order import compute_inter_thread_deps
+from chakra.src.trace_link.sorted_views import SortedViews
+from chakra.src.trace_link.trace_linker import TraceLinker
+
+
+def make_events(num_events: int, num_threads: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Create threads of parent operators, each starting together with a shorter child, separated by idle gaps."""
+    rng = random.Random(seed)
+    events = []
+    rf_id = 1
+    for tid in range(1, num_threads + 1):
+        timestamp = rng.randint(0, 1000)
+        for _ in range(num_events // num_threads // 2):
+            dur = rng.randint(10, 50)
+            for op_dur in (dur, rng.randint(1, dur)):
+                events.append(
+                    {
+                        "ph": "X",
+                        "cat": "cpu_op",
+                        "name": "aten::op",
+                        "pid": 1,
+                        "tid": tid,
+                        "ts": timestamp,
+                        "dur": op_dur,
+                        "args": {"Record function id": rf_id},
+                    }
+                )
+                rf_id += 1
+            timestamp += dur + (rng.randint(1001, 5000) if rng.random() < 0.05 else rng.randint(0, 20))
+    rng.shuffle(events)
+    return events
+
+
+def best_of(repeats: int, func: Callable[[], Any]) -> float:
+    """Return the shortest wall time of several calls."""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the linking stages sharing the sorted views of the loader.")
+    parser.add_argument("--num-events", type=int, default=1_000_000, help="Number of Kineto CPU operators")
+    parser.add_argument("--num-threads", type=int, default=16, help="Number of CPU threads")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs of each variant, the fastest being reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trace_file = os.path.join(tmp_dir, "kineto.json")
+        with open(trace_file, "wb") as f:
+            f.write(orjson.dumps({"traceEvents": make_events(args.num_events, args.num_threads)}))
+        trace_linker = TraceLinker()
+        device_data = trace_linker.chakra_device_trace_loader.load(trace_file)
+    cpu_ops, ops_by_tid = device_data[0], device_data[1]
+    with trace_linker.stage_timer.stage("inter-thread order"):
+        trace_linker.enforce_inter_thread_order(ops_by_tid, presorted=True)
+    with trace_linker.stage_timer.stage("annotations"):
+        trace_linker.add_thread_and_process_annotations(
+            cpu_ops, device_data[10], device_data[11], device_data[8], device_data[6], device_data[7]
+        )
+    print(f"{args.num_events:,} events in {args.num_threads} threads\n{trace_linker.stage_timer.report()}\n")
+
+    # Each stage previously sorted the operators on its own; it now takes the order from the views.
+    comparisons = {
+        "sorted CPU operators": (
+            lambda: [op.timestamp for op in sorted(cpu_ops, key=lambda op: op.timestamp)],
+            lambda: SortedViews(cpu_ops, ops_by_tid),
+        ),
+        "exclusive duration order": (
+            lambda: [sorted(ops, key=lambda op: (op.timestamp, op.inclusive_dur)) for ops in ops_by_tid.values()],
+            lambda: [SortedViews([], ops_by_tid).ops_by_start_and_dur(tid) for tid in ops_by_tid],
+        ),
+        "inter-thread order": (
+            lambda: compute_inter_thread_deps(ops_by_tid),
+            lambda: compute_inter_thread_deps(ops_by_tid, presorted=True),
+        ),
+    }
+    print(f"{'stage':<26}{'re-sorting':>12}{'sorted views':>14}")
+    for name, (resorting, shared) in comparisons.items():
+        print(f"{name:<26}{best_of(args.repeats, resorting):>10.3f} s{best_of(args.repeats, shared):>12.3f} s")
+
+
+if __name__ == "__main__":
+    main()
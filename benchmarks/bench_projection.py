@@ -0,0 +1,112 @@
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from chakra.schema.protobuf.et_def_pb2 import AttributeProto as ChakraAttr
+from chakra.schema.protobuf.et_def_pb2 import GlobalMetadata
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.et_io.projection import NodeProjection
+from chakra.src.third_party.utils.protolib import DelimitedReader, DelimitedWriter, openFileRd
+
+
+def make_nodes(num_nodes: int) -> List[ChakraNode]:
+    """Create synthetic nodes with the attributes and stringified IOInfo written by the PyTorch converter."""
+    nodes = []
+    for i in range(1, num_nodes + 1):
+        node = ChakraNode(id=i, name=f"aten::op_{i % 97}", type=4, duration_micros=i % 1000)
+        node.data_deps.extend(range(max(1, i - 2), i))
+        node.inputs.values = str([[i, i + 1, 0, 4096 * 1024, 4, "cuda:0"], [i + 2, i + 3, 0, 1024, 4, "cuda:0"], 1])
+        node.inputs.shapes = "[[4096, 1024], [1024], []]"
+        node.inputs.types = "['Tensor(float)', 'Tensor(float)', 'Int']"
+        node.outputs.values = str([[i + 4, i + 5, 0, 4096 * 1024, 4, "cuda:0"]])
+        node.outputs.shapes = "[[4096, 1024]]"
+        node.outputs.types = "['Tensor(float)']"
+        node.attr.extend(
+            [
+                ChakraAttr(name="rf_id", int64_val=i),
+                ChakraAttr(name="fw_parent", int64_val=i - 1),
+                ChakraAttr(name="seq_id", int64_val=i),
+                ChakraAttr(name="scope", int64_val=0),
+                ChakraAttr(name="tid", int64_val=1),
+                ChakraAttr(name="fw_tid", int64_val=0),
+                ChakraAttr(name="op_schema", string_val="aten::addmm(Tensor self, Tensor mat1, Tensor mat2) -> Tensor"),
+                ChakraAttr(name="is_cpu_op", bool_val=True),
+            ]
+        )
+        nodes.append(node)
+    return nodes
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def load_full(path: str) -> list:
+    """Keep the id, type, data_deps, and duration_micros of every node by fully parsing each node."""
+    f = openFileRd(path)
+    frames = iter(DelimitedReader(f))
+    next(frames)
+    records = [
+        (node.id, node.type, node.data_deps[:], node.duration_micros) for node in map(ChakraNode.FromString, frames)
+    ]
+    f.close()
+    return records
+
+
+def load_full_nodes(path: str) -> list:
+    """Keep every fully parsed node."""
+    f = openFileRd(path)
+    frames = iter(DelimitedReader(f))
+    next(frames)
+    nodes = list(map(ChakraNode.FromString, frames))
+    f.close()
+    return nodes
+
+
+def load_projected(path: str) -> list:
+    """Keep the id, type, data_deps, and duration_micros of every node with NodeProjection."""
+    f = openFileRd(path)
+    frames = iter(DelimitedReader(f))
+    next(frames)
+    records = list(NodeProjection().decode_frames(frames))
+    f.close()
+    return records
+
+
+def run(name: str, func: Callable[[str], list], path: str, repeat: int) -> float:
+    best = float("inf")
+    memory = 0.0
+    for _ in range(repeat):
+        before = rss_mb()
+        start = time.perf_counter()
+        records = func(path)
+        best = min(best, time.perf_counter() - start)
+        memory = rss_mb() - before
+        del records
+    print(f"{name:>12}: {best:8.3f} s, {memory:8.1f} MB retained")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark projected node decoding against full parsing.")
+    parser.add_argument("--num-nodes", type=int, default=500_000, help="Number of synthetic nodes to write")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per loader")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "trace.et")
+        with open(path, "wb") as f, DelimitedWriter(f) as writer:
+            writer.write(GlobalMetadata(version="0.0.4"))
+            writer.write_many(make_nodes(args.num_nodes))
+        print(f"{path} ({os.path.getsize(path):,} bytes)")
+        run("full nodes", load_full_nodes, path, args.repeat)
+        full = run("full parse", load_full, path, args.repeat)
+        projected = run("projected", load_projected, path, args.repeat)
+        print(f"{'speedup':>12}: {full / projected:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
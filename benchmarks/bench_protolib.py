@@ -0,0 +1,140 @@
+import argparse
+import gzip
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from chakra.schema.protobuf.et_def_pb2 import AttributeProto as ChakraAttr
+from chakra.schema.protobuf.et_def_pb2 import GlobalMetadata
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.et_io.mmap_reader import MmapEtReader
+from chakra.src.third_party.utils.protolib import (
+    DelimitedReader,
+    DelimitedWriter,
+    _DecodeVarint32,
+    _EncodeVarint32,
+    encodeMessage,
+    openFileRd,
+)
+
+
+def make_nodes(num_nodes: int) -> List[ChakraNode]:
+    """Create synthetic nodes shaped like the output of the PyTorch converter."""
+    nodes = []
+    for i in range(1, num_nodes + 1):
+        node = ChakraNode(id=i, name=f"aten::op_{i % 97}", duration_micros=i % 1000)
+        node.data_deps.extend([i - 1] if i > 1 else [])
+        node.inputs.values = "[[1, 2, 3, 4, 5], 1]"
+        node.inputs.shapes = "[[4096, 1024], []]"
+        node.inputs.types = "['Tensor(float)', 'Int']"
+        node.attr.extend(
+            [
+                ChakraAttr(name="rf_id", int64_val=i),
+                ChakraAttr(name="tid", int64_val=1),
+                ChakraAttr(name="op_schema", string_val="aten::add.Tensor(Tensor self, Tensor other) -> Tensor"),
+            ]
+        )
+        nodes.append(node)
+    return nodes
+
+
+def write_trace(path: str, nodes: List[ChakraNode]) -> None:
+    with gzip.open(path, "wb") if path.endswith(".gz") else open(path, "wb") as f:
+        encodeMessage(f, GlobalMetadata(version="0.0.4"))
+        for node in nodes:
+            encodeMessage(f, node)
+
+
+def read_per_byte(path: str) -> int:
+    """Read a trace with the original one-read-per-varint-byte path."""
+    f = openFileRd(path)
+    node = ChakraNode()
+    count = 0
+    while True:
+        size, _ = _DecodeVarint32(f)
+        if size == 0:
+            break
+        node.ParseFromString(f.read(size))
+        count += 1
+    f.close()
+    return count
+
+
+def read_chunked(path: str) -> int:
+    """Read a trace with DelimitedReader."""
+    f = openFileRd(path)
+    node = ChakraNode()
+    count = 0
+    for frame in DelimitedReader(f):
+        node.ParseFromString(frame)
+        count += 1
+    f.close()
+    return count
+
+
+def read_mmap(path: str) -> int:
+    """Read an uncompressed trace in place with MmapEtReader."""
+    node = ChakraNode()
+    count = 0
+    with MmapEtReader(path) as reader:
+        for frame in reader.iter_frames():
+            node.ParseFromString(frame)
+            count += 1
+    return count
+
+
+def write_per_byte(path: str, nodes: List[ChakraNode]) -> int:
+    """Write a trace with the original one-write-per-varint-byte path."""
+    with gzip.open(path, "wb") if path.endswith(".gz") else open(path, "wb") as f:
+        for node in nodes:
+            serialized = node.SerializeToString()
+            _EncodeVarint32(f, len(serialized))
+            f.write(serialized)
+    return len(nodes)
+
+
+def write_batched(path: str, nodes: List[ChakraNode]) -> int:
+    """Write a trace with DelimitedWriter."""
+    with gzip.open(path, "wb") if path.endswith(".gz") else open(path, "wb") as f, DelimitedWriter(f) as writer:
+        writer.write_many(nodes)
+    return len(nodes)
+
+
+def run(name: str, func: Callable[[str], int], path: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func(path)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:>12}: {best:8.3f} s ({count / best:,.0f} messages/s)")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark protolib length-delimited readers and writers.")
+    parser.add_argument("--num-nodes", type=int, default=200_000, help="Number of synthetic nodes to write")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per reader and writer")
+    args = parser.parse_args()
+
+    nodes = make_nodes(args.num_nodes)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for suffix in (".et", ".et.gz"):
+            path = os.path.join(tmp_dir, "trace" + suffix)
+            write_trace(path, nodes)
+            print(f"{path} ({os.path.getsize(path):,} bytes)")
+            per_byte = run("per-byte", read_per_byte, path, args.repeat)
+            chunked = run("chunked", read_chunked, path, args.repeat)
+            print(f"{'speedup':>12}: {per_byte / chunked:8.2f}x")
+            if not path.endswith(".gz"):
+                mapped = run("mmap", read_mmap, path, args.repeat)
+                print(f"{'speedup':>12}: {per_byte / mapped:8.2f}x")
+
+            write_path = os.path.join(tmp_dir, "written" + suffix)
+            per_byte = run("per-byte wr", lambda p: write_per_byte(p, nodes), write_path, args.repeat)
+            batched = run("batched wr", lambda p: write_batched(p, nodes), write_path, args.repeat)
+            print(f"{'speedup':>12}: {per_byte / batched:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
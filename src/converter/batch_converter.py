@@ -2,8 +2,10 @@ import configargparse as argparse
 import logging
 import sys
 from collections import namedtuple
+from functools import partial
 from pathlib import Path
 
+from ..et_io.trace_cache import DEFAULT_CACHE_MAX_GB, generate_cached, open_trace_cache
 from .pytorch_converter import PyTorchConverter
 
 FilePair = namedtuple("FilePair", ["input_file", "output_file"])
@@ -30,10 +32,24 @@ def setup_logging(log_filename: str) -> None:
     logging.basicConfig(level=level, handlers=handlers)
 
 
-def convert_pytorch(input_file: str, output_file: str, simulate: bool) -> None:
+def convert_pytorch(
+    input_file: str,
+    output_file: str,
+    simulate: bool,
+    block_gzip: bool = False,
+    compress_threads: int = 1,
+    intern_strings: bool = False,
+) -> None:
     """Convert PyTorch input trace to Chakra execution trace."""
     converter = PyTorchConverter()
-    converter.convert(input_file, output_file, simulate)
+    converter.convert(
+        input_file,
+        output_file,
+        simulate,
+        block_gzip=block_gzip,
+        compress_threads=compress_threads,
+        intern_strings=intern_strings,
+    )
 
 
 def find_linked_traces(
@@ -74,6 +90,13 @@ def convert_pytorch_batch(args: argparse.Namespace) -> None:
         )
         sys.exit(-1)
     Path(args.output_directory).mkdir(exist_ok=True, parents=True)
+    cache = open_trace_cache(args.cache_dir, args.cache_max_gb)
+    options = {
+        "compression": args.compression,
+        "block_gzip": args.compression and args.block_gzip,
+        "compress_threads": args.compress_threads,
+        "intern_strings": args.intern_strings,
+    }
     for idx, (trace_name, file_pair) in enumerate(trace_pairs.items()):
         logging.info(
             "Converting file %d of %d: trace_name: '%s', input: '%s', output: '%s'",
@@ -83,7 +106,22 @@ def convert_pytorch_batch(args: argparse.Namespace) -> None:
             file_pair.input_file,
             file_pair.output_file,
         )
-        convert_pytorch(input_file=file_pair.input_file, output_file=file_pair.output_file, simulate=False)
+        generate_cached(
+            cache,
+            "convert",
+            [file_pair.input_file],
+            options,
+            file_pair.output_file,
+            partial(
+                convert_pytorch,
+                input_file=file_pair.input_file,
+                output_file=file_pair.output_file,
+                simulate=False,
+                block_gzip=options["block_gzip"],
+                compress_threads=args.compress_threads,
+                intern_strings=args.intern_strings,
+            ),
+        )
 
 
 def main() -> None:
@@ -126,6 +164,42 @@ def main() -> None:
         required=False,
         help="Whether or not to use compression for the linked traces",
     )
+    parser.add_argument(
+        "--block-gzip",
+        action="store_true",
+        env_var="BLOCK_GZIP",
+        help="Write compressed traces as seekable block-compressed gzip files that can be decompressed in parallel",
+    )
+    parser.add_argument(
+        "--compress-threads",
+        type=int,
+        default=1,
+        env_var="COMPRESS_THREADS",
+        help="Number of threads compressing each output trace; more than one implies --block-gzip",
+    )
+    parser.add_argument(
+        "--intern-strings",
+        action="store_true",
+        env_var="INTERN_STRINGS",
+        help="Store node names and operator schemas once in a string table referred to by code from the nodes",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="",
+        env_var="CACHE_DIR",
+        help=(
+            "Directory of a cache of converted traces keyed by the contents of their inputs and the options. Traces "
+            "whose linked trace and options are unchanged are taken from the cache instead of being converted again"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=DEFAULT_CACHE_MAX_GB,
+        env_var="CACHE_MAX_GB",
+        help="Size of the cache in GB beyond which the least recently used entries are evicted",
+    )
 
     args = parser.parse_args()
     setup_logging(log_filename=args.log_filename)
@@ -33,7 +33,15 @@ def convert_text(args: argparse.Namespace) -> None:
 def convert_pytorch(args: argparse.Namespace) -> None:
     """Convert PyTorch input trace to Chakra execution trace."""
     converter = PyTorchConverter()
-    converter.convert(args.input, args.output, args.simulate)
+    converter.convert(
+        args.input,
+        args.output,
+        args.simulate,
+        args.write_index,
+        args.block_gzip,
+        args.compress_threads,
+        args.intern_strings,
+    )
 
 
 def main() -> None:
@@ -72,6 +80,43 @@ def main() -> None:
             "of a trace. Disabled by default because it takes a long time."
         ),
     )
+    pytorch_parser.add_argument(
+        "--write-index",
+        action="store_true",
+        help=(
+            "Write an offset index sidecar ('<output>.idx') next to the output trace. The index maps node IDs to "
+            "their location in the trace so that tools can read individual nodes or ID ranges without decoding the "
+            "whole file. An index for an existing trace can be built with chakra_indexer."
+        ),
+    )
+    pytorch_parser.add_argument(
+        "--block-gzip",
+        action="store_true",
+        help=(
+            "Write the output trace as a block-compressed gzip file: independent gzip members of a fixed uncompressed "
+            "size followed by a block index. Standard gzip tools read it as usual, while Chakra readers can seek to "
+            "any block and decompress blocks in parallel."
+        ),
+    )
+    pytorch_parser.add_argument(
+        "--compress-threads",
+        type=int,
+        default=1,
+        help=(
+            "Number of threads compressing the output trace. With more than one thread, a '.gz' output is split into "
+            "blocks that are deflated in parallel and written as a multi-member gzip file, which standard gzip tools "
+            "read as usual. This implies --block-gzip."
+        ),
+    )
+    pytorch_parser.add_argument(
+        "--intern-strings",
+        action="store_true",
+        help=(
+            "Store every distinct node name and operator schema once in a string table in the global metadata, and "
+            "refer to it by integer code from the nodes. This shrinks traces in which long operator schemas repeat "
+            "across many nodes. Chakra readers resolve the references transparently."
+        ),
+    )
     pytorch_parser.set_defaults(func=convert_pytorch)
 
     text_parser = subparsers.add_parser(
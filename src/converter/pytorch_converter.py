@@ -1,5 +1,6 @@
 import gzip
 import logging
+import os
 from typing import IO, Dict, List, Optional, Set, Tuple
 
 import orjson
@@ -18,6 +19,11 @@ from ...schema.protobuf.et_def_pb2 import (
 )
 from ...schema.protobuf.et_def_pb2 import AttributeProto as ChakraAttr
 from ...schema.protobuf.et_def_pb2 import Node as ChakraNode
+from ..et_io.block_gzip import BlockGzipWriter
+from ..et_io.et_index import EtIndex, get_index_path
+from ..et_io.string_table import StringTable
+from ..et_io.trace_cache import detach_output
+from ..third_party.utils.protolib import DelimitedWriter
 from ..third_party.utils.protolib import encodeMessage as encode_message
 from .pytorch_node import PyTorchNode, PyTorchNodeType
 
@@ -32,7 +38,16 @@ class PyTorchConverter:
     of dependencies, removal of dangling nodes, and writing the final protobuf trace to the output file.
     """
 
-    def convert(self, input_filename: str, output_filename: str, simulate: bool) -> None:
+    def convert(
+        self,
+        input_filename: str,
+        output_filename: str,
+        simulate: bool,
+        write_index: bool = False,
+        block_gzip: bool = False,
+        compress_threads: int = 1,
+        intern_strings: bool = False,
+    ) -> None:
         """
         Convert Chakra host + device execution traces in JSON format into the Chakra protobuf format.
 
@@ -41,6 +56,10 @@ class PyTorchConverter:
             output_filename (str): Output Chakra host + device execution trace in the protobuf format.
             simulate (bool): Flag to indicate whether to simulate the execution of the converted trace. If True,
                 the method will simulate the execution after writing the protobuf trace to the output file.
+            write_index (bool): Flag to indicate whether to write an offset index sidecar next to the output file.
+            block_gzip (bool): Flag to indicate whether to write the output as a seekable block-compressed gzip file.
+            compress_threads (int): Number of threads compressing the output in parallel.
+            intern_strings (bool): Flag to indicate whether to store node names and operator schemas in a string table.
         """
         json_trace = self.load_json_execution_traces(input_filename)
         json_metadata, json_node_map = self.parse_json_trace(json_trace)
@@ -57,7 +76,9 @@ class PyTorchConverter:
 
         self.identify_cyclic_dependencies(protobuf_node_map)
 
-        self.write_protobuf_execution_trace(output_filename, json_metadata, protobuf_node_map)
+        self.write_protobuf_execution_trace(
+            output_filename, json_metadata, protobuf_node_map, write_index, block_gzip, compress_threads, intern_strings
+        )
 
         if simulate:
             self.simulate_execution(json_node_map, protobuf_node_map, parent_to_children_map)
@@ -583,6 +604,10 @@ class PyTorchConverter:
         output_filename: str,
         json_metadata: Dict,
         protobuf_node_map: Dict[int, ChakraNode],
+        write_index: bool = False,
+        block_gzip: bool = False,
+        compress_threads: int = 1,
+        intern_strings: bool = False,
     ) -> None:
         """
         Write the Chakra execution trace by encoding global metadata and nodes.
@@ -593,19 +618,67 @@ class PyTorchConverter:
             output_filename (str): The name of the output file for the protobuf execution trace.
             json_metadata (Dict): The metadata from the JSON trace.
             protobuf_node_map (Dict[int, ChakraNode]): The converted Chakra nodes.
+            write_index (bool): Flag to indicate whether to write an offset index sidecar ('<output_filename>.idx')
+                mapping node IDs to their location in the output file.
+            block_gzip (bool): Flag to indicate whether to write the output as a block-compressed gzip file, which
+                gzip tools read like any other gzip file but Chakra readers can seek in and decompress in parallel.
+                Otherwise, the output is gzip-compressed if its name ends with '.gz'.
+            compress_threads (int): Number of threads compressing the output. With more than one thread, a compressed
+                output is written as a block-compressed gzip file whose blocks are deflated in parallel.
+            intern_strings (bool): Flag to indicate whether to store every distinct node name and operator schema once
+                in a string table in the global metadata and to refer to it by code from the nodes.
         """
         logging.info("Writing Chakra execution trace: '%s'", output_filename)
-        with (
-            gzip.open(output_filename, "wb") if output_filename.endswith(".gz") else open(output_filename, "wb")
-        ) as protobuf_et:
-            self.write_global_metadata(protobuf_et, json_metadata)
-            self.encode_and_write_nodes(protobuf_et, protobuf_node_map)
-            logging.info("Chakra execution trace writing completed.")
+        index = EtIndex() if write_index else None
+        string_table = StringTable() if intern_strings else None
+        if string_table is not None:
+            # The table must be complete before it is written in the global metadata, ahead of the nodes.
+            for node in protobuf_node_map.values():
+                string_table.intern_node(node)
+            logging.info(f"Interned {len(string_table)} distinct node names and operator schemas.")
+        try:
+            with self.open_output_file(output_filename, block_gzip, compress_threads) as protobuf_et:
+                self.write_global_metadata(protobuf_et, json_metadata, index, string_table)
+                self.encode_and_write_nodes(protobuf_et, protobuf_node_map, index)
+                logging.info("Chakra execution trace writing completed.")
+        finally:
+            if string_table is not None:
+                for node in protobuf_node_map.values():
+                    string_table.resolve_node(node)
+        if index is not None:
+            index_filename = get_index_path(output_filename)
+            index.save(index_filename, os.path.getsize(output_filename))
+            logging.info("Chakra execution trace offset index written: '%s'", index_filename)
+
+    def open_output_file(self, output_filename: str, block_gzip: bool, compress_threads: int = 1) -> IO[bytes]:
+        """
+        Open the output file for the protobuf execution trace.
+
+        An existing file is removed first, so that an output placed from a trace cache is replaced rather than written
+        through.
+
+        Args:
+            output_filename (str): The name of the output file.
+            block_gzip (bool): Flag to indicate whether to write a block-compressed gzip file.
+            compress_threads (int): Number of threads compressing the output.
+
+        Returns:
+            IO[bytes]: The output file handle, which compresses the trace if requested by block_gzip or by a '.gz'
+                extension.
+        """
+        detach_output(output_filename)
+        if block_gzip or (compress_threads > 1 and output_filename.endswith(".gz")):
+            return BlockGzipWriter(output_filename, threads=compress_threads)  # type: ignore[return-value]
+        if output_filename.endswith(".gz"):
+            return gzip.open(output_filename, "wb")  # noqa: SIM115
+        return open(output_filename, "wb")  # noqa: SIM115
 
     def write_global_metadata(
         self,
         protobuf_et: IO[bytes],
         metadata: Dict,
+        index: Optional[EtIndex] = None,
+        string_table: Optional[StringTable] = None,
     ) -> None:
         """
         Encode and write global metadata for the Chakra execution trace.
@@ -613,6 +686,8 @@ class PyTorchConverter:
         Args:
             protobuf_et (IO[bytes]): The output file handle for the protobuf execution trace.
             metadata (Dict): The metadata dictionary containing schema, pid, time, start_ts, and finish_ts.
+            index (Optional[EtIndex]): Offset index in which to record the location of the global metadata.
+            string_table (Optional[StringTable]): String table referred to by the nodes, if strings are interned.
         """
         logging.debug("Encoding global metadata for Chakra execution trace.")
         global_metadata = GlobalMetadata(
@@ -624,21 +699,31 @@ class PyTorchConverter:
                 ChakraAttr(name="finish_ts", uint64_val=metadata["finish_ts"]),
             ]
         )
+        if string_table is not None:
+            global_metadata.attr.append(string_table.to_attr())
+        offset = protobuf_et.tell() if index is not None else 0
         encode_message(protobuf_et, global_metadata)
+        if index is not None:
+            index.set_global_metadata(offset, protobuf_et.tell() - offset)
 
-    def encode_and_write_nodes(self, protobuf_et: IO[bytes], protobuf_node_map: Dict[int, ChakraNode]) -> None:
+    def encode_and_write_nodes(
+        self, protobuf_et: IO[bytes], protobuf_node_map: Dict[int, ChakraNode], index: Optional[EtIndex] = None
+    ) -> None:
         """
         Encode and write nodes for the Chakra host + device execution trace in the protobuf format.
 
         Each node from the JSON execution trace is encoded and written into the protobuf format. This includes node
-        IDs, names, types, dependencies, and other attributes.
+        IDs, names, types, dependencies, and other attributes. Nodes are batched through a DelimitedWriter so the
+        output file receives a few large writes instead of several small ones per node.
 
         Args:
             protobuf_et (IO[bytes]): The output file handle for the protobuf execution trace.
             protobuf_node_map (Dict[int, ChakraNode]): Dictionary of protobuf nodes to be encoded and written.
+            index (Optional[EtIndex]): Offset index in which to record the location of every node.
         """
         logging.debug("Encoding and writing nodes for Chakra execution trace.")
         seen_nids = set()
+        writer = DelimitedWriter(protobuf_et, start_offset=protobuf_et.tell() if index is not None else 0)
         for nid in sorted(protobuf_node_map.keys()):
             if nid in seen_nids:
                 err_msg = (
@@ -650,8 +735,11 @@ class PyTorchConverter:
                 logging.error(err_msg)
                 raise ValueError(err_msg)
             seen_nids.add(nid)
-            chakra_node = protobuf_node_map[nid]
-            encode_message(protobuf_et, chakra_node)
+            offset = writer.tell()
+            writer.write(protobuf_node_map[nid])
+            if index is not None:
+                index.add_node(nid, offset, writer.tell() - offset)
+        writer.flush()
 
     # ruff: noqa: C901
     def simulate_execution(
@@ -16,6 +16,7 @@ from ...schema.protobuf.et_def_pb2 import (
     NodeType,
     AttributeProto as ChakraAttr,
 )
+from ..third_party.utils.protolib import DelimitedWriter
 from ..third_party.utils.protolib import encodeMessage as encode_message
 
 
@@ -136,7 +137,7 @@ class TextConverter:
         layers = self.get_layers(f, num_layers)
         for npu_id in range(self.num_npus):
             output_filename = "%s.%d.et" % (self.output_filename, npu_id)
-            with open(output_filename, "wb") as g:
+            with open(output_filename, "wb") as et, DelimitedWriter(et) as g:
                 global_metadata = self.get_global_metadata()
                 encode_message(g, global_metadata)
                 for i in range(self.num_passes):
@@ -150,7 +151,7 @@ class TextConverter:
         layers = self.get_layers(f, num_layers)
         for npu_id in range(self.num_npus):
             output_filename = "%s.%d.et" % (self.output_filename, npu_id)
-            with open(output_filename, "wb") as g:
+            with open(output_filename, "wb") as et, DelimitedWriter(et) as g:
                 global_metadata = self.get_global_metadata()
                 encode_message(g, global_metadata)
                 for i in range(self.num_passes):
@@ -198,7 +199,7 @@ class TextConverter:
         layers = self.get_layers(f, num_layers)
         for npu_id in range(self.num_npus):
             output_filename = "%s.%d.et" % (self.output_filename, npu_id)
-            with open(output_filename, "wb") as g:
+            with open(output_filename, "wb") as et, DelimitedWriter(et) as g:
                 global_metadata = self.get_global_metadata()
                 encode_message(g, global_metadata)
                 for i in range(self.num_passes):
@@ -251,7 +252,7 @@ class TextConverter:
         layers = self.get_layers(f, num_layers)
         for npu_id in range(self.num_npus):
             output_filename = "%s.%d.et" % (self.output_filename, npu_id)
-            with open(output_filename, "wb") as g:
+            with open(output_filename, "wb") as et, DelimitedWriter(et) as g:
                 global_metadata = self.get_global_metadata()
                 encode_message(g, global_metadata)
                 for i in range(self.num_passes):
@@ -310,7 +311,7 @@ class TextConverter:
         layers = self.get_layers(f, num_layers)
         for npu_id in range(self.num_npus):
             output_filename = "%s.%d.et" % (self.output_filename, npu_id)
-            with open(output_filename, "wb") as g:
+            with open(output_filename, "wb") as et, DelimitedWriter(et) as g:
                 global_metadata = self.get_global_metadata()
                 encode_message(g, global_metadata)
                 for i in range(self.num_passes):
@@ -369,7 +370,7 @@ class TextConverter:
         layers = self.get_layers(f, num_layers)
         for npu_id in range(self.num_npus):
             output_filename = "%s.%d.et" % (self.output_filename, npu_id)
-            with open(output_filename, "wb") as g:
+            with open(output_filename, "wb") as et, DelimitedWriter(et) as g:
                 global_metadata = self.get_global_metadata()
                 encode_message(g, global_metadata)
                 for i in range(self.num_passes):
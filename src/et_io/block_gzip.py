@@ -0,0 +1,450 @@
+import gzip
+import io
+import logging
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import IO, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ..third_party.utils.protolib import openFileRd as open_file_rd
+
+# Uncompressed size of every block except the last one.
+DEFAULT_BLOCK_SIZE = 1 << 18
+
+# Blocks handed to a worker process at a time by iter_blocks.
+DEFAULT_BLOCKS_PER_TASK = 16
+
+BLOCK_GZIP_MAGIC = b"CHKRABGZ"
+BLOCK_GZIP_VERSION = 1
+
+# Sync offset of a block in which no record starts.
+NO_SYNC = (1 << 64) - 1
+
+# Subfield IDs of the gzip FEXTRA fields carrying the block index and the footer.
+INDEX_SUBFIELD_ID = b"CI"
+FOOTER_SUBFIELD_ID = b"CF"
+
+# compressed offset, sync offset
+INDEX_ENTRY = struct.Struct("<QQ")
+
+# magic, version, block size, number of blocks, offset of the first index member, uncompressed size
+FOOTER = struct.Struct("<8sIIQQQ")
+
+# A gzip FEXTRA field holds at most 65535 bytes, four of which are the subfield header.
+MAX_ENTRIES_PER_INDEX_MEMBER = (0xFFFF - 4) // INDEX_ENTRY.size
+
+GZIP_HEADER = struct.Struct("<2sBBIBB")
+GZIP_TRAILER = struct.Struct("<II")
+GZIP_MAGIC = b"\x1f\x8b"
+FLAG_FEXTRA = 0x04
+OS_UNKNOWN = 255
+
+# A deflate stream compressing no data.
+EMPTY_DEFLATE = b"\x03\x00"
+
+
+def _extra_member(subfield_id: bytes, payload: bytes) -> bytes:
+    """Return an empty gzip member carrying a payload in its FEXTRA field."""
+    extra = subfield_id + struct.pack("<H", len(payload)) + payload
+    return (
+        GZIP_HEADER.pack(GZIP_MAGIC, zlib.DEFLATED, FLAG_FEXTRA, 0, 0, OS_UNKNOWN)
+        + struct.pack("<H", len(extra))
+        + extra
+        + EMPTY_DEFLATE
+        + GZIP_TRAILER.pack(0, 0)
+    )
+
+
+FOOTER_MEMBER_SIZE = len(_extra_member(FOOTER_SUBFIELD_ID, bytes(FOOTER.size)))
+
+
+def _compress_member(block: bytes, compresslevel: int) -> bytes:
+    """Compress a block into a complete gzip member. zlib releases the GIL, so members can be built in threads."""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return b"".join(
+        (
+            GZIP_HEADER.pack(GZIP_MAGIC, zlib.DEFLATED, 0, 0, 0, OS_UNKNOWN),
+            compressor.compress(block),
+            compressor.flush(),
+            GZIP_TRAILER.pack(zlib.crc32(block), len(block)),
+        )
+    )
+
+
+def _parse_extra_member(data: bytes, subfield_id: bytes) -> Tuple[bytes, int]:
+    """
+    Parse an empty gzip member written by _extra_member.
+
+    Returns
+        Tuple[bytes, int]: The payload of the member and the size of the member in bytes.
+    """
+    magic, method, flags, _, _, _ = GZIP_HEADER.unpack_from(data)
+    if magic != GZIP_MAGIC or method != zlib.DEFLATED or flags != FLAG_FEXTRA:
+        raise ValueError("Malformed block index member.")
+    (xlen,) = struct.unpack_from("<H", data, GZIP_HEADER.size)
+    extra_start = GZIP_HEADER.size + 2
+    (length,) = struct.unpack_from("<H", data, extra_start + 2)
+    if data[extra_start : extra_start + 2] != subfield_id or length != xlen - 4:
+        raise ValueError("Malformed block index member.")
+    payload = data[extra_start + 4 : extra_start + 4 + length]
+    return payload, extra_start + xlen + len(EMPTY_DEFLATE) + GZIP_TRAILER.size
+
+
+class BlockGzipWriter:
+    """
+    Writer for seekable block-compressed gzip files.
+
+    The uncompressed stream is cut into blocks of a fixed size, and every block is compressed into an independent gzip
+    member, similar to BGZF. After the last block, the writer appends a block index and a fixed-size footer, both stored
+    in the FEXTRA field of empty gzip members. Any gzip tool therefore decompresses the file to exactly the bytes that
+    were written, while BlockGzipReader can seek to any block and blocks can be decompressed in parallel.
+
+    Every call to write is treated as the start of a record, and write_records lets a buffering writer declare every
+    record starting in the data it writes at once. For each block, the index stores the offset of the first record
+    starting in it, so that a reader can begin decoding length-delimited frames at any block.
+
+    With more than one thread, blocks are compressed concurrently in a thread pool and written in order as they
+    complete. The output is byte-identical to the single-threaded one.
+
+    Attributes
+        filename (str): Path of the output file.
+        block_size (int): Uncompressed size of every block except the last one.
+        compresslevel (int): zlib compression level of the blocks.
+        threads (int): Number of threads compressing blocks.
+    """
+
+    def __init__(
+        self, filename: str, block_size: int = DEFAULT_BLOCK_SIZE, compresslevel: int = 9, threads: int = 1
+    ) -> None:
+        if block_size <= 0:
+            raise ValueError(f"Block size must be positive, got {block_size}.")
+        if threads <= 0:
+            raise ValueError(f"Number of compression threads must be positive, got {threads}.")
+        self.filename = filename
+        self.block_size = block_size
+        self.compresslevel = compresslevel
+        self.threads = threads
+        self._file = open(filename, "wb")  # noqa: SIM115
+        self._buf = bytearray()
+        self._block_start = 0
+        self._sync = NO_SYNC
+        # First record declared by write_records in each block not written yet, by block number.
+        self._record_syncs: Dict[int, int] = {}
+        self._compressed_offsets = array("Q")
+        self._sync_offsets = array("Q")
+        self._pool = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+        self._pending: Deque[Tuple[Future, int]] = deque()
+        self._closed = False
+
+    def __enter__(self) -> "BlockGzipWriter":
+        """Return the writer for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Write the pending block, the block index, and the footer, then close the file."""
+        self.close()
+
+    def tell(self) -> int:
+        """Return the offset in the uncompressed stream."""
+        return self._block_start + len(self._buf)
+
+    def write(self, data: bytes) -> int:
+        """Append data to the uncompressed stream, compressing every block as soon as it is complete."""
+        if not data:
+            return 0
+        if self._sync == NO_SYNC:
+            self._sync = self.tell()
+        return self._append(data)
+
+    def write_records(self, data: bytes, record_starts: Sequence[int]) -> int:
+        """
+        Append data holding several records, recording the first record starting in each block the data spans.
+
+        Args:
+            data (bytes): The data to append.
+            record_starts (Sequence[int]): Sorted offsets, relative to the start of data, at which records start.
+
+        Returns:
+            int: The number of bytes appended.
+        """
+        if not data:
+            return 0
+        base = self.tell()
+        for block_id in range(base // self.block_size, (base + len(data) - 1) // self.block_size + 1):
+            i = bisect_left(record_starts, block_id * self.block_size - base)
+            if i < len(record_starts) and base + record_starts[i] < (block_id + 1) * self.block_size:
+                self._record_syncs.setdefault(block_id, base + record_starts[i])
+        return self._append(data)
+
+    def _append(self, data: bytes) -> int:
+        view = memoryview(data).cast("B")
+        while len(self._buf) + len(view) >= self.block_size:
+            split = self.block_size - len(self._buf)
+            block = bytes(self._buf) + view[:split] if self._buf else bytes(view[:split])
+            self._buf.clear()
+            view = view[split:]
+            self._write_block(block)
+        self._buf += view
+        return len(data)
+
+    def flush(self) -> None:
+        """Flush the compressed blocks written so far. Blocks are only emitted once they are full."""
+        self._drain(0)
+        self._file.flush()
+
+    def _write_block(self, block: bytes) -> None:
+        sync = min(self._sync, self._record_syncs.pop(self._block_start // self.block_size, NO_SYNC))
+        if self._pool is None:
+            self._write_member(_compress_member(block, self.compresslevel), sync)
+        else:
+            self._pending.append((self._pool.submit(_compress_member, block, self.compresslevel), sync))
+            # Bound the blocks held in memory while keeping every thread busy.
+            self._drain(2 * self.threads)
+        self._block_start += len(block)
+        self._sync = NO_SYNC
+
+    def _drain(self, max_pending: int) -> None:
+        """Write compressed blocks in order until at most max_pending are still being compressed."""
+        while len(self._pending) > max_pending:
+            future, sync = self._pending.popleft()
+            self._write_member(future.result(), sync)
+
+    def _write_member(self, member: bytes, sync: int) -> None:
+        self._compressed_offsets.append(self._file.tell())
+        self._sync_offsets.append(sync)
+        self._file.write(member)
+
+    def close(self) -> None:
+        """Write the pending block, the block index, and the footer, then close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._buf:
+            self._write_block(bytes(self._buf))
+            self._buf = bytearray()
+        self._drain(0)
+        if self._pool is not None:
+            self._pool.shutdown()
+        index_offset = self._file.tell()
+        num_blocks = len(self._compressed_offsets)
+        for first in range(0, num_blocks, MAX_ENTRIES_PER_INDEX_MEMBER):
+            last = min(first + MAX_ENTRIES_PER_INDEX_MEMBER, num_blocks)
+            payload = b"".join(
+                INDEX_ENTRY.pack(self._compressed_offsets[i], self._sync_offsets[i]) for i in range(first, last)
+            )
+            self._file.write(_extra_member(INDEX_SUBFIELD_ID, payload))
+        footer = FOOTER.pack(
+            BLOCK_GZIP_MAGIC, BLOCK_GZIP_VERSION, self.block_size, num_blocks, index_offset, self._block_start
+        )
+        self._file.write(_extra_member(FOOTER_SUBFIELD_ID, footer))
+        self._file.close()
+        logging.debug(f"Wrote {num_blocks} gzip blocks of {self.block_size} bytes to {self.filename}.")
+
+
+def _read_footer(f) -> Optional[Tuple[int, int, int, int]]:
+    """Return the block size, number of blocks, index offset, and uncompressed size, or None if there is no footer."""
+    f.seek(0, os.SEEK_END)
+    if f.tell() < FOOTER_MEMBER_SIZE:
+        return None
+    f.seek(-FOOTER_MEMBER_SIZE, os.SEEK_END)
+    try:
+        payload, _ = _parse_extra_member(f.read(FOOTER_MEMBER_SIZE), FOOTER_SUBFIELD_ID)
+    except (ValueError, struct.error):
+        return None
+    magic, version, block_size, num_blocks, index_offset, size = FOOTER.unpack(payload)
+    if magic != BLOCK_GZIP_MAGIC:
+        return None
+    if version != BLOCK_GZIP_VERSION:
+        raise ValueError(f"Unsupported block gzip version {version}.")
+    return block_size, num_blocks, index_offset, size
+
+
+def is_block_gzip(filename: str) -> bool:
+    """Return whether a file is a block-compressed gzip file written by BlockGzipWriter."""
+    try:
+        with open(filename, "rb") as f:
+            if f.read(2) != GZIP_MAGIC:
+                return False
+            return _read_footer(f) is not None
+    except OSError:
+        return False
+
+
+class BlockGzipReader(io.RawIOBase):
+    """
+    Seekable reader for block-compressed gzip files written by BlockGzipWriter.
+
+    Reads and seeks address the uncompressed stream. A seek only decompresses the block containing the target offset,
+    so random access costs at most one block regardless of the position in the file.
+
+    Attributes
+        filename (str): Path of the block-compressed file.
+        block_size (int): Uncompressed size of every block except the last one.
+        size (int): Size of the uncompressed stream.
+        compressed_offsets (array): Offset of every block in the compressed file, followed by the offset of the block
+            index.
+        sync_offsets (array): Uncompressed offset of the first record starting in every block, or NO_SYNC.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Open a block-compressed gzip file and load its block index.
+
+        Raises
+            ValueError: If the file is not a block-compressed gzip file or its block index is corrupt.
+        """
+        super().__init__()
+        self.filename = filename
+        self._file = open(filename, "rb")  # noqa: SIM115
+        footer = _read_footer(self._file)
+        if footer is None:
+            self._file.close()
+            raise ValueError(f"'{filename}' is not a block-compressed gzip file.")
+        self.block_size, num_blocks, index_offset, self.size = footer
+        self.compressed_offsets = array("Q")
+        self.sync_offsets = array("Q")
+        self._load_index(num_blocks, index_offset)
+        self._pos = 0
+        self._block_id = -1
+        self._block = b""
+
+    def _load_index(self, num_blocks: int, index_offset: int) -> None:
+        self._file.seek(index_offset)
+        data = self._file.read()[:-FOOTER_MEMBER_SIZE]
+        pos = 0
+        while pos < len(data):
+            payload, member_size = _parse_extra_member(data[pos:], INDEX_SUBFIELD_ID)
+            for compressed_offset, sync_offset in INDEX_ENTRY.iter_unpack(payload):
+                self.compressed_offsets.append(compressed_offset)
+                self.sync_offsets.append(sync_offset)
+            pos += member_size
+        if len(self.compressed_offsets) != num_blocks:
+            raise ValueError(f"Block index of '{self.filename}' is corrupt.")
+        self.compressed_offsets.append(index_offset)
+
+    @property
+    def num_blocks(self) -> int:
+        """Return the number of blocks."""
+        return len(self.sync_offsets)
+
+    def block_of(self, offset: int) -> int:
+        """Return the block holding an uncompressed offset."""
+        return offset // self.block_size
+
+    def next_sync_block(self, block_id: int) -> int:
+        """Return the first block at or after block_id in which a record starts, or num_blocks if there is none."""
+        while block_id < self.num_blocks and self.sync_offsets[block_id] == NO_SYNC:
+            block_id += 1
+        return block_id
+
+    def read_block(self, block_id: int) -> bytes:
+        """Return the uncompressed contents of a block."""
+        start = self.compressed_offsets[block_id]
+        self._file.seek(start)
+        return zlib.decompress(self._file.read(self.compressed_offsets[block_id + 1] - start), 16 + zlib.MAX_WBITS)
+
+    def readable(self) -> bool:
+        """Return True; the stream supports reading."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return True; the stream supports random access."""
+        return True
+
+    def tell(self) -> int:
+        """Return the offset in the uncompressed stream."""
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move to an offset in the uncompressed stream."""
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self.size
+        elif whence != os.SEEK_SET:
+            raise ValueError(f"Invalid whence ({whence}).")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}.")
+        self._pos = offset
+        return offset
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes from the uncompressed stream, or everything up to the end if size is negative."""
+        end = self.size if size is None or size < 0 else min(self._pos + size, self.size)
+        chunks: List[bytes] = []
+        while self._pos < end:
+            block_id = self.block_of(self._pos)
+            if block_id != self._block_id:
+                self._block = self.read_block(block_id)
+                self._block_id = block_id
+            start = self._pos - block_id * self.block_size
+            chunk = self._block[start : start + end - self._pos]
+            chunks.append(chunk)
+            self._pos += len(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    def readinto(self, buffer) -> int:
+        """Read bytes from the uncompressed stream into a pre-allocated buffer."""
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def open_et_file(filename: str) -> IO[bytes]:
+    """
+    Open a Chakra execution trace for reading.
+
+    Block-compressed gzip files written by BlockGzipWriter are opened with a seekable BlockGzipReader, and other files
+    with openFileRd, which decompresses gzip files sequentially.
+    """
+    if is_block_gzip(filename):
+        return BlockGzipReader(filename)  # type: ignore[return-value]
+    return open_file_rd(filename)
+
+
+def _decompress_blocks(filename: str, start: int, end: int) -> bytes:
+    """Decompress the gzip members stored in bytes [start, end) of a file."""
+    with open(filename, "rb") as f:
+        f.seek(start)
+        return gzip.decompress(f.read(end - start))
+
+
+def iter_blocks(
+    filename: str,
+    first_block: int = 0,
+    last_block: Optional[int] = None,
+    workers: Optional[int] = None,
+    blocks_per_task: int = DEFAULT_BLOCKS_PER_TASK,
+) -> Iterator[bytes]:
+    """
+    Decompress a range of blocks of a block-compressed gzip file in parallel with a process pool.
+
+    Args:
+        filename (str): Path of the block-compressed file.
+        first_block (int): First block to decompress.
+        last_block (Optional[int]): Block after the last one to decompress. Defaults to the number of blocks.
+        workers (Optional[int]): Number of worker processes. Defaults to the number of CPUs.
+        blocks_per_task (int): Number of consecutive blocks decompressed by a worker at a time.
+
+    Returns:
+        Iterator[bytes]: The uncompressed contents of consecutive runs of blocks, in file order.
+    """
+    with BlockGzipReader(filename) as reader:
+        offsets = reader.compressed_offsets
+        last_block = reader.num_blocks if last_block is None else min(last_block, reader.num_blocks)
+    starts = range(first_block, last_block, blocks_per_task)
+    if not starts:
+        return
+    ranges = [(offsets[block_id], offsets[min(block_id + blocks_per_task, last_block)]) for block_id in starts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_decompress_blocks, [filename] * len(ranges), *zip(*ranges))
@@ -0,0 +1,231 @@
+import argparse
+import logging
+import os
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ...schema.protobuf.et_def_pb2 import GlobalMetadata
+from ...schema.protobuf.et_def_pb2 import Node as ChakraNode
+from ..third_party.utils.protolib import DelimitedReader
+from .block_gzip import open_et_file
+from .projection import NodeProjection
+from .string_table import StringTable
+
+# Attributes exported by default, chosen for communication and stream analysis.
+DEFAULT_ATTRS = ("comm_type", "comm_size", "stream")
+
+ATTR_PREFIX = "attr."
+DICT_SUFFIX = "_dict"
+VALID_SUFFIX = "_valid"
+
+STRING_KINDS = ("string_val", "bytes_val")
+
+# Node fields read by ColumnarBuilder. Skipping inputs and outputs avoids decoding their large stringified values.
+COLUMN_FIELDS = ("id", "name", "type", "ctrl_deps", "data_deps", "start_time_micros", "duration_micros", "attr")
+
+
+def _dictionary(values: Dict[str, int]) -> np.ndarray:
+    """Return the entries of a dictionary encoding ordered by code."""
+    return np.array(list(values), dtype=str) if values else np.array([], dtype="<U1")
+
+
+class ColumnarBuilder:
+    """
+    Accumulates Chakra nodes into column arrays.
+
+    Scalar fields become one array each. Dependencies are CSR-encoded: the dependencies of the i-th node are
+    `<deps>_indices[<deps>_indptr[i]:<deps>_indptr[i + 1]]`. Node names are dictionary-encoded into int32 codes
+    indexing `name_dict`. Every selected attribute becomes an `attr.<name>` column with an `attr.<name>_valid` mask
+    marking the nodes that have it; numeric attributes are stored as int64, float64, or bool values, and string
+    attributes are dictionary-encoded like names, with code -1 for missing values.
+
+    Attributes
+        attrs (Tuple[str, ...]): Names of the exported attributes.
+    """
+
+    def __init__(self, attrs: Sequence[str] = DEFAULT_ATTRS) -> None:
+        self.attrs = tuple(attrs)
+        self._ids = array("Q")
+        self._types = array("i")
+        self._start_times = array("Q")
+        self._durations = array("Q")
+        self._names: Dict[str, int] = {}
+        self._name_codes = array("i")
+        self._deps_indptr = {"data_deps": array("q", [0]), "ctrl_deps": array("q", [0])}
+        self._deps_indices = {"data_deps": array("Q"), "ctrl_deps": array("Q")}
+        self._attr_pos = {name: pos for pos, name in enumerate(self.attrs)}
+        self._attr_values: List[List[Any]] = [[] for _ in self.attrs]
+        self._attr_kinds: List[set] = [set() for _ in self.attrs]
+
+    def __len__(self) -> int:
+        """Return the number of accumulated nodes."""
+        return len(self._ids)
+
+    def add(self, node: ChakraNode) -> None:
+        """Append a node, or a node decoded with a projection of at least COLUMN_FIELDS, to the columns."""
+        self._ids.append(node.id)
+        self._types.append(node.type)
+        self._start_times.append(node.start_time_micros)
+        self._durations.append(node.duration_micros)
+        code = self._names.get(node.name)
+        if code is None:
+            code = self._names[node.name] = len(self._names)
+        self._name_codes.append(code)
+        for deps_name, deps in (("data_deps", node.data_deps), ("ctrl_deps", node.ctrl_deps)):
+            indices = self._deps_indices[deps_name]
+            indices.extend(deps)
+            self._deps_indptr[deps_name].append(len(indices))
+        if not self._attr_pos:
+            return
+
+        row = len(self._ids)
+        for attr in node.attr:
+            pos = self._attr_pos.get(attr.name)
+            if pos is None or len(self._attr_values[pos]) == row:
+                continue
+            kind = attr.WhichOneof("value")
+            if kind is None or kind.endswith("_list"):
+                continue
+            values = self._attr_values[pos]
+            values.extend([None] * (row - 1 - len(values)))
+            values.append(getattr(attr, kind))
+            self._attr_kinds[pos].add(kind)
+
+    def finish(self) -> Dict[str, np.ndarray]:
+        """Return the columns as NumPy arrays keyed by column name."""
+        columns = {
+            "id": np.frombuffer(self._ids, dtype=np.uint64),
+            "type": np.frombuffer(self._types, dtype=np.int32),
+            "start_time_micros": np.frombuffer(self._start_times, dtype=np.uint64),
+            "duration_micros": np.frombuffer(self._durations, dtype=np.uint64),
+            "name": np.frombuffer(self._name_codes, dtype=np.int32),
+            "name" + DICT_SUFFIX: _dictionary(self._names),
+        }
+        for deps_name in ("data_deps", "ctrl_deps"):
+            columns[f"{deps_name}_indptr"] = np.frombuffer(self._deps_indptr[deps_name], dtype=np.int64)
+            columns[f"{deps_name}_indices"] = np.frombuffer(self._deps_indices[deps_name], dtype=np.uint64)
+        for pos, name in enumerate(self.attrs):
+            columns.update(self._finish_attr(name, self._attr_values[pos], self._attr_kinds[pos]))
+        return columns
+
+    def _finish_attr(self, name: str, values: List[Any], kinds: set) -> Dict[str, np.ndarray]:
+        values = values + [None] * (len(self._ids) - len(values))
+        valid = np.array([value is not None for value in values], dtype=bool)
+        column = ATTR_PREFIX + name
+        if kinds & set(STRING_KINDS):
+            dictionary: Dict[str, int] = {}
+            codes = np.full(len(values), -1, dtype=np.int32)
+            for row, value in enumerate(values):
+                if value is not None:
+                    key = value.decode(errors="replace") if isinstance(value, bytes) else str(value)
+                    codes[row] = dictionary.setdefault(key, len(dictionary))
+            return {column: codes, column + DICT_SUFFIX: _dictionary(dictionary), column + VALID_SUFFIX: valid}
+        if kinds & {"double_val", "float_val"}:
+            dtype: Any = np.float64
+        elif kinds == {"bool_val"}:
+            dtype = bool
+        else:
+            dtype = np.int64
+        filled = np.array([0 if value is None else value for value in values], dtype=dtype)
+        return {column: filled, column + VALID_SUFFIX: valid}
+
+
+def build_columns(et_path: str, attrs: Sequence[str] = DEFAULT_ATTRS) -> Dict[str, np.ndarray]:
+    """
+    Stream the nodes of a Chakra execution trace into column arrays.
+
+    Args:
+        et_path (str): Path to the Chakra execution trace.
+        attrs (Sequence[str]): Names of the node attributes to export.
+
+    Returns:
+        Dict[str, np.ndarray]: The columns described in ColumnarBuilder, keyed by column name.
+    """
+    builder = ColumnarBuilder(attrs)
+    et = open_et_file(et_path)
+    try:
+        frames = iter(DelimitedReader(et))
+        global_metadata = next(frames, None)
+        string_table = StringTable.from_global_metadata(GlobalMetadata.FromString(global_metadata or b""))
+        nodes = map(NodeProjection(COLUMN_FIELDS).message_class.FromString, frames)
+        if string_table is not None:
+            nodes = map(string_table.resolve_node, nodes)
+        for node in nodes:
+            builder.add(node)
+    finally:
+        et.close()
+    logging.info(f"Built {len(builder)} rows from {et_path}.")
+    return builder.finish()
+
+
+def save_columns(columns: Dict[str, np.ndarray], output_path: str) -> None:
+    """
+    Save columns as an .npz archive or as a directory of .npy files.
+
+    Every .npy file of a directory can be memory-mapped with numpy.load(..., mmap_mode="r"); arrays in an .npz
+    archive are loaded into memory.
+
+    Args:
+        columns (Dict[str, np.ndarray]): The columns keyed by column name.
+        output_path (str): Path of the .npz archive if it ends with '.npz', otherwise of the output directory.
+    """
+    if output_path.endswith(".npz"):
+        np.savez(output_path, **columns)
+        return
+    os.makedirs(output_path, exist_ok=True)
+    for name, values in columns.items():
+        np.save(os.path.join(output_path, name + ".npy"), values, allow_pickle=False)
+
+
+def load_columns(path: str, mmap_mode: Optional[str] = "r") -> Dict[str, np.ndarray]:
+    """
+    Load columns saved by save_columns.
+
+    Args:
+        path (str): Path of the .npz archive or of the directory of .npy files.
+        mmap_mode (Optional[str]): Memory-map mode for the .npy files of a directory, or None to read them into
+            memory. Ignored for .npz archives.
+
+    Returns:
+        Dict[str, np.ndarray]: The columns keyed by column name.
+    """
+    if path.endswith(".npz"):
+        with np.load(path, allow_pickle=False) as archive:
+            return dict(archive)
+    return {
+        filename[: -len(".npy")]: np.load(os.path.join(path, filename), mmap_mode=mmap_mode, allow_pickle=False)
+        for filename in sorted(os.listdir(path))
+        if filename.endswith(".npy")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exports a Chakra execution trace to NumPy column arrays.")
+    parser.add_argument(
+        "--input_filename", type=str, required=True, help="Specifies the input filename of the Chakra execution trace."
+    )
+    parser.add_argument(
+        "--output_path",
+        type=str,
+        required=True,
+        help="Specifies the output .npz archive, or a directory in which to write one memory-mappable .npy file per "
+        "column.",
+    )
+    parser.add_argument(
+        "--attrs",
+        type=str,
+        nargs="*",
+        default=list(DEFAULT_ATTRS),
+        help="Specifies the node attributes to export as columns.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO", force=True)
+    save_columns(build_columns(args.input_filename, args.attrs), args.output_path)
+    logging.info(f"Columns written to {args.output_path}.")
+
+
+if __name__ == "__main__":
+    main()
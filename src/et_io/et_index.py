@@ -0,0 +1,319 @@
+import bisect
+import logging
+import os
+import struct
+import sys
+from array import array
+from typing import IO, Iterator, List, Optional, Tuple
+
+from ...schema.protobuf.et_def_pb2 import GlobalMetadata
+from ...schema.protobuf.et_def_pb2 import Node as ChakraNode
+from ..third_party.utils.protolib import DelimitedReader
+from .block_gzip import open_et_file
+from .projection import NodeProjection
+from .string_table import StringTable
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"CHKRAIDX"
+INDEX_VERSION = 1
+
+# magic, version, number of nodes, GlobalMetadata offset, GlobalMetadata frame length, size of the indexed file
+INDEX_HEADER = struct.Struct("<8sIQQQQ")
+
+# Upper bound on the number of bytes fetched with a single read when reading a range of nodes.
+MAX_RANGE_READ_SIZE = 64 << 20
+
+
+def get_index_path(et_path: str) -> str:
+    """Return the path of the offset index sidecar for a Chakra execution trace."""
+    return et_path + INDEX_SUFFIX
+
+
+def strip_length_prefix(frame: memoryview) -> memoryview:
+    """Return the payload of a length-delimited frame by skipping its varint length prefix."""
+    pos = 0
+    while frame[pos] & 0x80:
+        pos += 1
+    return frame[pos + 1 :]
+
+
+class EtIndex:
+    """
+    Offset index for a Chakra execution trace (ET).
+
+    The index maps every node ID to the byte offset and length of its length-delimited frame, and records the frame
+    of the GlobalMetadata message. Offsets refer to the uncompressed message stream, so they are valid for both plain
+    and gzip-compressed traces. The index is stored next to the trace as a binary sidecar (`<trace>.idx`) holding a
+    fixed header followed by three little-endian arrays sorted by node ID: node IDs (uint64), offsets (uint64), and
+    frame lengths (uint32).
+
+    Attributes
+        node_ids (array): Node IDs sorted in ascending order.
+        offsets (array): Frame offsets, parallel to node_ids.
+        lengths (array): Frame lengths including the length prefix, parallel to node_ids.
+        global_metadata_offset (int): Offset of the GlobalMetadata frame.
+        global_metadata_length (int): Length of the GlobalMetadata frame, or 0 if the trace has none.
+        et_size (int): Size in bytes of the trace file on disk when the index was written, used to detect stale
+            sidecars.
+    """
+
+    def __init__(self) -> None:
+        self.node_ids = array("Q")
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.global_metadata_offset = 0
+        self.global_metadata_length = 0
+        self.et_size = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed nodes."""
+        return len(self.node_ids)
+
+    def __contains__(self, node_id: int) -> bool:
+        """Return whether a node ID is indexed."""
+        return self.find(node_id) is not None
+
+    def set_global_metadata(self, offset: int, length: int) -> None:
+        """Record the frame of the GlobalMetadata message."""
+        self.global_metadata_offset = offset
+        self.global_metadata_length = length
+
+    def add_node(self, node_id: int, offset: int, length: int) -> None:
+        """Record the frame of a node. Nodes may be added in any order; the index is sorted when it is saved."""
+        self.node_ids.append(node_id)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+    def sort(self) -> None:
+        """Sort the entries by node ID, raising a ValueError if a node ID appears more than once."""
+        if all(self.node_ids[i] < self.node_ids[i + 1] for i in range(len(self.node_ids) - 1)):
+            return
+        order = sorted(range(len(self.node_ids)), key=self.node_ids.__getitem__)
+        self.node_ids = array("Q", (self.node_ids[i] for i in order))
+        self.offsets = array("Q", (self.offsets[i] for i in order))
+        self.lengths = array("I", (self.lengths[i] for i in order))
+        for i in range(len(self.node_ids) - 1):
+            if self.node_ids[i] == self.node_ids[i + 1]:
+                raise ValueError(f"Duplicate node ID {self.node_ids[i]} found while building the offset index.")
+
+    def find(self, node_id: int) -> Optional[int]:
+        """Return the position of a node ID in the index, or None if it is not indexed."""
+        pos = bisect.bisect_left(self.node_ids, node_id)
+        if pos < len(self.node_ids) and self.node_ids[pos] == node_id:
+            return pos
+        return None
+
+    def range_positions(self, start_id: int, end_id: int) -> Tuple[int, int]:
+        """Return the half-open span of index positions for node IDs in [start_id, end_id)."""
+        return bisect.bisect_left(self.node_ids, start_id), bisect.bisect_left(self.node_ids, end_id)
+
+    def save(self, index_path: str, et_size: int) -> None:
+        """
+        Write the index to a sidecar file.
+
+        Args:
+            index_path (str): Path of the sidecar file.
+            et_size (int): Size in bytes of the indexed trace file on disk.
+        """
+        self.sort()
+        self.et_size = et_size
+        with open(index_path, "wb") as f:
+            f.write(
+                INDEX_HEADER.pack(
+                    INDEX_MAGIC,
+                    INDEX_VERSION,
+                    len(self.node_ids),
+                    self.global_metadata_offset,
+                    self.global_metadata_length,
+                    et_size,
+                )
+            )
+            for values in (self.node_ids, self.offsets, self.lengths):
+                f.write(_to_little_endian(values).tobytes())
+        logging.debug(f"Wrote offset index for {len(self.node_ids)} nodes to {index_path}.")
+
+    @classmethod
+    def load(cls, index_path: str) -> "EtIndex":
+        """
+        Read an index from a sidecar file.
+
+        Raises
+            ValueError: If the file is not a Chakra offset index or has an unsupported version.
+        """
+        index = cls()
+        with open(index_path, "rb") as f:
+            header = f.read(INDEX_HEADER.size)
+            if len(header) != INDEX_HEADER.size or header[:8] != INDEX_MAGIC:
+                raise ValueError(f"'{index_path}' is not a Chakra execution trace offset index.")
+            (
+                _,
+                version,
+                num_nodes,
+                index.global_metadata_offset,
+                index.global_metadata_length,
+                index.et_size,
+            ) = INDEX_HEADER.unpack(header)
+            if version != INDEX_VERSION:
+                raise ValueError(f"Unsupported offset index version {version} in '{index_path}'.")
+            for values in (index.node_ids, index.offsets, index.lengths):
+                values.frombytes(f.read(num_nodes * values.itemsize))
+                if len(values) != num_nodes:
+                    raise ValueError(f"Offset index '{index_path}' is truncated.")
+                _from_little_endian(values)
+        return index
+
+
+def _to_little_endian(values: array) -> array:
+    if sys.byteorder == "little":
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
+
+
+def _from_little_endian(values: array) -> None:
+    if sys.byteorder != "little":
+        values.byteswap()
+
+
+def build_index(et_path: str) -> EtIndex:
+    """
+    Build an offset index by scanning an existing Chakra execution trace.
+
+    The first message of the trace is taken to be the GlobalMetadata; only the ID of every following node is decoded.
+
+    Args:
+        et_path (str): Path to the Chakra execution trace (plain or gzip-compressed).
+
+    Returns:
+        EtIndex: The index of the trace.
+    """
+    logging.info(f"Building offset index for {et_path}.")
+    index = EtIndex()
+    et = open_et_file(et_path)
+    reader = DelimitedReader(et)
+    frames = iter(reader)
+    if next(frames, None) is not None:
+        index.set_global_metadata(0, reader.tell())
+    start = reader.tell()
+    for record in NodeProjection(("id",)).decode_frames(frames):
+        end = reader.tell()
+        index.add_node(record.id, start, end - start)
+        start = end
+    et.close()
+    logging.info(f"Indexed {len(index)} nodes in {et_path}.")
+    return index
+
+
+class IndexedEtReader:
+    """
+    Random-access reader for Chakra execution traces with an offset index sidecar.
+
+    Any node or range of node IDs can be fetched with one seek per contiguous run of frames instead of decoding the
+    trace from the beginning. Seeks are constant-time for uncompressed traces; for gzip-compressed traces, the gzip
+    module decompresses up to the requested offset.
+
+    Attributes
+        et_path (str): Path to the Chakra execution trace.
+        index (EtIndex): The offset index of the trace.
+    """
+
+    def __init__(self, et_path: str, index_path: Optional[str] = None) -> None:
+        """
+        Open a trace together with its offset index.
+
+        Args:
+            et_path (str): Path to the Chakra execution trace.
+            index_path (Optional[str]): Path to the offset index. Defaults to the sidecar next to the trace.
+
+        Raises:
+            ValueError: If the index does not match the size of the trace file.
+        """
+        self.et_path = et_path
+        self.index = EtIndex.load(index_path or get_index_path(et_path))
+        et_size = os.path.getsize(et_path)
+        if self.index.et_size != et_size:
+            raise ValueError(
+                f"Offset index for '{et_path}' is stale: it was built for a {self.index.et_size}-byte file, but the "
+                f"file is {et_size} bytes. Rebuild it with chakra_indexer."
+            )
+        self.et: IO[bytes] = open_et_file(et_path)
+        self.string_table = StringTable.from_global_metadata(self.get_global_metadata())
+
+    def close(self) -> None:
+        self.et.close()
+
+    def __enter__(self) -> "IndexedEtReader":
+        """Return the reader for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the trace file."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of indexed nodes."""
+        return len(self.index)
+
+    def _read(self, offset: int, length: int) -> memoryview:
+        self.et.seek(offset)
+        data = self.et.read(length)
+        if len(data) != length:
+            raise IOError(f"Unexpected end of file while reading {length} bytes at offset {offset} of {self.et_path}.")
+        return memoryview(data)
+
+    def get_global_metadata(self) -> GlobalMetadata:
+        """Return the GlobalMetadata message of the trace."""
+        global_metadata = GlobalMetadata()
+        if self.index.global_metadata_length:
+            frame = self._read(self.index.global_metadata_offset, self.index.global_metadata_length)
+            global_metadata.ParseFromString(strip_length_prefix(frame))
+        return global_metadata
+
+    def get_node(self, node_id: int) -> ChakraNode:
+        """
+        Return the node with the given ID.
+
+        Raises
+            KeyError: If the node ID is not in the index.
+        """
+        pos = self.index.find(node_id)
+        if pos is None:
+            raise KeyError(f"Node ID {node_id} is not present in {self.et_path}.")
+        node = ChakraNode()
+        node.ParseFromString(strip_length_prefix(self._read(self.index.offsets[pos], self.index.lengths[pos])))
+        return node if self.string_table is None else self.string_table.resolve_node(node)
+
+    def iter_range(self, start_id: int, end_id: int) -> Iterator[ChakraNode]:
+        """
+        Yield the nodes with IDs in [start_id, end_id) in ascending ID order.
+
+        Consecutive nodes that are stored back to back in the file are fetched with a single read.
+        """
+        first, last = self.index.range_positions(start_id, end_id)
+        for run_first, run_last in self._contiguous_runs(first, last):
+            run_offset = self.index.offsets[run_first]
+            end = self.index.offsets[run_last - 1] + self.index.lengths[run_last - 1]
+            data = self._read(run_offset, end - run_offset)
+            for pos in range(run_first, run_last):
+                start = self.index.offsets[pos] - run_offset
+                node = ChakraNode()
+                node.ParseFromString(strip_length_prefix(data[start : start + self.index.lengths[pos]]))
+                yield node if self.string_table is None else self.string_table.resolve_node(node)
+
+    def _contiguous_runs(self, first: int, last: int) -> List[Tuple[int, int]]:
+        """Split index positions [first, last) into runs of frames stored back to back, bounded in total size."""
+        runs = []
+        offsets = self.index.offsets
+        lengths = self.index.lengths
+        run_first = first
+        for pos in range(first + 1, last):
+            if (
+                offsets[pos] != offsets[pos - 1] + lengths[pos - 1]
+                or offsets[pos] + lengths[pos] - offsets[run_first] > MAX_RANGE_READ_SIZE
+            ):
+                runs.append((run_first, pos))
+                run_first = pos
+        if first < last:
+            runs.append((run_first, last))
+        return runs
@@ -0,0 +1,32 @@
+import argparse
+import logging
+import os
+
+from .et_index import build_index, get_index_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Builds the offset index sidecar of a Chakra execution trace for random access to its nodes."
+    )
+    parser.add_argument(
+        "--input_filename", type=str, required=True, help="Specifies the input filename of the Chakra execution trace."
+    )
+    parser.add_argument(
+        "--output_filename",
+        type=str,
+        default=None,
+        help="Specifies the output filename of the offset index. Defaults to the input filename with '.idx' appended.",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO", force=True)
+
+    index = build_index(args.input_filename)
+    output_filename = args.output_filename or get_index_path(args.input_filename)
+    index.save(output_filename, os.path.getsize(args.input_filename))
+    logging.info(f"Offset index is available at {output_filename}.")
+
+
+if __name__ == "__main__":
+    main()
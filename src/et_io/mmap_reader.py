@@ -0,0 +1,201 @@
+import contextlib
+import mmap
+import os
+from typing import Iterator, Optional, Tuple
+
+from ...schema.protobuf.et_def_pb2 import GlobalMetadata
+from ...schema.protobuf.et_def_pb2 import Node as ChakraNode
+from .et_index import EtIndex, get_index_path, strip_length_prefix
+from .string_table import StringTable
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def decode_varint32(buf, pos: int) -> Tuple[int, int]:
+    """
+    Decode a varint32 length prefix from a buffer.
+
+    Args:
+        buf: Any object supporting integer indexing, such as bytes or an mmap.
+        pos (int): Offset of the first byte of the varint.
+
+    Returns:
+        Tuple[int, int]: The decoded value and the offset of the first byte after the varint.
+
+    Raises:
+        IOError: If the varint is truncated or longer than ten bytes.
+    """
+    result = 0
+    shift = 0
+    end = len(buf)
+    while True:
+        if pos >= end:
+            raise IOError("Truncated varint at the end of the file.")
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not (b & 0x80):
+            return result & 0xFFFFFFFF, pos
+        shift += 7
+        if shift >= 64:
+            raise IOError("Too many bytes when decoding varint.")
+
+
+class MmapEtReader:
+    """
+    Zero-copy reader for uncompressed Chakra execution traces.
+
+    The trace is memory-mapped read-only and its length-delimited frames are walked in place; every message is parsed
+    straight from a memoryview slice of the mapping, so no per-node read buffer is allocated. Pages are served from the
+    page cache, which is shared by every process mapping the same file. Random access by node ID is available when an
+    offset index sidecar is present (see chakra_indexer). Node names and operator schemas of traces with interned
+    strings are resolved transparently.
+
+    Gzip-compressed traces cannot be mapped; use IndexedEtReader or protolib.DelimitedReader for those.
+
+    Attributes
+        et_path (str): Path to the Chakra execution trace.
+        index (Optional[EtIndex]): Offset index of the trace, if one is available.
+        string_table (Optional[StringTable]): String table of the trace, or None if its strings are not interned.
+    """
+
+    def __init__(self, et_path: str, index_path: Optional[str] = None) -> None:
+        """
+        Map a trace and, if available, load its offset index.
+
+        Args:
+            et_path (str): Path to the uncompressed Chakra execution trace.
+            index_path (Optional[str]): Path to the offset index. Defaults to the sidecar next to the trace, which is
+                optional.
+
+        Raises:
+            ValueError: If the trace is gzip-compressed or the offset index does not match the trace.
+        """
+        self.et_path = et_path
+        self._file = open(et_path, "rb")  # noqa: SIM115
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._mmap: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        else:
+            # Empty files cannot be mapped.
+            self._mmap = None
+            self._view = memoryview(b"")
+        if self._view[:2] == GZIP_MAGIC:
+            self.close()
+            raise ValueError(
+                f"'{et_path}' is gzip-compressed and cannot be memory-mapped. Decompress it first or read it with "
+                "IndexedEtReader."
+            )
+
+        self.index: Optional[EtIndex] = None
+        index_path = index_path or get_index_path(et_path)
+        if os.path.exists(index_path):
+            self.index = EtIndex.load(index_path)
+            if self.index.et_size != size:
+                self.close()
+                raise ValueError(
+                    f"Offset index '{index_path}' is stale: it was built for a {self.index.et_size}-byte file, but "
+                    f"'{et_path}' is {size} bytes. Rebuild it with chakra_indexer."
+                )
+        self.string_table = StringTable.from_global_metadata(self.get_global_metadata())
+
+    def close(self) -> None:
+        """
+        Unmap the trace and close the file.
+
+        If frames returned by iter_frames are still referenced, the mapping is released once the last of them is
+        garbage collected.
+        """
+        self._view.release()
+        if self._mmap is not None:
+            with contextlib.suppress(BufferError):
+                self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "MmapEtReader":
+        """Return the reader for use as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Unmap the trace and close the file."""
+        self.close()
+
+    def iter_frames(self, offset: int = 0) -> Iterator[memoryview]:
+        """
+        Yield the payload of every frame from the given offset to the end of the trace.
+
+        The payloads are memoryview slices of the mapping and are only valid while the reader is open.
+
+        Args:
+            offset (int): Offset of the first frame to read.
+        """
+        if self._mmap is not None and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        view = self._view
+        buf = self._mmap if self._mmap is not None else b""
+        end = len(view)
+        while offset < end:
+            size, offset = decode_varint32(buf, offset)
+            if not size:
+                return
+            if offset + size > end:
+                raise IOError(f"Truncated message at offset {offset} of {self.et_path}.")
+            yield view[offset : offset + size]
+            offset += size
+
+    def get_global_metadata(self) -> GlobalMetadata:
+        """Return the GlobalMetadata message, which is the first frame of the trace."""
+        global_metadata = GlobalMetadata()
+        for frame in self.iter_frames():
+            global_metadata.ParseFromString(frame)
+            break
+        return global_metadata
+
+    def iter_nodes(self) -> Iterator[ChakraNode]:
+        """Lazily yield every node of the trace in file order."""
+        frames = self.iter_frames()
+        next(frames, None)  # Skip the GlobalMetadata
+        string_table = self.string_table
+        for frame in frames:
+            node = ChakraNode()
+            node.ParseFromString(frame)
+            yield node if string_table is None else string_table.resolve_node(node)
+
+    def __iter__(self) -> Iterator[ChakraNode]:
+        """Lazily yield every node of the trace in file order."""
+        return self.iter_nodes()
+
+    def _require_index(self) -> EtIndex:
+        if self.index is None:
+            raise ValueError(
+                f"Random access requires an offset index for '{self.et_path}'. Build one with chakra_indexer or "
+                "convert the trace with --write-index."
+            )
+        return self.index
+
+    def _node_at(self, pos: int) -> ChakraNode:
+        index = self._require_index()
+        offset = index.offsets[pos]
+        node = ChakraNode()
+        node.ParseFromString(strip_length_prefix(self._view[offset : offset + index.lengths[pos]]))
+        return node if self.string_table is None else self.string_table.resolve_node(node)
+
+    def get_node(self, node_id: int) -> ChakraNode:
+        """
+        Return the node with the given ID using the offset index.
+
+        Raises
+            KeyError: If the node ID is not in the index.
+        """
+        pos = self._require_index().find(node_id)
+        if pos is None:
+            raise KeyError(f"Node ID {node_id} is not present in {self.et_path}.")
+        return self._node_at(pos)
+
+    def iter_range(self, start_id: int, end_id: int) -> Iterator[ChakraNode]:
+        """Lazily yield the nodes with IDs in [start_id, end_id) in ascending ID order using the offset index."""
+        first, last = self._require_index().range_positions(start_id, end_id)
+        for pos in range(first, last):
+            yield self._node_at(pos)
@@ -0,0 +1,225 @@
+import functools
+import gzip
+import io
+import logging
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from ...schema.protobuf.et_def_pb2 import GlobalMetadata
+from ...schema.protobuf.et_def_pb2 import Node as ChakraNode
+from ..third_party.utils.protolib import DelimitedReader
+from .block_gzip import BlockGzipReader, open_et_file
+from .et_index import EtIndex, get_index_path
+from .string_table import StringTable
+
+# Number of byte ranges assigned to each worker, so that uneven ranges still balance across workers.
+RANGES_PER_WORKER = 4
+
+# Approximate size of the frame batches shipped to workers when the trace cannot be split into ranges.
+DEFAULT_BATCH_BYTES = 4 << 20
+
+MapFunction = Callable[[Iterator[ChakraNode]], Any]
+
+
+def _map_frames(frames: Iterable, map_fn: Optional[MapFunction], string_table: Optional[StringTable]) -> Any:
+    """
+    Return the serialized frames as bytes, or the result of map_fn over the nodes they decode to.
+
+    With a string table, the nodes are resolved before map_fn sees them, and frames are returned re-serialized from
+    their resolved nodes.
+    """
+    if string_table is None:
+        if map_fn is None:
+            return [bytes(frame) for frame in frames]
+        return map_fn(ChakraNode.FromString(frame) for frame in frames)
+    nodes = (string_table.resolve_node(ChakraNode.FromString(frame)) for frame in frames)
+    if map_fn is None:
+        return [node.SerializeToString() for node in nodes]
+    return map_fn(nodes)
+
+
+def _read_string_table(et_path: str) -> Optional[StringTable]:
+    """Return the string table stored in the GlobalMetadata of a trace, or None if its strings are not interned."""
+    et = open_et_file(et_path)
+    try:
+        global_metadata = DelimitedReader(et).read_frame()
+    finally:
+        et.close()
+    return StringTable.from_global_metadata(GlobalMetadata.FromString(global_metadata or b""))
+
+
+def _decode_range(
+    et_path: str, start: int, end: int, map_fn: Optional[MapFunction], string_table: Optional[StringTable]
+) -> Any:
+    """Decode the frames stored in bytes [start, end) of the uncompressed trace in a worker process."""
+    et = open_et_file(et_path)
+    try:
+        et.seek(start)
+        data = et.read(end - start)
+    finally:
+        et.close()
+    if len(data) != end - start:
+        raise IOError(f"Unexpected end of file while reading bytes [{start}, {end}) of {et_path}.")
+    return _map_frames(DelimitedReader(io.BytesIO(data)), map_fn, string_table)
+
+
+def plan_ranges(et_path: str, num_ranges: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Split the nodes of a trace into byte ranges that start and end at frame boundaries.
+
+    Frame boundaries come from the offset index sidecar if there is one, or from the block index of a block-compressed
+    gzip trace. Ranges refer to the uncompressed stream and cover every node but not the GlobalMetadata.
+
+    Args:
+        et_path (str): Path to the Chakra execution trace.
+        num_ranges (int): Maximum number of ranges to return.
+
+    Returns:
+        Optional[List[Tuple[int, int]]]: Half-open byte ranges in file order, or None if the trace cannot be split
+            without decoding it sequentially, which is the case for plain gzip traces and for uncompressed traces
+            without an offset index.
+
+    Raises:
+        ValueError: If the offset index does not match the trace.
+    """
+    et = open_et_file(et_path)
+    try:
+        index_path = get_index_path(et_path)
+        if os.path.exists(index_path):
+            index = EtIndex.load(index_path)
+            if index.et_size != os.path.getsize(et_path):
+                raise ValueError(
+                    f"Offset index for '{et_path}' is stale: it was built for a {index.et_size}-byte file, but the "
+                    f"file is {os.path.getsize(et_path)} bytes. Rebuild it with chakra_indexer."
+                )
+            if not len(index):
+                return []
+            if isinstance(et, gzip.GzipFile):
+                return None
+            frames = sorted(zip(index.offsets, index.lengths))
+            end = frames[-1][0] + frames[-1][1]
+            starts = [frames[len(frames) * i // num_ranges][0] for i in range(num_ranges)]
+        elif isinstance(et, BlockGzipReader):
+            reader = DelimitedReader(et)
+            if reader.read_frame() is None:
+                return []
+            end = et.size
+            starts = [reader.tell()]
+            for i in range(1, num_ranges):
+                block_id = et.next_sync_block(et.num_blocks * i // num_ranges)
+                if block_id < et.num_blocks:
+                    starts.append(max(et.sync_offsets[block_id], starts[0]))
+        else:
+            return None
+    finally:
+        et.close()
+    starts = sorted(set(starts))
+    return [(start, next_start) for start, next_start in zip(starts, starts[1:] + [end]) if start < next_start]
+
+
+def _iter_batches(et_path: str, batch_bytes: int) -> Iterator[List[bytes]]:
+    """Read a trace sequentially and yield its node frames in batches of roughly batch_bytes bytes."""
+    et = open_et_file(et_path)
+    try:
+        frames = iter(DelimitedReader(et))
+        next(frames, None)  # Skip the GlobalMetadata
+        batch: List[bytes] = []
+        size = 0
+        for frame in frames:
+            batch.append(bytes(frame))
+            size += len(frame)
+            if size >= batch_bytes:
+                yield batch
+                batch = []
+                size = 0
+        if batch:
+            yield batch
+    finally:
+        et.close()
+
+
+def _ordered_results(pool: Executor, tasks: Iterable[Tuple], max_pending: int) -> Iterator[Any]:
+    """Submit (function, *args) tasks to a pool with at most max_pending in flight and yield results in order."""
+    pending: Deque[Future] = deque()
+    for fn, *args in tasks:
+        pending.append(pool.submit(fn, *args))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def parallel_iter_nodes(
+    et_path: str,
+    workers: Optional[int] = None,
+    map_fn: Optional[MapFunction] = None,
+    batch_bytes: int = DEFAULT_BATCH_BYTES,
+) -> Iterator[Any]:
+    """
+    Decode the nodes of a Chakra execution trace in parallel worker processes.
+
+    When the trace has an offset index sidecar or is a block-compressed gzip file, it is split into byte ranges at
+    frame boundaries and every worker reads and decodes its own ranges. Otherwise, the main process reads the trace
+    sequentially and ships batches of serialized frames to the workers.
+
+    Results are yielded in file order, one per range or batch. Without map_fn, each result is a list of serialized
+    nodes that can be parsed with ChakraNode.FromString. With map_fn, each result is map_fn applied to an iterator over
+    the decoded nodes of the range; map_fn runs in the worker processes and must be picklable, e.g. a module-level
+    function. Interned strings are resolved with the string table of the trace in the workers, so both serialized and
+    decoded nodes hold their original names and operator schemas.
+
+    Args:
+        et_path (str): Path to the Chakra execution trace.
+        workers (Optional[int]): Number of worker processes. Defaults to the number of CPUs.
+        map_fn (Optional[MapFunction]): Function reducing the nodes of a range to a result in the worker.
+        batch_bytes (int): Approximate size of the frame batches when the trace cannot be split into ranges.
+
+    Returns:
+        Iterator[Any]: Batches of serialized nodes, or the results of map_fn, in file order.
+    """
+    workers = workers or os.cpu_count() or 1
+    string_table = _read_string_table(et_path)
+    ranges = plan_ranges(et_path, workers * RANGES_PER_WORKER)
+    if ranges is None:
+        logging.info(
+            f"{et_path} cannot be split into byte ranges; reading it sequentially and decoding batches in workers. "
+            "Write the trace with --block-gzip, or build an offset index with chakra_indexer for uncompressed traces, "
+            "to let workers read their own ranges."
+        )
+        batches = _iter_batches(et_path, batch_bytes)
+        if map_fn is None and string_table is None:
+            yield from batches
+            return
+        tasks: Iterable[Tuple] = ((_map_frames, batch, map_fn, string_table) for batch in batches)
+    else:
+        tasks = ((_decode_range, et_path, start, end, map_fn, string_table) for start, end in ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from _ordered_results(pool, tasks, 2 * workers)
+
+
+def parallel_map_reduce(
+    et_path: str,
+    map_fn: MapFunction,
+    reduce_fn: Callable[[Any, Any], Any],
+    initial: Any,
+    workers: Optional[int] = None,
+) -> Any:
+    """
+    Aggregate the nodes of a Chakra execution trace in parallel.
+
+    map_fn reduces the nodes of every range to a partial result in a worker process (see parallel_iter_nodes), and
+    reduce_fn folds the partial results into initial in file order in the main process.
+
+    Args:
+        et_path (str): Path to the Chakra execution trace.
+        map_fn (MapFunction): Function reducing an iterator over nodes to a partial result.
+        reduce_fn (Callable[[Any, Any], Any]): Function combining the accumulated result with a partial result.
+        initial (Any): Initial value of the accumulated result.
+        workers (Optional[int]): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        Any: The accumulated result.
+    """
+    return functools.reduce(reduce_fn, parallel_iter_nodes(et_path, workers, map_fn), initial)
@@ -0,0 +1,165 @@
+import functools
+import operator
+from collections import namedtuple
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+from google.protobuf.descriptor import FieldDescriptor
+
+from ...schema.protobuf import et_def_pb2
+from ..third_party.utils.protolib import DelimitedReader
+from .block_gzip import open_et_file
+from .string_table import StringTable
+
+# Fields needed to rebuild the dependency graph of a trace.
+DEFAULT_PROJECTION_FIELDS = ("id", "type", "data_deps", "duration_micros")
+
+# Fields holding interned strings or their references, all decoded to resolve any of them.
+INTERNED_FIELDS = ("name", "attr")
+
+PROJECTION_PACKAGE = "ChakraProtoMsg.projection"
+
+_et_def_file = descriptor_pb2.FileDescriptorProto()
+et_def_pb2.DESCRIPTOR.CopyToProto(_et_def_file)
+
+
+@functools.lru_cache(maxsize=None)
+def _projected_message_class(fields: Tuple[str, ...]) -> Any:
+    """
+    Return a message class declaring only the given Node fields, with their original field numbers.
+
+    Parsing a Node with this class makes the protobuf runtime skip every other field at the wire level instead of
+    decoding it into Python objects.
+    """
+    node_proto = next(message for message in _et_def_file.message_type if message.name == "Node")
+    name = "Node_" + "_".join(fields)
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name=f"chakra_projection/{name}.proto",
+        package=PROJECTION_PACKAGE,
+        syntax=_et_def_file.syntax,
+        dependency=[_et_def_file.name],
+    )
+    message_proto = file_proto.message_type.add(name=name)
+    for field in node_proto.field:
+        if field.name in fields:
+            message_proto.field.add().CopyFrom(field)
+    # Registered in the pool of et_def_pb2 so that message fields use the regular IOInfo and AttributeProto classes.
+    pool = descriptor_pool.Default()
+    pool.Add(file_proto)
+    return message_factory.GetMessageClass(pool.FindMessageTypeByName(f"{PROJECTION_PACKAGE}.{name}"))
+
+
+# Copies a repeated scalar field into a list; slicing is about twice as fast as list() on protobuf containers.
+_copy_repeated = operator.itemgetter(slice(None))
+
+
+def _copy_message(message: Any) -> Any:
+    copy = type(message)()
+    copy.CopyFrom(message)
+    return copy
+
+
+def _copy_messages(messages: Iterable) -> List:
+    return [_copy_message(message) for message in messages]
+
+
+class NodeProjection:
+    """
+    Decoder of a subset of the fields of Chakra nodes.
+
+    The requested fields are decoded from each serialized node into a lightweight named tuple (the record type), and
+    all other fields, such as the stringified inputs and outputs or the attributes, are skipped at the wire level. This
+    is much cheaper in time and memory than Node.ParseFromString for tools that only need a few fields. Repeated fields
+    are returned as lists and message fields as detached copies.
+
+    In a trace with interned strings, the name of a node is stored as a reference among its attributes. Given the
+    string table of the trace, a projection of the name or the attributes decodes both and resolves the references,
+    so that records hold the original strings.
+
+    Attributes
+        fields (Tuple[str, ...]): Names of the projected Node fields, in record order.
+        record_type (type): Named tuple type of the decoded records.
+        message_class (type): Message type declaring only the decoded fields, for callers that read the fields of
+            every node straight from the parsed message instead of building records.
+        string_table (Optional[StringTable]): String table the references of interned nodes are resolved with, or
+            None if the trace has no interned strings.
+    """
+
+    def __init__(
+        self, fields: Sequence[str] = DEFAULT_PROJECTION_FIELDS, string_table: Optional[StringTable] = None
+    ) -> None:
+        """
+        Create a projection of the given Node fields.
+
+        Raises
+            ValueError: If a field is not a Node field or is repeated in the projection.
+        """
+        node_fields = et_def_pb2.Node.DESCRIPTOR.fields_by_name
+        unknown = [field for field in fields if field not in node_fields]
+        if unknown:
+            raise ValueError(f"Unknown Node fields in projection: {', '.join(unknown)}.")
+        if not fields or len(set(fields)) != len(fields):
+            raise ValueError(f"A projection needs at least one field and no duplicates, got {list(fields)}.")
+        self.fields = tuple(fields)
+        self.record_type = namedtuple("NodeRecord", self.fields)  # type: ignore[misc]
+        decoded_fields = set(self.fields)
+        if string_table is not None and decoded_fields.intersection(INTERNED_FIELDS):
+            decoded_fields.update(INTERNED_FIELDS)
+        else:
+            string_table = None
+        self.string_table = string_table
+        self.message_class = _projected_message_class(tuple(sorted(decoded_fields)))
+        getter = operator.attrgetter(*self.fields)
+        self._get: Callable[[Any], Tuple] = getter if len(self.fields) > 1 else lambda message: (getter(message),)
+        self._converters: List[Tuple[int, Callable]] = []
+        for pos, name in enumerate(self.fields):
+            field = node_fields[name]
+            is_message = field.type == FieldDescriptor.TYPE_MESSAGE
+            if field.label == FieldDescriptor.LABEL_REPEATED:
+                self._converters.append((pos, _copy_messages if is_message else _copy_repeated))
+            elif is_message:
+                self._converters.append((pos, _copy_message))
+
+    def decode(self, frame) -> Tuple:
+        """Decode the projected fields of a serialized node into a record."""
+        return next(self.decode_frames((frame,)))
+
+    def decode_frames(self, frames: Iterable) -> Iterator[Tuple]:
+        """Decode the projected fields of every serialized node into a record."""
+        get = self._get
+        converters = self._converters
+        record_type = self.record_type
+        new = tuple.__new__
+        messages = map(self.message_class.FromString, frames)
+        if self.string_table is not None:
+            messages = map(self.string_table.resolve_node, messages)
+        for message in messages:
+            values = get(message)
+            if converters:
+                values = list(values)
+                for pos, convert in converters:
+                    values[pos] = convert(values[pos])
+            yield new(record_type, values)
+
+
+def iter_projected_nodes(et_path: str, fields: Sequence[str] = DEFAULT_PROJECTION_FIELDS) -> Iterator[Tuple]:
+    """
+    Yield a record holding the projected fields of every node of a Chakra execution trace.
+
+    Interned names and operator schemas are resolved with the string table of the trace.
+
+    Args:
+        et_path (str): Path to the Chakra execution trace.
+        fields (Sequence[str]): Names of the Node fields to decode.
+
+    Returns:
+        Iterator[Tuple]: Named tuples with one attribute per projected field, in file order.
+    """
+    et = open_et_file(et_path)
+    try:
+        frames = iter(DelimitedReader(et))
+        global_metadata = next(frames, None)
+        string_table = StringTable.from_global_metadata(et_def_pb2.GlobalMetadata.FromString(global_metadata or b""))
+        yield from NodeProjection(fields, string_table).decode_frames(frames)
+    finally:
+        et.close()
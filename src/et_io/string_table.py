@@ -0,0 +1,102 @@
+from typing import Dict, Iterable, List, Optional
+
+from ...schema.protobuf.et_def_pb2 import AttributeProto as ChakraAttr
+from ...schema.protobuf.et_def_pb2 import GlobalMetadata, StringList
+from ...schema.protobuf.et_def_pb2 import Node as ChakraNode
+
+# GlobalMetadata attribute holding the string table of a trace with interned strings.
+STRING_TABLE_ATTR = "string_table"
+
+# Node attribute holding the string table code of the node name.
+NAME_REF_ATTR = "name_ref"
+
+# Node attribute holding the operator schema, and its interned counterpart holding a string table code.
+OP_SCHEMA_ATTR = "op_schema"
+OP_SCHEMA_REF_ATTR = "op_schema_ref"
+
+
+class StringTable:
+    """
+    Interning table for the node names and operator schemas of a Chakra execution trace.
+
+    Long strings such as aten operator schemas are repeated across millions of nodes. In a trace with interned
+    strings, every distinct string is stored once in the `string_table` attribute of the GlobalMetadata, and each node
+    refers to it by code: the node name is left empty and its code is stored in a trailing `name_ref` attribute, and
+    the `op_schema` attribute is replaced in place by an `op_schema_ref` attribute holding the code of the schema.
+    resolve_node restores the original node exactly.
+
+    Attributes
+        strings (List[str]): The interned strings, indexed by code.
+    """
+
+    def __init__(self, strings: Iterable[str] = ()) -> None:
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for string in strings:
+            self.intern(string)
+
+    def __len__(self) -> int:
+        """Return the number of interned strings."""
+        return len(self.strings)
+
+    def __getitem__(self, code: int) -> str:
+        """Return the string with the given code."""
+        return self.strings[code]
+
+    def intern(self, string: str) -> int:
+        """Return the code of a string, adding it to the table if needed."""
+        code = self._codes.get(string)
+        if code is None:
+            code = self._codes[string] = len(self.strings)
+            self.strings.append(string)
+        return code
+
+    @classmethod
+    def from_global_metadata(cls, global_metadata: GlobalMetadata) -> Optional["StringTable"]:
+        """Return the string table of a trace, or None if its strings are not interned."""
+        for attr in global_metadata.attr:
+            if attr.name == STRING_TABLE_ATTR:
+                table = cls()
+                table.strings = attr.string_list.values[:]
+                table._codes = {string: code for code, string in enumerate(table.strings)}
+                return table
+        return None
+
+    def to_attr(self) -> ChakraAttr:
+        """Return the GlobalMetadata attribute storing the table."""
+        return ChakraAttr(name=STRING_TABLE_ATTR, string_list=StringList(values=self.strings))
+
+    def intern_node(self, node: ChakraNode) -> None:
+        """Replace the name and operator schema of a node with references to the table, in place."""
+        for attr in node.attr:
+            if attr.name == OP_SCHEMA_ATTR and attr.HasField("string_val"):
+                attr.name = OP_SCHEMA_REF_ATTR
+                attr.int64_val = self.intern(attr.string_val)
+                break
+        node.attr.append(ChakraAttr(name=NAME_REF_ATTR, int64_val=self.intern(node.name)))
+        node.ClearField("name")
+
+    def resolve_node(self, node: ChakraNode) -> ChakraNode:
+        """
+        Replace the references of an interned node with the strings they refer to, in place.
+
+        Nodes without references are left untouched, so resolving an already resolved node is harmless.
+
+        Returns
+            ChakraNode: The resolved node.
+        """
+        attrs = node.attr
+        if not attrs:
+            return node
+        strings = self.strings
+        # intern_node appends the name reference last, so it is found without scanning the attributes.
+        last = attrs[-1]
+        if last.name == NAME_REF_ATTR:
+            node.name = strings[last.int64_val]
+            del attrs[-1]
+        for attr in attrs:
+            if attr.name == OP_SCHEMA_REF_ATTR:
+                attr.name = OP_SCHEMA_ATTR
+                attr.string_val = strings[attr.int64_val]
+                break
+        return node
@@ -0,0 +1,221 @@
+import hashlib
+import logging
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_MAX_GB = 20.0
+
+# Size of the chunks input files are hashed in.
+HASH_CHUNK_SIZE = 1 << 20
+
+# Suffix of the files an entry is written to before it is renamed into place.
+_TMP_SUFFIX = ".tmp"
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of the contents of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detach_output(output_file: str) -> None:
+    """
+    Remove an output file before it is written again.
+
+    An output placed from a cache is a hard link to the cache entry. Writers open their output paths in place, so
+    without this they would write the new output through the link into the entry.
+    """
+    if os.path.lexists(output_file):
+        os.remove(output_file)
+
+
+@lru_cache(maxsize=None)
+def code_digest() -> str:
+    """
+    Return a digest of the Chakra sources and schema that generate the cached traces.
+
+    Any change to the code, released or not, changes the digest, so that outputs of an older linker or converter are
+    never reused.
+    """
+    package_root = Path(__file__).resolve().parents[2]
+    digest = hashlib.sha256()
+    for path in sorted((package_root / "src").rglob("*.py")) + sorted((package_root / "schema").rglob("*.proto")):
+        digest.update(path.relative_to(package_root).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class TraceCache:
+    """
+    Content-addressed on-disk cache of generated trace files.
+
+    An entry is keyed by a hash of the contents of the input traces, the options the output was generated with, and
+    the code generating it, so unchanged inputs map to the same entry even if they are moved or renamed. Entries are
+    placed at their output paths as hard links, or copies where the cache is on another file system. The cache is
+    bounded in size; when it grows beyond its limit, the least recently used entries are evicted first, using the
+    modification time of an entry, which is refreshed on every hit, as its last use.
+
+    A hard-linked output shares its contents with the cache entry, so the Chakra writers and generate_cached remove an
+    output with detach_output before writing it again, and the new output gets its own inode. An entry is stored as a
+    copy of the generated output, so that rewriting that output does not change the entry either.
+
+    Attributes
+        cache_dir (Path): Directory holding the entries.
+        max_bytes (int): Total size of the entries beyond which the least recently used ones are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = int(DEFAULT_CACHE_MAX_GB * (1 << 30))) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(kind: str, input_files: List[str], options: Dict[str, Any]) -> str:
+        """
+        Compute the key of an output.
+
+        Args:
+            kind (str): Kind of output, such as 'link' or 'convert', so that different tools never share an entry.
+            input_files (List[str]): Input traces the output is generated from, in a fixed order.
+            options (Dict[str, Any]): Options affecting the contents of the output. Values must be JSON serializable.
+
+        Returns:
+            str: The hex digest identifying the output.
+        """
+        description = {
+            "cache_version": CACHE_VERSION,
+            "code": code_digest(),
+            "kind": kind,
+            "inputs": [hash_file(path) for path in input_files],
+            "options": options,
+        }
+        return hashlib.sha256(orjson.dumps(description, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        """Return the path of the entry of a key."""
+        return self.cache_dir / key[:2] / key
+
+    def fetch(self, key: str, output_file: str) -> bool:
+        """
+        Place the cached output of a key at its output path.
+
+        Nothing is done if the output path already is the cached entry, which is the case when the output was
+        produced or fetched by an earlier run and the inputs have not changed since.
+
+        Args:
+            key (str): Key of the output.
+            output_file (str): Path the output is expected at.
+
+        Returns:
+            bool: True if the output was found in the cache, False if it must be generated.
+        """
+        entry = self.entry_path(key)
+        output = Path(output_file)
+        if not entry.is_file():
+            detach_output(output_file)
+            return False
+
+        os.utime(entry)
+        if output.exists() and os.path.samefile(entry, output):
+            logging.info(f"Output '{output_file}' is up to date in cache entry {key}.")
+            return True
+        self._place(entry, output)
+        logging.info(f"Placed cached output {key} at '{output_file}'.")
+        return True
+
+    def store(self, key: str, output_file: str) -> None:
+        """
+        Add a generated output to the cache and evict the least recently used entries if it grew beyond its limit.
+
+        Args:
+            key (str): Key of the output.
+            output_file (str): Path of the generated output.
+        """
+        entry = self.entry_path(key)
+        entry.parent.mkdir(exist_ok=True)
+        # The entry is a copy, so that writers rewriting the generated output in place do not change it.
+        tmp = entry.with_name(entry.name + _TMP_SUFFIX)
+        if tmp.exists():
+            tmp.unlink()
+        shutil.copyfile(output_file, tmp)
+        os.replace(tmp, entry)
+        logging.debug(f"Stored '{output_file}' as cache entry {key}.")
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the entries fit in the size limit."""
+        entries = []
+        for path in self.cache_dir.glob("*/*"):
+            if path.name.endswith(_TMP_SUFFIX):
+                continue
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink()
+            total -= size
+            logging.info(f"Evicted cache entry {path.name} ({size} bytes).")
+
+    @staticmethod
+    def _place(source: Path, destination: Path) -> None:
+        """Atomically replace destination with a hard link to source, or a copy of it across file systems."""
+        tmp = destination.with_name(destination.name + _TMP_SUFFIX)
+        if tmp.exists():
+            tmp.unlink()
+        try:
+            os.link(source, tmp)
+        except OSError:
+            shutil.copyfile(source, tmp)
+        os.replace(tmp, destination)
+
+
+def open_trace_cache(cache_dir: Optional[str], max_gb: float = DEFAULT_CACHE_MAX_GB) -> Optional[TraceCache]:
+    """Return the cache in a directory given on the command line, or None if caching is disabled."""
+    if not cache_dir:
+        return None
+    return TraceCache(cache_dir, int(max_gb * (1 << 30)))
+
+
+def generate_cached(
+    cache: Optional[TraceCache],
+    kind: str,
+    input_files: List[str],
+    options: Dict[str, Any],
+    output_file: str,
+    generate: Callable[[], None],
+) -> bool:
+    """
+    Generate an output, or place its cached copy at the output path if its inputs and options are unchanged.
+
+    Args:
+        cache (Optional[TraceCache]): Cache to look the output up in and store it to, or None to always generate it.
+        kind (str): Kind of output, see TraceCache.make_key.
+        input_files (List[str]): Input traces the output is generated from.
+        options (Dict[str, Any]): Options affecting the contents of the output.
+        output_file (str): Path of the output.
+        generate (Callable[[], None]): Writes the output to output_file.
+
+    Returns:
+        bool: True if the output was taken from the cache, False if it was generated.
+    """
+    if cache is None:
+        detach_output(output_file)
+        generate()
+        return False
+    key = cache.make_key(kind, input_files, options)
+    if cache.fetch(key, output_file):
+        return True
+    generate()
+    cache.store(key, output_file)
+    return False
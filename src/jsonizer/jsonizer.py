@@ -1,5 +1,6 @@
 import argparse
 import gzip
+from typing import Dict, Iterator, List
 
 import orjson
 from google.protobuf.json_format import MessageToDict
@@ -11,8 +12,15 @@ from ...schema.protobuf.et_def_pb2 import (
 from ...schema.protobuf.et_def_pb2 import (
     Node as ChakraNode,
 )
+from ..et_io.block_gzip import open_et_file
+from ..et_io.parallel_reader import parallel_iter_nodes
+from ..et_io.string_table import StringTable
 from ..third_party.utils.protolib import decodeMessage as decode_message
-from ..third_party.utils.protolib import openFileRd as open_file_rd
+
+
+def nodes_to_dicts(nodes: Iterator[ChakraNode]) -> List[Dict]:
+    """Convert decoded nodes to dictionaries in a worker process."""
+    return [MessageToDict(node) for node in nodes]
 
 
 def main() -> None:
@@ -23,18 +31,33 @@ def main() -> None:
     parser.add_argument(
         "--output_filename", type=str, required=True, help="Specifies the output filename for the JSON data."
     )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        default=1,
+        help="Specifies the number of processes decoding the trace. With more than one, ranges of the trace are "
+        "decoded in parallel worker processes.",
+    )
     args = parser.parse_args()
 
-    execution_trace = open_file_rd(args.input_filename)
+    execution_trace = open_et_file(args.input_filename)
     node = ChakraNode()
     trace_objects: list = []
     global_metadata = GlobalMetadata()
     decode_message(execution_trace, global_metadata)
     trace_objects.append(MessageToDict(global_metadata))
+    string_table = StringTable.from_global_metadata(global_metadata)
     progress_bar = tqdm(desc="Loading chakra nodes", unit="node")
-    while decode_message(execution_trace, node):
-        trace_objects.append(MessageToDict(node))
-        progress_bar.update(1)
+    if args.num_workers > 1:
+        for node_dicts in parallel_iter_nodes(args.input_filename, args.num_workers, nodes_to_dicts):
+            trace_objects.extend(node_dicts)
+            progress_bar.update(len(node_dicts))
+    else:
+        while decode_message(execution_trace, node):
+            if string_table is not None:
+                string_table.resolve_node(node)
+            trace_objects.append(MessageToDict(node))
+            progress_bar.update(1)
     progress_bar.close()
     with (
         gzip.open(args.output_filename, "wb")
@@ -70,6 +70,13 @@
 
 import gzip
 import struct
+import weakref
+
+# Number of bytes DelimitedReader pulls from the underlying file per read.
+DEFAULT_READ_CHUNK_SIZE = 1 << 20
+
+# Number of buffered bytes after which DelimitedWriter flushes to the file.
+DEFAULT_WRITE_BUFFER_SIZE = 1 << 20
 
 
 def openFileRd(in_file):
@@ -128,20 +135,181 @@ def _DecodeVarint32(in_file):
             raise IOError("Too many bytes when decoding varint.")
 
 
+class DelimitedReader:
+    """
+    Reads varint length-delimited messages from a file in large blocks.
+
+    The length prefixes are decoded directly out of an in-memory block
+    instead of issuing one read per varint byte, and each message payload
+    is handed out as a memoryview slice of that block so it can be passed
+    to ParseFromString without an intermediate copy. Only the unconsumed
+    tail of a block is copied when a frame straddles a block boundary.
+
+    Once a file handle is wrapped, all further reads must go through the
+    reader since it consumes the file ahead of the returned frames.
+    """
+
+    def __init__(self, in_file, chunk_size=DEFAULT_READ_CHUNK_SIZE):
+        self.in_file = in_file
+        self.chunk_size = chunk_size
+        self._buf = b""
+        self._pos = 0
+        self._base = 0
+        self._eof = False
+        self._frames = None
+
+    def tell(self):
+        """
+        Return the number of bytes consumed since the reader was created,
+        i.e. the offset of the next frame relative to where reading began.
+        """
+        return self._base + self._pos
+
+    def _fill(self, needed):
+        """
+        Make sure at least `needed` unconsumed bytes are buffered. Return
+        False if the end of the file is reached first.
+        """
+        available = len(self._buf) - self._pos
+        while available < needed and not self._eof:
+            data = self.in_file.read(max(self.chunk_size, needed - available))
+            if not data:
+                self._eof = True
+                break
+            # Keep the returned memoryviews valid by never resizing a block
+            # in place; the leftover tail is copied into a new block instead.
+            self._base += len(self._buf) - available
+            self._buf = self._buf[self._pos:] + data if available else data
+            self._pos = 0
+            available = len(self._buf)
+        return available >= needed
+
+    def _decode_varint32(self):
+        """
+        Decode a varint at the current position. Return None if the end of
+        the file is reached before the first byte of the varint.
+        """
+        buf = self._buf
+        pos = self._pos
+        end = len(buf)
+        result = 0
+        shift = 0
+        while True:
+            if pos == end:
+                consumed = pos - self._pos
+                if not self._fill(consumed + 1):
+                    if consumed == 0:
+                        return None
+                    raise IOError("Truncated varint at the end of the file.")
+                buf = self._buf
+                pos = self._pos + consumed
+                end = len(buf)
+            b = buf[pos]
+            pos += 1
+            result |= (b & 0x7F) << shift
+            if not (b & 0x80):
+                self._pos = pos
+                return result & 0xFFFFFFFF
+            shift += 7
+            if shift >= 64:
+                raise IOError("Too many bytes when decoding varint.")
+
+    def read_frame(self):
+        """
+        Return the payload of the next message as a memoryview, or None if
+        the end of the file (or a zero-length frame) is reached.
+        """
+        size = self._decode_varint32()
+        if not size:
+            return None
+        if not self._fill(size):
+            raise IOError("Truncated message at the end of the file.")
+        start = self._pos
+        self._pos = start + size
+        return memoryview(self._buf)[start:start + size]
+
+    def __iter__(self):
+        while True:
+            # Fast path: walk the frames that lie entirely inside the current
+            # block without any per-frame method calls. A varint32 prefix is
+            # at most 5 bytes, so stop early enough that one never straddles
+            # the end of the block.
+            buf = self._buf
+            view = memoryview(buf)
+            end = len(buf)
+            limit = end - 5
+            pos = self._pos
+            while pos < limit:
+                start = pos
+                b = buf[pos]
+                pos += 1
+                size = b & 0x7F
+                shift = 7
+                while b & 0x80:
+                    if shift >= 64:
+                        raise IOError("Too many bytes when decoding varint.")
+                    b = buf[pos]
+                    pos += 1
+                    size |= (b & 0x7F) << shift
+                    shift += 7
+                size &= 0xFFFFFFFF
+                if not size:
+                    self._pos = pos
+                    return
+                if pos + size > end:
+                    pos = start
+                    break
+                self._pos = pos + size
+                yield view[pos:pos + size]
+                # Pick up any reads made through read_frame or decode while
+                # the generator was suspended.
+                pos = self._pos
+                if self._buf is not buf:
+                    break
+            else:
+                self._pos = pos
+
+            # Slow path: the next frame crosses the block boundary.
+            frame = self.read_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def decode(self, message):
+        """
+        Read the next message into `message`. Return False if no message
+        could be read.
+        """
+        if self._frames is None:
+            self._frames = iter(self)
+        try:
+            frame = next(self._frames, None)
+        except IOError:
+            return False
+        if frame is None:
+            return False
+        message.ParseFromString(frame)
+        return True
+
+
+# Readers created on behalf of decodeMessage, keyed by the file they wrap.
+_readers = weakref.WeakKeyDictionary()
+
+
 def decodeMessage(in_file, message):
     """
     Attempt to read a message from the file and decode it. Return
     False if no message could be read.
+
+    This is a compatibility wrapper around DelimitedReader; a reader is
+    created for the file on first use and reused by subsequent calls.
     """
-    try:
-        size, pos = _DecodeVarint32(in_file)
-        if size == 0:
-            return False
-        buf = in_file.read(size)
-        message.ParseFromString(buf)
-        return True
-    except IOError:
-        return False
+    if isinstance(in_file, DelimitedReader):
+        return in_file.decode(message)
+    reader = _readers.get(in_file)
+    if reader is None:
+        reader = _readers[in_file] = DelimitedReader(in_file)
+    return reader.decode(message)
 
 
 def _EncodeVarint32(out_file, value):
@@ -159,10 +327,122 @@ def _EncodeVarint32(out_file, value):
     out_file.write(struct.pack("<B", bits))
 
 
+def _VarintBytes(value):
+    """
+    Encode a varint into a bytes object. Produces the same bytes as
+    _EncodeVarint32 without a write per byte.
+    """
+    if value <= 0x7F:
+        return bytes((value,))
+    out = bytearray()
+    while value > 0x7F:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+class DelimitedWriter:
+    """
+    Writes varint length-delimited messages to a file in large chunks.
+
+    Length prefixes and serialized messages are appended to an in-memory
+    buffer which is only written to the underlying file once it grows past
+    `buffer_size`, so a gzip stream sees a few large writes instead of
+    several small ones per message. The output is byte-identical to
+    calling encodeMessage for every message.
+
+    The buffer must be flushed before the underlying file is closed, either
+    explicitly or by using the writer as a context manager.
+
+    If the file has a write_records(data, record_starts) method, as
+    block-compressed gzip writers do, the buffer is flushed through it
+    together with the offsets of the messages it holds, so that the file
+    knows where every message starts.
+    """
+
+    def __init__(self, out_file, buffer_size=DEFAULT_WRITE_BUFFER_SIZE, start_offset=0):
+        self.out_file = out_file
+        self.buffer_size = buffer_size
+        self._buf = bytearray()
+        self._flushed = start_offset
+        self._write_records = getattr(out_file, "write_records", None)
+        self._starts = [] if self._write_records is not None else None
+
+    def tell(self):
+        """
+        Return the offset at which the next message will start, counting
+        buffered bytes and starting from `start_offset`.
+        """
+        return self._flushed + len(self._buf)
+
+    def write(self, message):
+        """
+        Append a message with its length prepended as a 32-bit varint.
+        """
+        out = message.SerializeToString()
+        buf = self._buf
+        if self._starts is not None:
+            self._starts.append(len(buf))
+        size = len(out)
+        while size > 0x7F:
+            buf.append(0x80 | (size & 0x7F))
+            size >>= 7
+        buf.append(size)
+        buf += out
+        if len(buf) >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, messages):
+        """
+        Append every message of an iterable, flushing as the buffer fills.
+        """
+        buf = self._buf
+        buffer_size = self.buffer_size
+        starts = self._starts
+        for message in messages:
+            out = message.SerializeToString()
+            if starts is not None:
+                starts.append(len(buf))
+            size = len(out)
+            while size > 0x7F:
+                buf.append(0x80 | (size & 0x7F))
+                size >>= 7
+            buf.append(size)
+            buf += out
+            if len(buf) >= buffer_size:
+                self.flush()
+                buf = self._buf
+
+    def flush(self):
+        """
+        Write all buffered bytes to the underlying file.
+        """
+        if self._buf:
+            if self._starts is not None:
+                self._write_records(self._buf, self._starts)
+                self._starts.clear()
+            else:
+                self.out_file.write(self._buf)
+            self._flushed += len(self._buf)
+            self._buf = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+
 def encodeMessage(out_file, message):
     """
     Encoded a message with the length prepended as a 32-bit varint.
+
+    The prefix and the message are issued as a single write; if `out_file`
+    is a DelimitedWriter, the message is added to its buffer instead.
     """
+    if isinstance(out_file, DelimitedWriter):
+        out_file.write(message)
+        return
     out = message.SerializeToString()
-    _EncodeVarint32(out_file, len(out))
-    out_file.write(out)
+    out_file.write(_VarintBytes(len(out)) + out)
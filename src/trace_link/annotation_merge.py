@@ -0,0 +1,135 @@
+import bisect
+from operator import attrgetter
+from typing import Dict, List, Tuple
+
+from .kineto_operator import KinetoOperator
+
+# An annotation with the index of the operator of the original list it is placed right before.
+AnchoredAnnotation = Tuple[KinetoOperator, int]
+
+
+def _first_ops_at_or_after(ops: List[KinetoOperator], start_by_tid: Dict[int, int]) -> Dict[int, int]:
+    """Return the index of the first operator of every thread starting at or after the given time of the thread."""
+    # Threads without operators, such as GPU streams, are left out so that the scan can stop once all others are found.
+    present_tids = set(map(attrgetter("tid"), ops))
+    pending = {tid: start for tid, start in start_by_tid.items() if tid in present_tids}
+    first: Dict[int, int] = {}
+    for i, op in enumerate(ops):
+        if not pending:
+            break
+        start = pending.get(op.tid)
+        if start is not None and op.timestamp >= start:
+            first[op.tid] = i
+            del pending[op.tid]
+    return first
+
+
+def _place_by_scan(
+    ops: List[KinetoOperator],
+    front: List[KinetoOperator],
+    buckets: Dict[int, List[KinetoOperator]],
+    tid: int,
+    annotation: KinetoOperator,
+) -> None:
+    """
+    Place an annotation whose thread ID is shared by the annotations already placed, which can then be its anchor.
+
+    The list built so far is scanned in order, like list.insert after a search over the list would do.
+    """
+    start = annotation.timestamp
+    for i, placed in enumerate(front):
+        if placed.tid == tid and placed.timestamp >= start:
+            front.insert(i, annotation)
+            return
+    for k in range(len(ops) + 1):
+        bucket = buckets.get(k, [])
+        for j, placed in enumerate(bucket):
+            if placed.tid == tid and placed.timestamp >= start:
+                bucket.insert(j, annotation)
+                return
+        if k < len(ops) and ops[k].tid == tid and ops[k].timestamp >= start:
+            buckets.setdefault(k, []).append(annotation)
+            return
+    buckets.setdefault(len(ops), []).append(annotation)
+
+
+def insert_annotations(
+    ops: List[KinetoOperator],
+    process_annotation_op: KinetoOperator,
+    thread_annotation_ops: List[Tuple[int, KinetoOperator]],
+) -> Tuple[List[KinetoOperator], List[AnchoredAnnotation]]:
+    """
+    Insert the process and thread annotations into a list of operators in a single pass.
+
+    The result is the list obtained by inserting the process annotation at the front, then every thread annotation,
+    in order, right before the first operator of its thread starting at or after the annotation, or at the end if there
+    is none. The operators of all threads are scanned once to find these positions instead of once per thread.
+
+    Args:
+        ops (List[KinetoOperator]): Operators to annotate.
+        process_annotation_op (KinetoOperator): Process annotation, placed first.
+        thread_annotation_ops (List[Tuple[int, KinetoOperator]]): Thread IDs and their annotations, in insertion order.
+
+    Returns:
+        Tuple[List[KinetoOperator], List[AnchoredAnnotation]]: The annotated list, and the annotations in the order of
+            that list, each with the index in ops of the operator following it.
+    """
+    front: List[KinetoOperator] = [process_annotation_op]
+    buckets: Dict[int, List[KinetoOperator]] = {}
+    annotation_tids = {process_annotation_op.tid} | {annotation.tid for _, annotation in thread_annotation_ops}
+    first = _first_ops_at_or_after(
+        ops, {tid: annotation.timestamp for tid, annotation in thread_annotation_ops if tid not in annotation_tids}
+    )
+    for tid, annotation in thread_annotation_ops:
+        if tid in annotation_tids:
+            _place_by_scan(ops, front, buckets, tid, annotation)
+        else:
+            buckets.setdefault(first.get(tid, len(ops)), []).append(annotation)
+
+    annotated: List[KinetoOperator] = list(front)
+    anchored: List[AnchoredAnnotation] = [(annotation, 0) for annotation in front]
+    start = 0
+    for anchor in sorted(buckets):
+        annotated.extend(ops[start:anchor])
+        annotated.extend(buckets[anchor])
+        anchored.extend((annotation, anchor) for annotation in buckets[anchor])
+        start = anchor
+    annotated.extend(ops[start:])
+    return annotated, anchored
+
+
+def merge_sorted_annotations(
+    sorted_ops: List[KinetoOperator], sorted_op_ts: List[int], anchored: List[AnchoredAnnotation]
+) -> Tuple[List[KinetoOperator], List[int]]:
+    """
+    Merge annotations into operators sorted by timestamp, as a stable sort of the annotated list would order them.
+
+    Ties between an annotation and an operator are broken by their order in the annotated list, where the annotation
+    precedes the operators from its anchor on. The position of every annotation is found with a bisect, and the
+    operators between two annotations are copied as a slice.
+
+    Args:
+        sorted_ops (List[KinetoOperator]): Operators the annotations were inserted into, already sorted by timestamp.
+        sorted_op_ts (List[int]): Timestamps of sorted_ops.
+        anchored (List[AnchoredAnnotation]): Annotations in the order of the annotated list, with their anchors.
+
+    Returns:
+        Tuple[List[KinetoOperator], List[int]]: The merged operators and their timestamps.
+    """
+    merged: List[KinetoOperator] = []
+    merged_ts: List[int] = []
+    start = 0
+    for annotation, anchor in sorted(anchored, key=lambda item: item[0].timestamp):
+        timestamp = annotation.timestamp
+        # Operators tied with the annotation precede it only if they precede its anchor.
+        position = max(
+            bisect.bisect_left(sorted_op_ts, timestamp), min(anchor, bisect.bisect_right(sorted_op_ts, timestamp))
+        )
+        merged.extend(sorted_ops[start:position])
+        merged_ts.extend(sorted_op_ts[start:position])
+        merged.append(annotation)
+        merged_ts.append(timestamp)
+        start = position
+    merged.extend(sorted_ops[start:])
+    merged_ts.extend(sorted_op_ts[start:])
+    return merged, merged_ts
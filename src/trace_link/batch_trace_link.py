@@ -3,9 +3,13 @@ import logging
 import os
 import sys
 from collections import namedtuple
+from functools import partial
 from pathlib import Path
+from typing import Optional
 
-from ..converter.pytorch_converter import PyTorchConverter
+from ..converter.batch_converter import convert_pytorch
+from ..et_io.trace_cache import DEFAULT_CACHE_MAX_GB, TraceCache, generate_cached, open_trace_cache
+from .kineto_event_filter import LINKED_CATEGORIES, parse_categories
 from .trace_linker import TraceLinker
 
 ToolArgs = namedtuple("ToolArgs", [
@@ -85,6 +89,72 @@ def find_tool_args(
     return tool_args
 
 
+def link_trace_pairs(tool_args: list[ToolArgs], args: argparse.Namespace, cache: Optional[TraceCache]) -> None:
+    """Link every host and device trace pair, taking unchanged pairs from the cache."""
+    device_categories = parse_categories(args.device_categories)
+    # Exclusive durations do not depend on how they are calculated, so the number of workers is not an option.
+    options = {
+        "device_categories": sorted(device_categories) if device_categories is not None else None,
+        "compress": args.compress,
+        "compress_threads": args.compress_threads,
+    }
+    for idx, tool_arg in enumerate(tool_args):
+        logging.info(
+            "Linking file pair %d of %d: inputs: ('%s', '%s'), output: '%s'",
+            idx + 1,
+            len(tool_args),
+            tool_arg.host_trace_file_path.as_posix(),
+            tool_arg.device_trace_file_path.as_posix(),
+            tool_arg.linked_trace_file_path.as_posix(),
+        )
+        linker = TraceLinker(device_categories, args.exclusive_dur_workers)
+        generate_cached(
+            cache,
+            "link",
+            [tool_arg.host_trace_file_path.as_posix(), tool_arg.device_trace_file_path.as_posix()],
+            options,
+            tool_arg.linked_trace_file_path.as_posix(),
+            partial(
+                linker.link,
+                tool_arg.host_trace_file_path.as_posix(),
+                tool_arg.device_trace_file_path.as_posix(),
+                tool_arg.linked_trace_file_path.as_posix(),
+                args.compress_threads,
+            ),
+        )
+
+
+def convert_linked_traces(tool_args: list[ToolArgs], args: argparse.Namespace, cache: Optional[TraceCache]) -> None:
+    """Convert every linked trace, taking those whose linked trace is unchanged from the cache."""
+    # Same entries as chakra_converter_batch, which reads the compression options under other names.
+    options = {
+        "compression": args.compress,
+        "block_gzip": False,
+        "compress_threads": args.compress_threads,
+        "intern_strings": False,
+    }
+    for idx, tool_arg in enumerate(tool_args):
+        logging.info("Converting linked trace %d of %d: input: '%s', output: '%s'",
+                     idx + 1,
+                     len(tool_args),
+                     tool_arg.linked_trace_file_path.as_posix(),
+                     tool_arg.converted_trace_file_path.as_posix())
+        generate_cached(
+            cache,
+            "convert",
+            [tool_arg.linked_trace_file_path.as_posix()],
+            options,
+            tool_arg.converted_trace_file_path.as_posix(),
+            partial(
+                convert_pytorch,
+                tool_arg.linked_trace_file_path.as_posix(),
+                tool_arg.converted_trace_file_path.as_posix(),
+                simulate=False,
+                compress_threads=args.compress_threads,
+            ),
+        )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description=(
@@ -155,6 +225,56 @@ def main() -> None:
         help="Whether or not to convert the linked traces equivalent to using chakra_converter"
 
     )
+    parser.add_argument(
+        "--compress-threads",
+        type=int,
+        default=1,
+        env_var="COMPRESS_THREADS",
+        required=False,
+        help="Number of threads compressing each linked and converted trace when compression is enabled",
+    )
+    parser.add_argument(
+        "--device-categories",
+        type=str,
+        default=",".join(LINKED_CATEGORIES),
+        env_var="DEVICE_CATEGORIES",
+        required=False,
+        help=(
+            "Comma-separated categories of the Chakra device trace events loaded for linking, or 'all'. Events of "
+            "other categories, and CUDA runtime and driver calls other than kernel launches, are dropped while the "
+            "trace is read and only count towards process and thread time spans."
+        ),
+    )
+    parser.add_argument(
+        "--exclusive-dur-workers",
+        type=int,
+        default=0,
+        env_var="EXCLUSIVE_DUR_WORKERS",
+        required=False,
+        help=(
+            "Number of worker processes calculating the exclusive durations of the device operators from shared "
+            "memory. By default, they are calculated in the linking process with a single sweep per thread, which is "
+            "faster unless many cores are available."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="",
+        env_var="CACHE_DIR",
+        help=(
+            "Directory of a cache of linked and converted traces keyed by the contents of their inputs and the "
+            "options. Pairs whose traces and options are unchanged are taken from the cache instead of being linked "
+            "again. The cache can be shared with chakra_converter_batch"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-gb",
+        type=float,
+        default=DEFAULT_CACHE_MAX_GB,
+        env_var="CACHE_MAX_GB",
+        help="Size of the cache in GB beyond which the least recently used entries are evicted",
+    )
     parser.add_argument("--log-filename", type=str, default="", help="Debug Log filename")
 
     args = parser.parse_args()
@@ -178,27 +298,11 @@ def main() -> None:
         sys.exit(-1)
 
     Path(args.output_directory).mkdir(exist_ok=True, parents=True)
-    for idx, tool_arg in enumerate(tool_args):
-        logging.info(
-            "Linking file pair %d of %d: inputs: ('%s', '%s'), output: '%s'",
-            idx + 1,
-            len(tool_args),
-            tool_arg.host_trace_file_path.as_posix(),
-            tool_arg.device_trace_file_path.as_posix(),
-            tool_arg.linked_trace_file_path.as_posix(),
-        )
-        linker = TraceLinker()
-        linker.link(tool_arg.host_trace_file_path.as_posix(), tool_arg.device_trace_file_path.as_posix(), tool_arg.linked_trace_file_path.as_posix())
+    cache = open_trace_cache(args.cache_dir, args.cache_max_gb)
+    link_trace_pairs(tool_args, args, cache)
 
     if args.convert:
-        for idx, tool_arg in enumerate(tool_args):
-            logging.info("Converting linked trace %d of %d: input: '%s', output: '%s'",
-                         idx + 1,
-                         len(tool_args),
-                         tool_arg.linked_trace_file_path.as_posix(),
-                         tool_arg.converted_trace_file_path.as_posix())
-            converter = PyTorchConverter()
-            converter.convert(tool_arg.linked_trace_file_path.as_posix(), tool_arg.converted_trace_file_path.as_posix(), simulate=False)
+        convert_linked_traces(tool_args, args, cache)
         logging.info("Linking and conversion process successful. Output files are available at '%s'", args.output_directory)
     else:
         logging.info("Linking process successful. Output files are available at %s.", args.output_directory)
@@ -1,9 +1,9 @@
-import gzip
+import itertools
 import logging
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
-import orjson
+import numpy as np
 from tqdm.contrib.concurrent import process_map
 
 try:
@@ -13,20 +13,39 @@ try:
 except ImportError:
     HAS_RUST_EXTENSION = False
 
+from .kineto_event_filter import LINKED_CATEGORIES, KinetoEventFilter
 from .kineto_operator import KinetoOperator
-
-
-def read_dictionary_from_json_file(et_file_path: str) -> Dict[str, Any]:
-    """Load Execution Trace from json file."""
-    with gzip.open(et_file_path, "rb") if et_file_path.endswith("gz") else open(et_file_path, "r") as f:
-        return orjson.loads(f.read())
+from .kineto_trace_stream import iter_trace_events
+from .shared_op_arrays import exclusive_durs_for_range, share_array
+from .sorted_views import SortedViews
+from .stage_timer import StageTimer
 
 
 class ChakraDeviceTraceLoader:
-    """Loads Chakra device traces."""
-
-    def __init__(self):
+    """
+    Loads Chakra device traces.
+
+    Attributes
+        categories (Optional[Tuple[str, ...]]): Categories of the events loaded as operators, or None to load all.
+        sorted_kineto_ops (Dict[int, List[KinetoOperator]]): CPU operators by thread, sorted for exclusive durations.
+        sorted_views (Optional[SortedViews]): Sorted orders of the CPU operators of the last loaded trace.
+        stage_timer (StageTimer): Timer the loading stages are recorded in.
+        exclusive_dur_workers (int): Number of worker processes calculating exclusive durations with
+            calculate_exclusive_dur, or 0 to use the Rust extension if installed and the single-process sweep
+            otherwise.
+    """
+
+    def __init__(
+        self,
+        categories: Optional[Iterable[str]] = LINKED_CATEGORIES,
+        stage_timer: Optional[StageTimer] = None,
+        exclusive_dur_workers: int = 0,
+    ) -> None:
+        self.categories = tuple(categories) if categories is not None else None
         self.sorted_kineto_ops: Dict[int, List[KinetoOperator]] = {}
+        self.sorted_views: Optional[SortedViews] = None
+        self.stage_timer = stage_timer if stage_timer is not None else StageTimer()
+        self.exclusive_dur_workers = exclusive_dur_workers
 
     def load(
         self, chakra_device_trace: str
@@ -54,21 +73,34 @@ class ChakraDeviceTraceLoader:
             Tuple containing various data structures needed for linking traces.
         """
         logging.info(f"Starting to load Chakra device trace from file: {chakra_device_trace}.")
-        chakra_trace_data = read_dictionary_from_json_file(chakra_device_trace)
-        sorted_kineto_ops = sorted(
-            [KinetoOperator(op) for op in chakra_trace_data["traceEvents"]],
-            key=lambda op: op.timestamp,
-        )
-
-        dev_data = self.construct_dev_data_structures(sorted_kineto_ops, chakra_device_trace)
-
-        if HAS_RUST_EXTENSION:
-            self.calculate_exclusive_dur_rs(dev_data["kineto_tid_cpu_ops_map"])
-        else:
-            self.calculate_exclusive_dur(dev_data["kineto_tid_cpu_ops_map"])
+        # Events are converted as they are parsed, so the raw trace is never held in memory as a whole, and events of
+        # unused categories are dropped before any operator is built or sorted for them.
+        event_filter = KinetoEventFilter(self.categories)
+        with self.stage_timer.stage("read device trace"):
+            sorted_kineto_ops = sorted(
+                map(KinetoOperator, event_filter.filter(iter_trace_events(chakra_device_trace))),
+                key=lambda op: op.timestamp,
+            )
+        event_filter.log_dropped_counts(chakra_device_trace)
+
+        with self.stage_timer.stage("categorize device operators"):
+            dev_data = self.construct_dev_data_structures(sorted_kineto_ops, chakra_device_trace, event_filter)
+            # The operators were collected from the sorted events, so they are already in timestamp order. Every later
+            # stage takes its sorted orders from these views rather than sorting the operators again.
+            self.sorted_views = SortedViews(dev_data["kineto_cpu_ops"], dev_data["kineto_tid_cpu_ops_map"])
+
+        with self.stage_timer.stage("exclusive durations"):
+            if self.exclusive_dur_workers > 0:
+                self.calculate_exclusive_dur(
+                    dev_data["kineto_tid_cpu_ops_map"], self.sorted_views, self.exclusive_dur_workers
+                )
+            elif HAS_RUST_EXTENSION:
+                self.calculate_exclusive_dur_rs(dev_data["kineto_tid_cpu_ops_map"], self.sorted_views)
+            else:
+                self.calculate_exclusive_dur_sweep(dev_data["kineto_tid_cpu_ops_map"], self.sorted_views)
 
-        dev_data["sorted_kineto_cpu_ops"] = sorted(dev_data["kineto_cpu_ops"], key=lambda op: op.timestamp)
-        dev_data["sorted_kineto_cpu_op_ts"] = [op.timestamp for op in dev_data["sorted_kineto_cpu_ops"]]
+        dev_data["sorted_kineto_cpu_ops"] = self.sorted_views.cpu_ops
+        dev_data["sorted_kineto_cpu_op_ts"] = self.sorted_views.cpu_op_ts
 
         logging.debug(
             f"Processed Chakra device trace with {len(dev_data['kineto_cpu_ops'])} CPU ops, "
@@ -91,7 +123,9 @@ class ChakraDeviceTraceLoader:
             dev_data["sorted_kineto_cpu_op_ts"],
         )
 
-    def construct_dev_data_structures(self, kineto_ops: List[KinetoOperator], trace_file: str) -> Dict:
+    def construct_dev_data_structures(
+        self, kineto_ops: List[KinetoOperator], trace_file: str, event_filter: Optional[KinetoEventFilter] = None
+    ) -> Dict:
         """
         Construct necessary data structures required for trace linking from the provided Kineto operators.
 
@@ -101,6 +135,8 @@ class ChakraDeviceTraceLoader:
         Args:
             kineto_ops (List[KinetoOperator]): List of Kineto operators to categorize.
             trace_file (str): Path to the trace file for logging purposes.
+            event_filter (Optional[KinetoEventFilter]): Filter the operators were loaded through. Its timing
+                boundaries, which also cover the dropped events, are used instead of those of the operators.
 
         Returns:
             Dict: Dictionary containing categorized operators and timing boundaries.
@@ -109,6 +145,11 @@ class ChakraDeviceTraceLoader:
         process_start_time = sys.maxsize
         process_end_time = 0
         thread_info = {}
+        track_time = event_filter is None
+        if event_filter is not None:
+            process_start_time = event_filter.process_start_time
+            process_end_time = event_filter.process_end_time
+            thread_info = event_filter.thread_info
 
         kineto_cpu_ops = []
         kineto_tid_cpu_ops_map = {}
@@ -158,7 +199,7 @@ class ChakraDeviceTraceLoader:
                 kineto_id_arrow_op_map[op.id] = op
 
             # Update timing boundaries
-            if op.tid is not None:
+            if track_time and op.tid is not None:
                 process_start_time = min(process_start_time, op.timestamp)
                 process_end_time = max(process_end_time, op.timestamp + op.inclusive_dur)
                 thread_start_end = thread_info.setdefault(op.tid, [sys.maxsize, 0])
@@ -212,7 +253,67 @@ class ChakraDeviceTraceLoader:
         merged_regions = self.merge_overlapping_intervals(overlapping_regions)
         for start, end in merged_regions:
             exclusive_dur -= end - start
-        # Check if exclusive_dur is not negative or zero
+        return self.validate_exclusive_dur(op, exclusive_dur)
+
+    def get_exclusive_durs_for_thread(self, tid: int) -> List[float]:
+        """
+        Calculate the exclusive duration of every operator of a thread in a single sweep.
+
+        This gives the same results as calling get_exclusive_dur_for_op on every operator of
+        self.sorted_kineto_ops[tid], without scanning forward from each of them. The operators are visited in their
+        sorted order while a stack keeps those that may still contain the current one, innermost on top. Each
+        operator is added to the merged child regions of the operator below it when pushed.
+
+        Operators sharing a start time are sorted by duration, so a parent comes after its children starting with it.
+        Those children only count the operators following the parent, so the parent is inserted below them on the
+        stack and receives their merged regions, instead of their whole intervals, when they are popped. Operators
+        that partially overlap the current one are not properly nested; they are popped and fall back to
+        get_exclusive_dur_for_op, which only scans their own span.
+
+        Args:
+            tid (int): Thread ID, a key of self.sorted_kineto_ops.
+
+        Returns:
+            List[float]: Exclusive durations, in the order of self.sorted_kineto_ops[tid].
+        """
+        ops = self.sorted_kineto_ops[tid]
+        exclusive_durs: List[float] = [0] * len(ops)
+        unnested = []
+        # Entries: [index, start, end, merged child regions, hands its regions to the entry below, needs a scan]
+        stack: List[list] = []
+
+        for i, op in enumerate(ops):
+            start = op.timestamp
+            end = op.timestamp + op.inclusive_dur
+            same_start = []
+            while stack and stack[-1][2] < end:
+                entry = stack.pop()
+                if entry[2] > start and entry[1] == start:
+                    same_start.append(entry)
+                    continue
+                self._pop_exclusive_dur_entry(ops, stack, entry, entry[2] <= start, exclusive_durs, unnested)
+            if stack:
+                self._add_region(stack[-1][3], start, end)
+            # Regions collected before this operator must not reach it; leave such rare cases to the scan.
+            stack.append([i, start, end, [], False, any(entry[3] or entry[5] for entry in same_start)])
+            if same_start:
+                same_start[-1][4] = True
+                stack.extend(reversed(same_start))
+
+        while stack:
+            self._pop_exclusive_dur_entry(ops, stack, stack.pop(), True, exclusive_durs, unnested)
+        for i in unnested:
+            exclusive_durs[i] = self.get_exclusive_dur_for_op((tid, i))
+        return exclusive_durs
+
+    @staticmethod
+    def validate_exclusive_dur(op: KinetoOperator, exclusive_dur: float) -> float:
+        """
+        Check that the exclusive duration calculated for an operator is not negative.
+
+        Raises
+            ValueError: If the exclusive duration is negative.
+        """
         if exclusive_dur < 0:
             error_msg = (
                 f"Exclusive duration calculation error for node '{op.name}' "
@@ -223,7 +324,86 @@ class ChakraDeviceTraceLoader:
             raise ValueError(error_msg)
         return exclusive_dur
 
-    def calculate_exclusive_dur_rs(self, kineto_tid_cpu_ops_map: Dict[int, List[KinetoOperator]]) -> None:
+    @staticmethod
+    def _add_region(regions: List[List[float]], start: float, end: float) -> None:
+        """Add an interval to merged regions sorted by start time, like merge_overlapping_intervals."""
+        if regions and start <= regions[-1][1]:
+            if end > regions[-1][1]:
+                regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    def _pop_exclusive_dur_entry(
+        self,
+        ops: List[KinetoOperator],
+        stack: List[list],
+        entry: list,
+        nested: bool,
+        exclusive_durs: List[float],
+        unnested: List[int],
+    ) -> None:
+        """Record the exclusive duration of an entry popped by get_exclusive_durs_for_thread, or defer it to a scan."""
+        if nested and not entry[5]:
+            exclusive_durs[entry[0]] = self._finish_exclusive_dur(ops[entry[0]], entry[3])
+        else:
+            unnested.append(entry[0])
+        if entry[4]:
+            for start, end in entry[3]:
+                self._add_region(stack[-1][3], start, end)
+
+    def _finish_exclusive_dur(self, op: KinetoOperator, regions: List[List[float]]) -> float:
+        """Subtract the merged child regions of an operator from its inclusive duration."""
+        exclusive_dur = op.inclusive_dur
+        for start, end in regions:
+            exclusive_dur -= end - start
+        return self.validate_exclusive_dur(op, exclusive_dur)
+
+    @staticmethod
+    def sort_ops_by_start_and_dur(
+        tid: int, ops: List[KinetoOperator], sorted_views: Optional[SortedViews] = None
+    ) -> List[KinetoOperator]:
+        """
+        Sort the operators of a thread by timestamp, then by inclusive duration, for exclusive durations.
+
+        Args:
+            tid (int): Thread ID of the operators.
+            ops (List[KinetoOperator]): Operators of the thread.
+            sorted_views (Optional[SortedViews]): Views holding the same operators, whose cached order is returned.
+                The operators are sorted if not provided.
+
+        Returns:
+            List[KinetoOperator]: The sorted operators.
+        """
+        if sorted_views is not None:
+            return sorted_views.ops_by_start_and_dur(tid)
+        return sorted(ops, key=lambda op: (op.timestamp, op.inclusive_dur))
+
+    def calculate_exclusive_dur_sweep(
+        self, kineto_tid_cpu_ops_map: Dict[int, List[KinetoOperator]], sorted_views: Optional[SortedViews] = None
+    ) -> None:
+        """
+        Calculate the exclusive duration of each operator in the Kineto traces with a stack-based sweep.
+
+        This is the pure-Python default. It runs in O(n log n) per thread, dominated by sorting, and gives the same
+        results as calculate_exclusive_dur.
+
+        Args:
+            kineto_tid_cpu_ops_map (Dict[int, List[KinetoOperator]]): Map of thread IDs to their corresponding Kineto
+                operators.
+            sorted_views (Optional[SortedViews]): Views of the same operators, whose orders are reused instead of
+                sorting each thread again.
+        """
+        logging.info("Calculating exclusive durations for Kineto operators.")
+        for tid, ops in kineto_tid_cpu_ops_map.items():
+            self.sorted_kineto_ops[tid] = self.sort_ops_by_start_and_dur(tid, ops, sorted_views)
+            logging.info(f"Processing {len(ops)} operators in thread {tid}.")
+            exclusive_durs = self.get_exclusive_durs_for_thread(tid)
+            for kineto_op, excl_dur in zip(self.sorted_kineto_ops[tid], exclusive_durs):
+                kineto_op.exclusive_dur = excl_dur
+
+    def calculate_exclusive_dur_rs(
+        self, kineto_tid_cpu_ops_map: Dict[int, List[KinetoOperator]], sorted_views: Optional[SortedViews] = None
+    ) -> None:
         """
         Calculate the exclusive duration of each operator in the Kineto traces in parallel using the rust extension.
 
@@ -233,10 +413,12 @@ class ChakraDeviceTraceLoader:
         Args:
             kineto_tid_cpu_ops_map (Dict[int, List[KinetoOperator]]): Map of thread IDs to their corresponding Kineto
                 operators.
+            sorted_views (Optional[SortedViews]): Views of the same operators, whose orders are reused instead of
+                sorting each thread again.
         """
         calculator = DurationCalculator()
         for tid, ops in kineto_tid_cpu_ops_map.items():
-            self.sorted_kineto_ops[tid] = sorted(ops, key=lambda op: (op.timestamp, op.inclusive_dur))
+            self.sorted_kineto_ops[tid] = self.sort_ops_by_start_and_dur(tid, ops, sorted_views)
             logging.info(f"Processing {len(ops)} operators in thread {tid} with rust extension.")
             kineto_rs_operators = []
             for op in self.sorted_kineto_ops[tid]:
@@ -254,30 +436,52 @@ class ChakraDeviceTraceLoader:
             for kineto_op, excl_dur in zip(self.sorted_kineto_ops[tid], exclusive_durs):
                 kineto_op.exclusive_dur = excl_dur
 
-    def calculate_exclusive_dur(self, kineto_tid_cpu_ops_map: Dict[int, List[KinetoOperator]]) -> None:
+    def calculate_exclusive_dur(
+        self,
+        kineto_tid_cpu_ops_map: Dict[int, List[KinetoOperator]],
+        sorted_views: Optional[SortedViews] = None,
+        workers: Optional[int] = None,
+    ) -> None:
         """
         Calculate the exclusive duration of each operator in the Kineto traces in parallel.
 
         The exclusive duration is defined as the total duration of the operator minus any time spent in child operators,
         effectively representing the time spent exclusively in that operator.
 
+        The timestamps and durations of each thread are placed in shared memory, so workers receive only ranges of
+        operator indices instead of a pickled copy of the loader and its operators. Each operator scans the operators
+        that start within it, so this only pays off over calculate_exclusive_dur_sweep on many cores. load uses it
+        when exclusive_dur_workers is set.
+
         Args:
             kineto_tid_cpu_ops_map (Dict[int, List[KinetoOperator]]): Map of thread IDs to their corresponding Kineto
                 operators.
+            sorted_views (Optional[SortedViews]): Views of the same operators, whose orders are reused instead of
+                sorting each thread again.
+            workers (Optional[int]): Number of worker processes. Defaults to the default of process_map.
         """
         logging.info("Calculating exclusive durations for Kineto operators in parallel.")
 
         for tid, ops in kineto_tid_cpu_ops_map.items():
-            self.sorted_kineto_ops[tid] = sorted(ops, key=lambda op: (op.timestamp, op.inclusive_dur))
+            self.sorted_kineto_ops[tid] = sorted_ops = self.sort_ops_by_start_and_dur(tid, ops, sorted_views)
             logging.info(f"Processing {len(ops)} operators in thread {tid}.")
-            exclusive_durs = process_map(
-                self.get_exclusive_dur_for_op,
-                ((tid, i) for i in range(len(self.sorted_kineto_ops[tid]))),
-                chunksize=max(1, len(self.sorted_kineto_ops[tid]) // 1000),
-                total=len(self.sorted_kineto_ops[tid]),
-            )
-            for kineto_op, excl_dur in zip(self.sorted_kineto_ops[tid], exclusive_durs):
-                kineto_op.exclusive_dur = excl_dur
+            if not sorted_ops:
+                continue
+            timestamps_shm, timestamps_spec = share_array(np.array([op.timestamp for op in sorted_ops]))
+            durations_shm, durations_spec = share_array(np.array([op.inclusive_dur for op in sorted_ops]))
+            try:
+                range_size = max(1, len(sorted_ops) // 1000)
+                tasks = [
+                    (timestamps_spec, durations_spec, begin, min(begin + range_size, len(sorted_ops)))
+                    for begin in range(0, len(sorted_ops), range_size)
+                ]
+                exclusive_durs = process_map(exclusive_durs_for_range, tasks, max_workers=workers, total=len(tasks))
+            finally:
+                for shm in (timestamps_shm, durations_shm):
+                    shm.close()
+                    shm.unlink()
+            for kineto_op, excl_dur in zip(sorted_ops, itertools.chain.from_iterable(exclusive_durs)):
+                kineto_op.exclusive_dur = self.validate_exclusive_dur(kineto_op, excl_dur)
 
     @staticmethod
     def merge_overlapping_intervals(intervals: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
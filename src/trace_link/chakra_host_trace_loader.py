@@ -1,50 +1,77 @@
 import gzip
 import logging
-import sys
-from typing import List
+from typing import Any, Dict, List
 
 import orjson
-from et_replay.execution_trace import ExecutionTrace
-from et_replay.execution_trace import Node as PyTorchOperator
 
-# Increase the recursion limit for deep Chakra host execution traces.
-sys.setrecursionlimit(10**6)
+try:
+    from et_replay.execution_trace import ExecutionTrace
+    from et_replay.execution_trace import Node as PyTorchOperator
 
+    HAS_ET_REPLAY = True
+except ImportError:
+    HAS_ET_REPLAY = False
 
-def load_execution_trace_file(et_file_path: str) -> ExecutionTrace:
-    """Load Execution Trace from json file and parses it."""
-    with gzip.open(et_file_path, "rb") if et_file_path.endswith("gz") else open(et_file_path, "r") as f:
-        return ExecutionTrace(orjson.loads(f.read()))
+from .host_op_table import HostOpTable
+
+
+def read_execution_trace_data(et_file_path: str) -> Dict[str, Any]:
+    """Read the raw dictionary of an Execution Trace json file, optionally gzip-compressed."""
+    with gzip.open(et_file_path, "rb") if et_file_path.endswith("gz") else open(et_file_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def load_execution_trace_file(et_file_path: str) -> "ExecutionTrace":
+    """Load Execution Trace from json file and parses it. This requires et_replay."""
+    if not HAS_ET_REPLAY:
+        raise ImportError("et_replay is required to load an ExecutionTrace object. Please install PARAM.")
+    return ExecutionTrace(read_execution_trace_data(et_file_path))
+
+
+class ChakraHostTrace:
+    """
+    A Chakra host execution trace parsed once, in both the forms the trace linker needs.
+
+    Attributes
+        data (Dict[str, Any]): Raw dictionary of the trace, whose node dicts are extended into the output trace.
+        ops (HostOpTable): Operators of the trace sorted by ID, which are linked with the device trace.
+    """
+
+    def __init__(self, data: Dict[str, Any], ops: HostOpTable) -> None:
+        self.data = data
+        self.ops = ops
 
 
 class ChakraHostTraceLoader:
     """Loads Chakra host traces."""
 
-    def load(self, chakra_host_trace_file: str) -> List[PyTorchOperator]:
+    def load(self, chakra_host_trace_file: str) -> ChakraHostTrace:
         """
         Load and process the Chakra Host Execution Trace.
 
+        The file is read and parsed a single time. Only the fields of the operators used for linking are extracted from
+        the parsed dictionary, into compact columns rather than an et_replay ExecutionTrace, and the dictionary is kept
+        so that the output trace can be constructed without reading the file again.
+
         Args:
             chakra_host_trace_file (str): Path to the PyTorch execution trace file.
 
         Returns:
-            List[PyTorchOperator]: List of PyTorch operators.
+            ChakraHostTrace: The raw trace data and its operators.
         """
         logging.info(f"Starting to load Chakra host execution trace from file: {chakra_host_trace_file}.")
-        chakra_host_trace = load_execution_trace_file(chakra_host_trace_file)
-
-        root_node = chakra_host_trace.get_nodes()[1]  # Root node is usually 1-based
-        chakra_host_ops = self.extract_chakra_host_ops(root_node)
+        chakra_host_trace_data = read_execution_trace_data(chakra_host_trace_file)
+        chakra_host_ops = HostOpTable.from_nodes(chakra_host_trace_data["nodes"])
         logging.debug(f"Extracted {len(chakra_host_ops)} operators from Chakra host execution trace.")
 
-        return chakra_host_ops
+        return ChakraHostTrace(chakra_host_trace_data, chakra_host_ops)
 
-    def extract_chakra_host_ops(self, node: PyTorchOperator) -> List[PyTorchOperator]:
+    def extract_chakra_host_ops(self, node: "PyTorchOperator") -> List["PyTorchOperator"]:
         """
-        Extract and sort nodes from the PyTorch execution trace recursively.
+        Extract and sort nodes from an et_replay PyTorch execution trace.
 
-        This method traverses the execution trace starting from the provided node, extracting all the operator nodes
-        recursively, and then returns them sorted by their identifiers.
+        This method traverses the execution trace starting from the provided node with an explicit stack, extracting
+        all the operator nodes, and then returns them sorted by their identifiers.
 
         Args:
             node (PyTorchOperator): Starting node for extraction.
@@ -53,12 +80,10 @@ class ChakraHostTraceLoader:
             List[PyTorchOperator]: Sorted list of extracted PyTorchOperator nodes.
         """
         nodes = []
-
-        def traverse(node: PyTorchOperator):
-            nodes.append(node)
-            for child in node.children:
-                traverse(child)
-
-        traverse(node)
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            nodes.append(current)
+            stack.extend(current.children)
         logging.debug(f"Traversed {len(nodes)} nodes from root node ID: {node.id}")
         return sorted(nodes, key=lambda x: x.id)
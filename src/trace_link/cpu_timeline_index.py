@@ -0,0 +1,77 @@
+import bisect
+from typing import Dict, List, Optional
+
+from .kineto_operator import KinetoOperator
+
+# Categories of the operators that other threads can depend on.
+TIMELINE_CATEGORIES = ("cpu_op", "user_annotation")
+
+
+class CpuTimelineIndex:
+    """
+    Index answering "last CPU operator before a timestamp in any thread but one" queries with a single bisect.
+
+    The CPU operators (cpu_op and user_annotation) of all threads are merged into one timeline sorted by timestamp.
+    For every prefix of the timeline, the index keeps the latest operator and the latest operator of a thread other
+    than that one's. A query excluding a thread therefore looks up the prefix of operators starting before the
+    timestamp and returns the first of these two operators that does not belong to the excluded thread.
+
+    Ties are broken like a scan of the threads in ops_by_tid order, each sorted by timestamp: among operators sharing
+    the latest timestamp, the one of the first thread wins, and within a thread, the one listed first. Operators with
+    a non-positive timestamp are never returned.
+
+    Attributes
+        timestamps (List[int]): Timestamps of the merged timeline, in ascending order.
+    """
+
+    def __init__(self, ops_by_tid: Dict[int, List[KinetoOperator]]) -> None:
+        """
+        Build the index.
+
+        Args:
+            ops_by_tid (Dict[int, List[KinetoOperator]]): Operators grouped by thread ID.
+        """
+        timeline = [
+            (op.timestamp, rank, pos, tid, op)
+            for rank, (tid, ops) in enumerate(ops_by_tid.items())
+            for pos, op in enumerate(ops)
+            if op.category in TIMELINE_CATEGORIES and op.timestamp > 0
+        ]
+        timeline.sort(key=lambda entry: entry[:3])
+
+        self.timestamps: List[int] = [entry[0] for entry in timeline]
+        self._latest: List[KinetoOperator] = []
+        self._latest_tids: List[int] = []
+        self._runner_up: List[Optional[KinetoOperator]] = []
+
+        latest: Optional[KinetoOperator] = None
+        latest_tid = 0
+        runner_up: Optional[KinetoOperator] = None
+        for timestamp, _, _, tid, op in timeline:
+            if latest is None or timestamp > latest.timestamp:
+                if latest is not None and latest_tid != tid:
+                    runner_up = latest
+                latest, latest_tid = op, tid
+            elif tid != latest_tid and (runner_up is None or timestamp > runner_up.timestamp):
+                runner_up = op
+            self._latest.append(latest)
+            self._latest_tids.append(latest_tid)
+            self._runner_up.append(runner_up)
+
+    def find_last_before(self, exclude_tid: int, timestamp: int) -> Optional[KinetoOperator]:
+        """
+        Return the last CPU operator starting before a timestamp in threads other than the excluded one.
+
+        Args:
+            exclude_tid (int): Thread ID to exclude from the search.
+            timestamp (int): Timestamp to compare against.
+
+        Returns:
+            Optional[KinetoOperator]: The operator, or None if no other thread has a CPU operator before timestamp.
+        """
+        pos = bisect.bisect_left(self.timestamps, timestamp) - 1
+        if pos < 0:
+            return None
+        if self._latest_tids[pos] != exclude_tid:
+            return self._latest[pos]
+        return self._runner_up[pos]
@@ -0,0 +1,134 @@
+import logging
+from array import array
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+# Names of the annotations PyTorch records for the process and its threads in execution traces.
+EXECUTION_TRACE_PROCESS_ANNOTATION = "[pytorch|profiler|execution_trace|process]"
+EXECUTION_TRACE_THREAD_ANNOTATION = "[pytorch|profiler|execution_trace|thread]"
+
+ROOT_NODE_ID = 1
+
+# Stored in place of a missing rf_id or parent, which are never negative in a trace.
+_MISSING = -1
+
+
+class HostOp(NamedTuple):
+    """
+    A Chakra host operator with the fields used for linking it with the device trace.
+
+    Attributes
+        id (int): Identifier of the operator.
+        rf_id (Optional[int]): Record function identifier, shared with the Kineto operator it ran as.
+        name (str): Name of the operator.
+        parent (Optional[int]): Identifier of the parent operator, or None for the root.
+    """
+
+    id: int
+    rf_id: Optional[int]
+    name: str
+    parent: Optional[int]
+
+
+def _parent_id(node: Dict[str, Any]) -> Optional[int]:
+    """Return the parent of a node, stored as ctrl_deps by Chakra schemas and as parent by older PyTorch ones."""
+    parent = node.get("ctrl_deps", node.get("parent"))
+    return parent if isinstance(parent, int) else None
+
+
+def _rf_id(node: Dict[str, Any]) -> Optional[int]:
+    """Return the rf_id of a node, stored as an attribute by Chakra schemas and as a field by older PyTorch ones."""
+    for attr in node.get("attrs", ()):
+        if attr.get("name") == "rf_id":
+            return int(attr["value"])
+    rf_id = node.get("rf_id")
+    return int(rf_id) if rf_id is not None else None
+
+
+class HostOpTable:
+    """
+    Operators of a Chakra host execution trace stored as compact columns.
+
+    Only the operators reachable from the root node are kept, as in the operator tree of et_replay, but no operator
+    object is built for them: their fields are held in typed arrays, and a HostOp is created only when an operator is
+    accessed.
+
+    Attributes
+        ids (array): Operator IDs, in increasing order.
+        rf_ids (array): Record function IDs, or -1 if missing.
+        names (List[str]): Operator names.
+        parents (array): Parent operator IDs, or -1 for the root.
+    """
+
+    def __init__(self, ids: array, rf_ids: array, names: List[str], parents: array) -> None:
+        self.ids = ids
+        self.rf_ids = rf_ids
+        self.names = names
+        self.parents = parents
+
+    @classmethod
+    def from_nodes(cls, nodes: List[Dict[str, Any]]) -> "HostOpTable":
+        """
+        Build the table from the raw nodes of an execution trace.
+
+        The operator tree is traversed from the root with an explicit stack, so deep traces need neither recursion
+        nor a raised recursion limit.
+
+        Args:
+            nodes (List[Dict[str, Any]]): Nodes of the trace, as parsed from its json file.
+
+        Returns:
+            HostOpTable: The operators reachable from the root node, sorted by ID.
+
+        Raises:
+            ValueError: If the trace has no root node.
+        """
+        # A later node with the same ID replaces an earlier one, like in et_replay.
+        index_by_id = {node["id"]: i for i, node in enumerate(nodes)}
+        if ROOT_NODE_ID not in index_by_id:
+            error_msg = f"Root node with ID {ROOT_NODE_ID} not found in the Chakra host execution trace."
+            logging.error(error_msg)
+            raise ValueError(error_msg)
+
+        children: Dict[int, List[int]] = {}
+        for node_id, i in index_by_id.items():
+            parent = _parent_id(nodes[i])
+            if node_id != ROOT_NODE_ID and parent in index_by_id:
+                children.setdefault(parent, []).append(i)
+
+        reachable = []
+        stack = [index_by_id[ROOT_NODE_ID]]
+        while stack:
+            i = stack.pop()
+            reachable.append(i)
+            stack.extend(children.get(nodes[i]["id"], ()))
+        reachable_nodes = sorted(map(nodes.__getitem__, reachable), key=lambda node: node["id"])
+
+        rf_ids = map(_rf_id, reachable_nodes)
+        # Every reachable operator but the root has its parent in the tree.
+        parents = (None if node["id"] == ROOT_NODE_ID else _parent_id(node) for node in reachable_nodes)
+        return cls(
+            array("q", (node["id"] for node in reachable_nodes)),
+            array("q", (_MISSING if rf_id is None else rf_id for rf_id in rf_ids)),
+            [node["name"] for node in reachable_nodes],
+            array("q", (_MISSING if parent is None else parent for parent in parents)),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of operators."""
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> HostOp:
+        """Return the operator at a position of the table."""
+        rf_id = self.rf_ids[index]
+        parent = self.parents[index]
+        return HostOp(
+            self.ids[index],
+            None if rf_id == _MISSING else rf_id,
+            self.names[index],
+            None if parent == _MISSING else parent,
+        )
+
+    def __iter__(self) -> Iterator[HostOp]:
+        """Iterate over the operators in ID order."""
+        for index in range(len(self.ids)):
+            yield self[index]
@@ -0,0 +1,113 @@
+from operator import attrgetter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .cpu_timeline_index import TIMELINE_CATEGORIES
+from .kineto_operator import KinetoOperator
+
+
+def _first_of_runs(values: np.ndarray) -> np.ndarray:
+    """Return, for every position, the start of the run of equal consecutive values containing it."""
+    if not len(values):
+        return np.zeros(0, dtype=np.int64)
+    starts = np.ones(len(values), dtype=bool)
+    starts[1:] = values[1:] != values[:-1]
+    return np.maximum.accumulate(np.where(starts, np.arange(len(values)), 0))
+
+
+def compute_inter_thread_deps(
+    ops_by_tid: Dict[int, List[KinetoOperator]], threshold: int = 1000, presorted: bool = False
+) -> Tuple[List[KinetoOperator], np.ndarray]:
+    """
+    Compute the inter-thread dependency of every operator with array operations.
+
+    This is a vectorized equivalent of running TraceLinker.process_thread_inter_thread_order on every thread. The
+    operators of each thread, sorted by timestamp, are split into groups wherever the idle time between the end of an
+    operator and the start of the next exceeds threshold. Every group depends on the last CPU operator (cpu_op or
+    user_annotation, with a positive timestamp) that starts before the group in any other thread, with ties broken like
+    CpuTimelineIndex. All groups are resolved at once with searchsorted over a merged timeline of the CPU operators.
+
+    Args:
+        ops_by_tid (Dict[int, List[KinetoOperator]]): Kineto CPU operators grouped by thread ID.
+        threshold (int): Threshold for significant gap detection in microseconds, used to define group boundaries.
+        presorted (bool): Whether the operators of every thread are already sorted by timestamp, as in
+            SortedViews.cpu_ops_by_tid, so that they are grouped without sorting them again.
+
+    Returns:
+        Tuple[List[KinetoOperator], np.ndarray]: The operators of all threads, and the rf_id of the operator each of
+            them depends on, or 0 if it has no dependency.
+    """
+    ops = [op for thread_ops in ops_by_tid.values() for op in thread_ops]
+    num_ops = len(ops)
+    if not num_ops:
+        return ops, np.zeros(0, dtype=np.int64)
+    ranks = np.repeat(np.arange(len(ops_by_tid)), [len(thread_ops) for thread_ops in ops_by_tid.values()])
+    # np.array keeps integer timestamps exact and promotes to float64 exactly like Python arithmetic would.
+    timestamps = np.array(list(map(attrgetter("timestamp"), ops)))
+    durations = np.array(list(map(attrgetter("inclusive_dur"), ops)))
+    rf_ids = np.array([rf_id or 0 for rf_id in map(attrgetter("rf_id"), ops)], dtype=np.int64)
+    is_cpu = np.array([category in TIMELINE_CATEGORIES for category in map(attrgetter("category"), ops)], dtype=bool)
+    positions = np.arange(num_ops)
+
+    # Groups: operators of each thread in timestamp order, split at the first operator and at every large gap.
+    order = positions if presorted else np.lexsort((positions, timestamps, ranks))
+    sorted_ranks = ranks[order]
+    sorted_ts = timestamps[order]
+    sorted_durs = durations[order]
+    group_start = np.ones(num_ops, dtype=bool)
+    group_start[1:] = (sorted_ranks[1:] != sorted_ranks[:-1]) | (
+        sorted_ts[1:] - sorted_ts[:-1] - sorted_durs[:-1] > threshold
+    )
+    starts = np.flatnonzero(group_start)
+    query_ts = sorted_ts[starts]
+    query_ranks = sorted_ranks[starts]
+
+    # Merged timeline of the CPU operators of all threads, ordered by timestamp, thread, and position.
+    candidates = np.flatnonzero(is_cpu & (timestamps > 0))
+    candidates = candidates[np.lexsort((candidates, ranks[candidates], timestamps[candidates]))]
+    timeline_ts = timestamps[candidates]
+    timeline_ranks = ranks[candidates]
+    timeline_rf_ids = rf_ids[candidates]
+    group_deps = np.zeros(len(starts), dtype=np.int64)
+    if len(candidates):
+        # Last timeline entry before each group, stepping back over a block of entries of the group's own thread.
+        last = np.searchsorted(timeline_ts, query_ts, side="left") - 1
+        found = last >= 0
+        last_clipped = np.maximum(last, 0)
+        own_thread = timeline_ranks[last_clipped] == query_ranks
+        last = np.where(own_thread, _first_of_runs(timeline_ranks)[last_clipped] - 1, last)
+        found &= last >= 0
+        last_clipped = np.maximum(last, 0)
+
+        # Among the entries sharing that timestamp, the first one outside the group's thread wins. Entries of a
+        # timestamp are ordered by thread, so those of the group's thread, if any, form a block at the start.
+        run_start = np.searchsorted(timeline_ts, timeline_ts[last_clipped], side="left")
+        segment_ids = np.cumsum(_first_of_runs(timeline_ranks) == np.arange(len(candidates)))
+        segment_ids += np.cumsum(_first_of_runs(timeline_ts) == np.arange(len(candidates)))
+        segment_ends = np.searchsorted(segment_ids, segment_ids, side="right")
+        winner = np.where(timeline_ranks[run_start] == query_ranks, segment_ends[run_start], run_start)
+        group_deps = np.where(found, timeline_rf_ids[np.minimum(winner, len(candidates) - 1)], 0)
+
+    deps = np.empty(num_ops, dtype=np.int64)
+    deps[order] = group_deps[np.cumsum(group_start) - 1]
+    return ops, deps
+
+
+def enforce_inter_thread_order(
+    ops_by_tid: Dict[int, List[KinetoOperator]], threshold: int = 1000, presorted: bool = False
+) -> None:
+    """
+    Set the inter_thread_dep of every operator that depends on an operator of another thread.
+
+    Operators without a dependency, including those whose dependency has no rf_id, are left untouched.
+
+    Args:
+        ops_by_tid (Dict[int, List[KinetoOperator]]): Kineto CPU operators grouped by thread ID.
+        threshold (int): Threshold for significant gap detection in microseconds, used to define group boundaries.
+        presorted (bool): Whether the operators of every thread are already sorted by timestamp.
+    """
+    ops, deps = compute_inter_thread_deps(ops_by_tid, threshold, presorted)
+    with_deps = np.flatnonzero(deps)
+    for pos, dep in zip(with_deps.tolist(), deps[with_deps].tolist()):
+        ops[pos].inter_thread_dep = dep
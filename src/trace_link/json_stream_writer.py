@@ -0,0 +1,48 @@
+from typing import IO, Any, Dict, List
+
+import orjson
+
+# Serialized bytes gathered before every write to the output file.
+DEFAULT_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def dump_json_stream(
+    data: Dict[str, Any], f: IO[bytes], array_key: str = "nodes", buffer_size: int = DEFAULT_WRITE_BUFFER_SIZE
+) -> None:
+    """
+    Write a JSON object to a binary file, serializing the elements of one of its arrays one at a time.
+
+    The output is byte-identical to orjson.dumps(data), but only a bounded buffer of serialized bytes is held at once
+    instead of the encoding of the whole document. Fields keep their order in the dictionary, so the fields before
+    the array are written first, then its elements in list order, then the remaining fields.
+
+    Args:
+        data (Dict[str, Any]): Object to write.
+        f (IO[bytes]): Binary file, or any object with a write method taking bytes.
+        array_key (str): Key of the array whose elements are serialized one at a time.
+        buffer_size (int): Number of serialized bytes gathered before every write.
+    """
+    parts: List[bytes] = []
+    size = 0
+
+    def emit(part: bytes) -> None:
+        nonlocal size
+        parts.append(part)
+        size += len(part)
+        if size >= buffer_size:
+            f.write(b"".join(parts))
+            parts.clear()
+            size = 0
+
+    emit(b"{")
+    for i, (key, value) in enumerate(data.items()):
+        emit(b"," + orjson.dumps(key) + b":" if i else orjson.dumps(key) + b":")
+        if key != array_key or not isinstance(value, list):
+            emit(orjson.dumps(value))
+            continue
+        emit(b"[")
+        for j, element in enumerate(value):
+            emit(b"," + orjson.dumps(element) if j else orjson.dumps(element))
+        emit(b"]")
+    emit(b"}")
+    f.write(b"".join(parts))
@@ -0,0 +1,119 @@
+import logging
+import sys
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .kineto_operator import KinetoOperator
+
+# Categories of the Kineto events the trace linker builds operators for: CPU operators and user annotations, CUDA
+# runtime and driver calls launching GPU operators, GPU kernels and memory copies, and CPU to GPU arrows.
+LINKED_CATEGORIES = ("cpu_op", "user_annotation", "cuda_runtime", "cuda_driver", "kernel", "gpu_memcpy", "ac2g")
+
+# Categories of the CUDA API calls, of which only the kernel launches are linked.
+CUDA_API_CATEGORIES = frozenset(("cuda_runtime", "cuda_driver"))
+
+# Suffix of the dropped_counts key of the CUDA API calls dropped because they launch no GPU operator.
+NON_LAUNCH_SUFFIX = " (not a launch)"
+
+
+class KinetoEventFilter:
+    """
+    Drops the Kineto events of categories the trace linker does not use, before any operator is built for them.
+
+    CUDA runtime and driver calls are only used to link the GPU operators they launch, so the calls of these
+    categories that are not in KinetoOperator.cuda_launch_operations, such as synchronizations and memory
+    allocations, are dropped as well.
+
+    Events of every category still define the time span of the process and of each thread, so the filter computes
+    these timing boundaries over all the events it sees, including the dropped ones.
+
+    Attributes
+        categories (Optional[frozenset]): Categories of the events kept, or None to keep every event.
+        dropped_counts (Counter): Number of dropped events by category, where CUDA API calls dropped because they
+            launch no GPU operator are counted under their category followed by NON_LAUNCH_SUFFIX.
+        process_start_time (int): Earliest timestamp of all events.
+        process_end_time (int): Latest end time of all events.
+    """
+
+    def __init__(self, categories: Optional[Iterable[str]] = LINKED_CATEGORIES) -> None:
+        self.categories = frozenset(categories) if categories is not None else None
+        self.dropped_counts: Counter = Counter()
+        self.process_start_time = sys.maxsize
+        self.process_end_time = 0
+        # Start time, index of the first event at that time, and end time of each thread.
+        self._thread_bounds: Dict[int, List[Any]] = {}
+
+    def filter(self, events: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the events of the allowed categories, recording the timing boundaries of all events.
+
+        CUDA runtime and driver calls other than kernel launches are dropped even if their category is allowed.
+
+        Args:
+            events (Iterable[Dict[str, Any]]): Kineto trace events, in file order.
+
+        Yields:
+            Dict[str, Any]: The events kept, in file order.
+        """
+        categories = self.categories
+        launch_names = KinetoOperator.cuda_launch_operations
+        dropped_counts = self.dropped_counts
+        thread_bounds = self._thread_bounds
+        for index, event in enumerate(events):
+            tid = event.get("tid", 0)
+            if tid is not None:
+                timestamp = event.get("ts", 0)
+                end = timestamp + event.get("dur", 0)
+                bounds = thread_bounds.get(tid)
+                if bounds is None:
+                    thread_bounds[tid] = [timestamp, index, max(end, 0)]
+                else:
+                    if timestamp < bounds[0]:
+                        bounds[0] = timestamp
+                        bounds[1] = index
+                    if end > bounds[2]:
+                        bounds[2] = end
+
+            if categories is None:
+                yield event
+                continue
+            category = event.get("cat", "")
+            if category not in categories:
+                dropped_counts[category] += 1
+            elif category in CUDA_API_CATEGORIES and event.get("name", "") not in launch_names:
+                dropped_counts[category + NON_LAUNCH_SUFFIX] += 1
+            else:
+                yield event
+
+        for start, _, end in thread_bounds.values():
+            self.process_start_time = min(self.process_start_time, start)
+            self.process_end_time = max(self.process_end_time, end)
+
+    @property
+    def thread_info(self) -> Dict[int, List[int]]:
+        """
+        Start and end times of each thread.
+
+        Threads are ordered by their first event in the trace sorted by timestamp, as if they were collected from the
+        sorted operators of all events.
+
+        Returns
+            Dict[int, List[int]]: Start and end times by thread ID.
+        """
+        ordered = sorted(self._thread_bounds.items(), key=lambda item: (item[1][0], item[1][1]))
+        return {tid: [min(start, sys.maxsize), end] for tid, (start, _, end) in ordered}
+
+    def log_dropped_counts(self, trace_file: str) -> None:
+        """Report the number of dropped events by category."""
+        total = sum(self.dropped_counts.values())
+        if not total:
+            return
+        counts = ", ".join(f"{category or '<none>'}: {count}" for category, count in self.dropped_counts.most_common())
+        logging.info(f"Dropped {total} unused events from {trace_file} ({counts}).")
+
+
+def parse_categories(value: str) -> Optional[List[str]]:
+    """Parse a comma-separated list of categories from the command line, where 'all' disables filtering."""
+    if value.strip() == "all":
+        return None
+    return [category.strip() for category in value.split(",") if category.strip()]
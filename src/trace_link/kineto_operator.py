@@ -1,6 +1,12 @@
+import sys
 from typing import Any, Dict, Optional
 
-from et_replay.execution_trace import Node as PyTorchOperator
+from .host_op_table import HostOp
+
+
+def intern_str(value: Any) -> Any:
+    """Return the interned copy of a string, or the value itself if it is not a string."""
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 class KinetoOperator:
@@ -19,7 +25,7 @@ class KinetoOperator:
         external_id (int): An external identifier associated with the operator.
         ev_idx (int): Event index of the operator.
         tid (int): Thread identifier where the operator was executed.
-        host_op (Optional[PyTorchOperator]): Corresponding PyTorch operator object.
+        host_op (Optional[HostOp]): Corresponding Chakra host operator.
         parent_host_op_id (Optional[int]): ID of the parent PyTorch operator.
         inter_thread_dep (Optional[int]): Identifier for inter-thread dependencies.
         stream (Optional[int]): CUDA stream identifier associated with the operator.
@@ -28,6 +34,35 @@ class KinetoOperator:
         pg_name (Optional[str]): Process Group name for the collective communication.
     """
 
+    # Kineto traces hold millions of events, so operators keep their fields in slots rather than a per-instance dict,
+    # and share a single copy of each distinct name, category, and phase.
+    __slots__ = (
+        "id",
+        "category",
+        "name",
+        "phase",
+        "inclusive_dur",
+        "exclusive_dur",
+        "timestamp",
+        "external_id",
+        "ev_idx",
+        "tid",
+        "host_op",
+        "parent_host_op_id",
+        "inter_thread_dep",
+        "stream",
+        "rf_id",
+        "correlation",
+        "pg_name",
+        "op_is_cpu_op",
+        "op_is_cuda_runtime_op",
+        "op_is_cuda_driver_op",
+        "op_is_ac2g_op",
+        "op_is_kernel_launch_op",
+        "op_is_gpu_op",
+        "op_is_inter_gpu_comms_op",
+    )
+
     simulatable_categories = {"cpu_op", "user_annotation"}
     name_exceptions = {"ProfilerStep"}
     cuda_launch_operations = {
@@ -51,23 +86,24 @@ class KinetoOperator:
             kineto_op (Dict[str, Any]): The dictionary representing the
                                         operator data.
         """
+        args = kineto_op.get("args", {})
         self.id: Optional[int] = kineto_op.get("id")
-        self.category: str = kineto_op.get("cat", "")
-        self.name: str = kineto_op.get("name", "")
-        self.phase: Optional[str] = kineto_op.get("ph")
+        self.category: str = intern_str(kineto_op.get("cat", ""))
+        self.name: str = intern_str(kineto_op.get("name", ""))
+        self.phase: Optional[str] = intern_str(kineto_op.get("ph"))
         self.inclusive_dur: float = kineto_op.get("dur", 0)
-        self.exclusive_dur: float = kineto_op.get("dur", 0)
+        self.exclusive_dur: float = self.inclusive_dur
         self.timestamp: float = kineto_op.get("ts", 0)
-        self.external_id: int = int(kineto_op.get("args", {}).get("External id", -1))
-        self.ev_idx: int = int(kineto_op.get("args", {}).get("Ev Idx", -1))
+        self.external_id: int = int(args.get("External id", -1))
+        self.ev_idx: int = int(args.get("Ev Idx", -1))
         self.tid: int = kineto_op.get("tid", 0)
-        self.host_op: Optional[PyTorchOperator] = None
+        self.host_op: Optional[HostOp] = None
         self.parent_host_op_id: Optional[int] = None
         self.inter_thread_dep: Optional[int] = None
-        self.stream: Optional[int] = kineto_op.get("args", {}).get("stream", None)
-        self.rf_id: Optional[int] = kineto_op.get("args", {}).get("Record function id", None)
-        self.correlation: int = kineto_op.get("args", {}).get("correlation", -1)
-        self.pg_name: Optional[str] = kineto_op.get("args", {}).get("Process Group Name", None)
+        self.stream: Optional[int] = args.get("stream", None)
+        self.rf_id: Optional[int] = args.get("Record function id", None)
+        self.correlation: int = args.get("correlation", -1)
+        self.pg_name: Optional[str] = args.get("Process Group Name", None)
 
         self.op_is_cpu_op = False
         self.op_is_cuda_runtime_op = False
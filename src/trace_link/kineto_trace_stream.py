@@ -0,0 +1,200 @@
+import gzip
+import re
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+import orjson
+
+# Size of the chunks read from the (decompressed) trace file.
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+# Number of candidate ends tried before giving up on parsing the buffered elements of an array at once.
+MAX_BATCH_ATTEMPTS = 8
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"')
+_SCALAR = re.compile(rb"[^,}\] \t\r\n]+")
+# Tokens needed to find the end of a nested value: whole strings, brackets, and runs of anything else.
+_TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]|[^"{}\[\]]+')
+# An object nesting objects at most one level deep, like a trace event and its args, matched in a single call.
+_SHALLOW_OBJECT = re.compile(rb'\{(?:[^{}"]|"(?:[^"\\]|\\.)*"|\{(?:[^{}"]|"(?:[^"\\]|\\.)*")*\})*\}')
+
+
+class JsonStreamTokenizer:
+    """
+    Incremental tokenizer over a JSON document read in chunks.
+
+    The tokenizer only keeps the unconsumed tail of the document in memory. It walks the structure of the document
+    and returns the raw bytes of the values the caller is interested in, which are then parsed on their own. The
+    elements of a large array are instead parsed one buffer at a time.
+
+    Attributes
+        path (str): Path of the document, for error messages.
+    """
+
+    def __init__(self, f: IO[bytes], path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.path = path
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buf = b""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        """Drop the consumed part of the buffer and read the next chunk, raising at the end of the document."""
+        if self._eof:
+            raise ValueError(f"Unexpected end of JSON document in {self.path}.")
+        chunk = self._file.read(self._chunk_size)
+        self._eof = not chunk
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+
+    def _peek(self) -> int:
+        """Skip whitespace and return the next byte without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            self._fill()
+
+    def expect(self, char: bytes) -> None:
+        """Consume a structural character, raising if the document has something else."""
+        if self._peek() != char[0]:
+            raise ValueError(
+                f"Expected {char.decode()!r} at offset {self._pos} of the buffered JSON in {self.path}, "
+                f"found {chr(self._buf[self._pos])!r}."
+            )
+        self._pos += 1
+
+    def _value_end(self) -> Optional[int]:
+        """Return the end offset of the value at the current position, or None if it is not fully buffered."""
+        buf, pos = self._buf, self._pos
+        first = buf[pos]
+        if first == ord('"'):
+            match = _STRING.match(buf, pos)
+            return match.end() if match else None
+        if first not in b"{[":
+            match = _SCALAR.match(buf, pos)
+            if match is None or (match.end() == len(buf) and not self._eof):
+                return None
+            return match.end()
+        match = _SHALLOW_OBJECT.match(buf, pos)
+        if match:
+            return match.end()
+        depth = 0
+        while True:
+            match = _TOKEN.match(buf, pos)
+            if match is None:
+                return None
+            pos = match.end()
+            token = buf[match.start()]
+            if token in b"{[":
+                depth += 1
+            elif token in b"}]":
+                depth -= 1
+                if depth == 0:
+                    return pos
+
+    def read_value(self) -> memoryview:
+        """Consume the next value and return its raw bytes."""
+        self._peek()
+        end = self._value_end()
+        while end is None:
+            self._fill()
+            end = self._value_end()
+        start, self._pos = self._pos, end
+        return memoryview(self._buf)[start:end]
+
+    def iter_object_keys(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the object at the current position.
+
+        After each key is yielded, the caller must consume its value, with read_value or otherwise.
+        """
+        self.expect(b"{")
+        if self._peek() == ord("}"):
+            self._pos += 1
+            return
+        while True:
+            key = orjson.loads(self.read_value())
+            self.expect(b":")
+            yield key
+            if self._peek() == ord("}"):
+                self._pos += 1
+                return
+            self.expect(b",")
+
+    def _parse_batch(self) -> List[Any]:
+        """
+        Parse the buffered elements of an array at once, consuming them and the comma following the last one.
+
+        The batch ends at the last closing brace that is followed by a comma. A brace inside a string or a nested value
+        makes the batch invalid JSON, so the previous brace is tried instead, and after a few attempts the caller falls
+        back to reading elements one by one.
+
+        Returns
+            List[Any]: The parsed elements, possibly none.
+        """
+        buf, pos = self._buf, self._pos
+        cut = len(buf)
+        for _ in range(MAX_BATCH_ATTEMPTS):
+            cut = buf.rfind(b"}", pos, cut)
+            if cut < 0:
+                break
+            comma = _WHITESPACE.match(buf, cut + 1).end()
+            if comma == len(buf) or buf[comma] != ord(","):
+                continue
+            try:
+                items = orjson.loads(b"[" + buf[pos : cut + 1] + b"]")
+            except orjson.JSONDecodeError:
+                continue
+            self._pos = comma + 1
+            return items
+        return []
+
+    def iter_array_items(self) -> Iterator[Any]:
+        """Iterate over the parsed elements of the array at the current position."""
+        self.expect(b"[")
+        if self._peek() == ord("]"):
+            self._pos += 1
+            return
+        while True:
+            # Everything but the element straddling the end of the buffer is parsed in one call.
+            yield from self._parse_batch()
+            yield orjson.loads(self.read_value())
+            if self._peek() == ord("]"):
+                self._pos += 1
+                return
+            self.expect(b",")
+
+
+def open_trace_file(path: str) -> IO[bytes]:
+    """Open a JSON trace file for binary reading, decompressing it on the fly if its name ends with gz."""
+    return gzip.open(path, "rb") if path.endswith("gz") else open(path, "rb")  # noqa: SIM115
+
+
+def iter_trace_events(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the traceEvents of a Kineto trace one event at a time.
+
+    Unlike loading the whole document, neither the decompressed text nor the parsed events are held in memory at
+    once: the file is decompressed in chunks, each event is parsed on its own when it has been fully read, and the
+    other top-level fields are skipped without being parsed.
+
+    Args:
+        path (str): Path of the Kineto trace, optionally gzip-compressed.
+        chunk_size (int): Number of decompressed bytes read at a time.
+
+    Yields:
+        Dict[str, Any]: The trace events, in file order.
+
+    Raises:
+        ValueError: If the document is malformed or has no traceEvents.
+    """
+    with open_trace_file(path) as f:
+        tokenizer = JsonStreamTokenizer(f, path, chunk_size)
+        for key in tokenizer.iter_object_keys():
+            if key == "traceEvents":
+                yield from tokenizer.iter_array_items()
+                return
+            tokenizer.read_value()
+    raise ValueError(f"No traceEvents found in {path}.")
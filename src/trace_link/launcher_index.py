@@ -0,0 +1,72 @@
+import bisect
+from typing import Dict, List, Optional
+
+from .kineto_operator import KinetoOperator
+
+# Name of the CPU operators wrapping coalesced NCCL collectives, which are not the launchers of NCCL kernels.
+NCCL_COALESCED = "nccl:coalesced"
+
+
+class LauncherIndex:
+    """
+    Index answering "last CPU operator of a thread starting before a timestamp" queries with a single bisect.
+
+    The sorted CPU operators are split by thread, keeping their order, and every thread also gets a second list
+    without its nccl:coalesced operators, which are skipped when looking for the launcher of an NCCL kernel.
+
+    Attributes
+        sorted_ops (List[KinetoOperator]): CPU operators of all threads, sorted by timestamp.
+        sorted_op_ts (List[int]): Timestamps of sorted_ops.
+    """
+
+    def __init__(self, sorted_ops: List[KinetoOperator], sorted_op_ts: List[int]) -> None:
+        """
+        Build the index.
+
+        Args:
+            sorted_ops (List[KinetoOperator]): CPU operators of all threads, sorted by timestamp.
+            sorted_op_ts (List[int]): Timestamps of sorted_ops.
+        """
+        self.sorted_ops = sorted_ops
+        self.sorted_op_ts = sorted_op_ts
+        self._ops: Dict[int, List[KinetoOperator]] = {}
+        self._ts: Dict[int, List[int]] = {}
+        self._non_coalesced_ops: Dict[int, List[KinetoOperator]] = {}
+        self._non_coalesced_ts: Dict[int, List[int]] = {}
+        for op in sorted_ops:
+            self._ops.setdefault(op.tid, []).append(op)
+            self._ts.setdefault(op.tid, []).append(op.timestamp)
+            if op.name != NCCL_COALESCED:
+                self._non_coalesced_ops.setdefault(op.tid, []).append(op)
+                self._non_coalesced_ts.setdefault(op.tid, []).append(op.timestamp)
+
+    def find_launcher(self, tid: int, timestamp: int, is_nccl: bool) -> Optional[KinetoOperator]:
+        """
+        Return the last CPU operator of a thread starting before a timestamp.
+
+        For an NCCL kernel, nccl:coalesced operators are skipped. If the thread has no other operator before the
+        timestamp, a nccl:coalesced operator of the thread is still returned when it is the last operator of all
+        threads before the timestamp.
+
+        Args:
+            tid (int): Thread ID of the operator launching the GPU operator.
+            timestamp (int): Timestamp of the operator launching the GPU operator.
+            is_nccl (bool): Whether the GPU operator is an NCCL kernel.
+
+        Returns:
+            Optional[KinetoOperator]: The operator, or None if the thread has no matching operator before timestamp.
+        """
+        ops, ts = (self._non_coalesced_ops, self._non_coalesced_ts) if is_nccl else (self._ops, self._ts)
+        if tid in ts:
+            pos = bisect.bisect_left(ts[tid], timestamp)
+            if pos > 0:
+                return ops[tid][pos - 1]
+        if not is_nccl:
+            return None
+
+        pos = bisect.bisect_left(self.sorted_op_ts, timestamp)
+        if pos > 0:
+            closest_op = self.sorted_ops[pos - 1]
+            if closest_op.name == NCCL_COALESCED and closest_op.tid == tid:
+                return closest_op
+        return None
@@ -0,0 +1,82 @@
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Name, dtype, and length of a NumPy array stored in shared memory.
+SharedArraySpec = Tuple[str, str, int]
+
+# Shared memory segments attached by the current worker process, by name.
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, SharedArraySpec]:
+    """
+    Copy an array into a new shared memory segment.
+
+    The caller owns the segment and must close and unlink it once the workers are done.
+
+    Args:
+        array (np.ndarray): Non-empty one-dimensional array.
+
+    Returns:
+        Tuple[shared_memory.SharedMemory, SharedArraySpec]: The segment, and the spec workers attach it with.
+    """
+    shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm, (shm.name, array.dtype.str, len(array))
+
+
+def attach_array(spec: SharedArraySpec) -> np.ndarray:
+    """Return a read-only view of a shared array, attaching its segment once per process."""
+    name, dtype, length = spec
+    if name not in _attached:
+        shm = shared_memory.SharedMemory(name=name)
+        array = np.ndarray((length,), dtype=np.dtype(dtype), buffer=shm.buf)
+        array.flags.writeable = False
+        _attached[name] = (shm, array)
+    return _attached[name][1]
+
+
+def exclusive_durs_for_range(task: Tuple[SharedArraySpec, SharedArraySpec, int, int]) -> List[float]:
+    """
+    Calculate the exclusive durations of a range of operators from shared timestamp and duration arrays.
+
+    The arrays hold the operators of one thread sorted by (timestamp, inclusive_dur). Each operator is computed like
+    ChakraDeviceTraceLoader.get_exclusive_dur_for_op: the operators following it and ending within it are merged
+    into regions, which are subtracted from its inclusive duration in order. Validation is left to the caller.
+
+    Args:
+        task (Tuple[SharedArraySpec, SharedArraySpec, int, int]): Specs of the timestamp and duration arrays, and the
+            start and end of the range of operator indices.
+
+    Returns:
+        List[float]: Exclusive durations of the operators in the range.
+    """
+    timestamps_spec, durations_spec, begin, end = task
+    timestamps = attach_array(timestamps_spec)
+    durations = attach_array(durations_spec)
+    exclusive_durs = durations[begin:end].tolist()
+    op_ends = timestamps[begin:end] + durations[begin:end]
+    # Operators after the first one starting past the end of an operator cannot be contained in it.
+    stops = np.searchsorted(timestamps, op_ends, side="right")
+
+    for k, i in enumerate(range(begin, end)):
+        stop = stops[k]
+        if stop <= i + 1:
+            continue
+        child_ends = timestamps[i + 1 : stop] + durations[i + 1 : stop]
+        contained = child_ends <= op_ends[k]
+        child_starts = timestamps[i + 1 : stop][contained]
+        child_ends = child_ends[contained]
+        if not len(child_starts):
+            continue
+        # Children are sorted by start time, so a region ends where a child starts past all previous ends.
+        covered_ends = np.maximum.accumulate(child_ends)
+        region_firsts = np.flatnonzero(np.concatenate(([True], child_starts[1:] > covered_ends[:-1])))
+        region_lasts = np.append(region_firsts[1:] - 1, len(child_starts) - 1)
+        exclusive_dur = exclusive_durs[k]
+        for region_start, region_end in zip(child_starts[region_firsts].tolist(), covered_ends[region_lasts].tolist()):
+            exclusive_dur -= region_end - region_start
+        exclusive_durs[k] = exclusive_dur
+    return exclusive_durs
@@ -0,0 +1,49 @@
+from operator import attrgetter
+from typing import Dict, List
+
+from .kineto_operator import KinetoOperator
+
+
+class SortedViews:
+    """
+    Sorted orders of the Kineto CPU operators, built once when the device trace is loaded.
+
+    The loader sorts all events by timestamp a single time, and the CPU operators and the operators of each thread
+    are collected from them in that order. Every stage of the trace linker that needs the operators in sorted order
+    takes them from these views instead of sorting them again.
+
+    Attributes
+        cpu_ops (List[KinetoOperator]): CPU operators of all threads sorted by timestamp, ties in trace order.
+        cpu_op_ts (List[int]): Timestamps of cpu_ops.
+        cpu_ops_by_tid (Dict[int, List[KinetoOperator]]): CPU operators of each thread sorted by timestamp.
+    """
+
+    def __init__(self, cpu_ops: List[KinetoOperator], cpu_ops_by_tid: Dict[int, List[KinetoOperator]]) -> None:
+        """
+        Build the views from operators already sorted by timestamp.
+
+        Args:
+            cpu_ops (List[KinetoOperator]): CPU operators of all threads sorted by timestamp. The list is copied, so the
+                caller may modify its own.
+            cpu_ops_by_tid (Dict[int, List[KinetoOperator]]): CPU operators of each thread sorted by timestamp.
+        """
+        self.cpu_ops = list(cpu_ops)
+        self.cpu_op_ts = list(map(attrgetter("timestamp"), self.cpu_ops))
+        self.cpu_ops_by_tid = cpu_ops_by_tid
+        self._by_start_and_dur: Dict[int, List[KinetoOperator]] = {}
+
+    def ops_by_start_and_dur(self, tid: int) -> List[KinetoOperator]:
+        """
+        Return the CPU operators of a thread sorted by timestamp, then by inclusive duration.
+
+        This is the order in which exclusive durations are calculated. It is sorted on first use and cached.
+
+        Args:
+            tid (int): Thread ID, a key of cpu_ops_by_tid.
+
+        Returns:
+            List[KinetoOperator]: The sorted operators.
+        """
+        if tid not in self._by_start_and_dur:
+            self._by_start_and_dur[tid] = sorted(self.cpu_ops_by_tid[tid], key=attrgetter("timestamp", "inclusive_dur"))
+        return self._by_start_and_dur[tid]
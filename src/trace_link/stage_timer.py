@@ -0,0 +1,43 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StageTimer:
+    """
+    Measures the wall time spent in the stages of a run and reports it.
+
+    Attributes
+        durations (Dict[str, float]): Wall time of each stage in seconds, in the order the stages first ran. A stage
+            run several times accumulates its durations.
+    """
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+    def report(self) -> str:
+        """
+        Format the duration of every stage and their total as a table.
+
+        Returns
+            str: One line per stage, then the total.
+        """
+        width = max((len(name) for name in self.durations), default=0)
+        width = max(width, len("total"))
+        lines = [f"{name:<{width}}  {duration:9.3f} s" for name, duration in self.durations.items()]
+        lines.append(f"{'total':<{width}}  {sum(self.durations.values()):9.3f} s")
+        return "\n".join(lines)
+
+    def log_report(self, title: str) -> None:
+        """Log the report at the info level."""
+        logging.info(f"{title}\n{self.report()}")
@@ -1,6 +1,7 @@
 import argparse
 import logging
 
+from .kineto_event_filter import LINKED_CATEGORIES, parse_categories
 from .trace_linker import TraceLinker
 
 
@@ -36,14 +37,43 @@ def main() -> None:
         required=True,
         help="Path for the output Chakra host + device trace in the JSON format",
     )
+    parser.add_argument(
+        "--compress-threads",
+        type=int,
+        default=1,
+        help=(
+            "Number of threads compressing the output file when its name ends with '.gz'. With more than one thread, "
+            "the output is split into blocks that are deflated in parallel and written as a multi-member gzip file."
+        ),
+    )
+    parser.add_argument(
+        "--device-categories",
+        type=str,
+        default=",".join(LINKED_CATEGORIES),
+        help=(
+            "Comma-separated categories of the Chakra device trace events loaded for linking, or 'all'. Events of "
+            "other categories, and CUDA runtime and driver calls other than kernel launches, are dropped while the "
+            "trace is read and only count towards process and thread time spans."
+        ),
+    )
+    parser.add_argument(
+        "--exclusive-dur-workers",
+        type=int,
+        default=0,
+        help=(
+            "Number of worker processes calculating the exclusive durations of the device operators from shared "
+            "memory. By default, they are calculated in the linking process with a single sweep per thread, which is "
+            "faster unless many cores are available."
+        ),
+    )
     parser.add_argument("--log-level", default="INFO", type=str, help="Log output verbosity level")
 
     args = parser.parse_args()
 
     logging.basicConfig(level="INFO", force=True)
 
-    linker = TraceLinker()
-    linker.link(args.chakra_host_trace, args.chakra_device_trace, args.output_file)
+    linker = TraceLinker(parse_categories(args.device_categories), args.exclusive_dur_workers)
+    linker.link(args.chakra_host_trace, args.chakra_device_trace, args.output_file, args.compress_threads)
 
     logging.info(f"Linking process successful. Output file is available at {args.output_file}.")
     logging.info("Please run the chakra_converter for further postprocessing.")
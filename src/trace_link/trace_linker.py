@@ -1,21 +1,22 @@
-import bisect
-import copy
 import gzip
+import itertools
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional, Tuple
-
-import orjson
-from et_replay.execution_trace import (
-    EXECUTION_TRACE_PROCESS_ANNOTATION,
-    EXECUTION_TRACE_THREAD_ANNOTATION,
-)
-from et_replay.execution_trace import Node as PyTorchOperator
-from et_replay.utils import read_dictionary_from_json_file
+import operator
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from ..et_io.block_gzip import BlockGzipWriter
+from ..et_io.trace_cache import detach_output
+from .annotation_merge import insert_annotations, merge_sorted_annotations
 from .chakra_device_trace_loader import ChakraDeviceTraceLoader
 from .chakra_host_trace_loader import ChakraHostTraceLoader
+from .cpu_timeline_index import CpuTimelineIndex
+from .host_op_table import EXECUTION_TRACE_PROCESS_ANNOTATION, EXECUTION_TRACE_THREAD_ANNOTATION, HostOp
+from .inter_thread_order import enforce_inter_thread_order
+from .json_stream_writer import dump_json_stream
+from .kineto_event_filter import LINKED_CATEGORIES
 from .kineto_operator import KinetoOperator
+from .launcher_index import LauncherIndex
+from .stage_timer import StageTimer
 from .unique_id_assigner import UniqueIdAssigner
 
 
@@ -27,15 +28,31 @@ class TraceLinker:
         chakra_host_trace_loader (ChakraHostTraceLoader): Loader for Chakra host execution traces.
         chakra_device_trace_loader (ChakraDeviceTraceLoader): Loader for Chakra device execution traces.
         id_assigner (UniqueIdAssigner): Assigns unique IDs to operators.
+        stage_timer (StageTimer): Wall time of the linking stages, shared with the device trace loader.
     """
 
-    def __init__(self) -> None:
-        """Initialize the TraceLinker with a log level."""
+    def __init__(
+        self, device_categories: Optional[Iterable[str]] = LINKED_CATEGORIES, exclusive_dur_workers: int = 0
+    ) -> None:
+        """
+        Initialize the TraceLinker.
+
+        Args:
+            device_categories (Optional[Iterable[str]]): Categories of the Chakra device trace events loaded as
+                operators, or None to load all of them.
+            exclusive_dur_workers (int): Number of worker processes calculating the exclusive durations of the
+                device operators, or 0 to calculate them in the linking process.
+        """
+        self.stage_timer = StageTimer()
         self.chakra_host_trace_loader = ChakraHostTraceLoader()
-        self.chakra_device_trace_loader = ChakraDeviceTraceLoader()
+        self.chakra_device_trace_loader = ChakraDeviceTraceLoader(
+            device_categories, self.stage_timer, exclusive_dur_workers
+        )
         self.id_assigner = UniqueIdAssigner()
 
-    def link(self, chakra_host_trace: str, chakra_device_trace: str, output_file: str) -> None:
+    def link(
+        self, chakra_host_trace: str, chakra_device_trace: str, output_file: str, compress_threads: int = 1
+    ) -> None:
         """
         Links Chakra host execution traces (ET) and Chakra device ET to generate Chakra host + device ET.
 
@@ -43,8 +60,10 @@ class TraceLinker:
             chakra_host_trace (str): Path to the Chakra host execution trace file.
             chakra_device_trace (str): Path to the Kineto trace file.
             output_file (str): Path for the output nyTorch execution trace plus file.
+            compress_threads (int): Number of threads compressing the output file if its name ends with 'gz'.
         """
-        host_ops = self.chakra_host_trace_loader.load(chakra_host_trace)
+        with self.stage_timer.stage("load host trace"):
+            host_trace = self.chakra_host_trace_loader.load(chakra_host_trace)
 
         (
             kineto_cpu_ops,
@@ -61,11 +80,13 @@ class TraceLinker:
             sorted_kineto_cpu_op_ts,
         ) = self.chakra_device_trace_loader.load(chakra_device_trace)
 
-        kineto_tid_cpu_ops_map = self.enforce_inter_thread_order(kineto_tid_cpu_ops_map)
+        # The operators of each thread come from the sorted views of the loader, so they need not be sorted again.
+        with self.stage_timer.stage("inter-thread order"):
+            kineto_tid_cpu_ops_map = self.enforce_inter_thread_order(kineto_tid_cpu_ops_map, presorted=True)
 
         chakra_execution_trace_plus_data = self.link_traces(
-            chakra_host_trace,
-            host_ops,
+            host_trace.data,
+            host_trace.ops,
             kineto_cpu_ops,
             sorted_kineto_cpu_ops,
             sorted_kineto_cpu_op_ts,
@@ -77,11 +98,13 @@ class TraceLinker:
             kineto_process_end_time,
         )
 
-        self.dump_chakra_execution_trace_plus(chakra_execution_trace_plus_data, output_file)
+        with self.stage_timer.stage("dump ET+"):
+            self.dump_chakra_execution_trace_plus(chakra_execution_trace_plus_data, output_file, compress_threads)
+        self.stage_timer.log_report("Time spent in each stage of trace linking:")
         logging.info("Traces linked successfully!")
 
     def enforce_inter_thread_order(
-        self, kineto_tid_cpu_ops_map: Dict[int, List[KinetoOperator]], threshold: int = 1000
+        self, kineto_tid_cpu_ops_map: Dict[int, List[KinetoOperator]], threshold: int = 1000, presorted: bool = False
     ) -> Dict[int, List[KinetoOperator]]:
         """
         Enforce order between groups of operators in different threads.
@@ -92,34 +115,29 @@ class TraceLinker:
         inter-thread dependencies realistically.
 
         An isolated group is formed when there's a significant gap in execution within a thread. Each new group relies
-        on the last CPU operator from other threads, enforcing order and dependency across threads.
+        on the last CPU operator from other threads, enforcing order and dependency across threads. The groups of all
+        threads are resolved at once with array operations; process_thread_inter_thread_order is the equivalent
+        per-thread implementation.
 
         Args:
             kineto_tid_cpu_ops_map (Dict[int, List[KinetoOperator]]): Kineto CPU operators grouped by thread ID.
             threshold (int): Threshold for significant gap detection in microseconds, used to define group boundaries.
+            presorted (bool): Whether the operators of every thread are already sorted by timestamp.
 
         Returns:
             Dict[int, List[KinetoOperator]]: Updated map with enforced inter-thread order.
         """
         logging.debug("Enforcing inter-thread order in Kineto traces.")
-
-        with ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(
-                    self.process_thread_inter_thread_order, tid, ops, kineto_tid_cpu_ops_map, threshold
-                ): tid
-                for tid, ops in kineto_tid_cpu_ops_map.items()
-            }
-
-            for future in as_completed(futures):
-                tid = futures[future]
-                future.result()
-                logging.debug(f"Thread {tid} dependencies processed.")
-
+        enforce_inter_thread_order(kineto_tid_cpu_ops_map, threshold, presorted)
         return kineto_tid_cpu_ops_map
 
     def process_thread_inter_thread_order(
-        self, tid: int, ops: List[KinetoOperator], ops_by_tid: Dict[int, List[KinetoOperator]], threshold: int
+        self,
+        tid: int,
+        ops: List[KinetoOperator],
+        ops_by_tid: Dict[int, List[KinetoOperator]],
+        threshold: int,
+        timeline_index: Optional[CpuTimelineIndex] = None,
     ) -> None:
         """
         Process a single thread's operators to enforce inter-thread order.
@@ -129,6 +147,8 @@ class TraceLinker:
             ops (List[KinetoOperator]): List of Kineto operators for the thread.
             ops_by_tid (Dict[int, List[KinetoOperator]]): Kineto operators grouped by thread ID.
             threshold (int): Threshold for significant gap detection in microseconds.
+            timeline_index (Optional[CpuTimelineIndex]): Index of the CPU operators of ops_by_tid, shared by all
+                threads. Without it, every lookup builds its own index.
         """
         logging.debug(f"Thread {tid}: Identifying gaps for dependency linking with threshold {threshold}us.")
         sorted_ops = sorted(ops, key=lambda op: op.timestamp)
@@ -139,7 +159,9 @@ class TraceLinker:
                 i == 0
                 or (sorted_ops[i].timestamp - sorted_ops[i - 1].timestamp - sorted_ops[i - 1].inclusive_dur) > threshold
             ):
-                last_cpu_node_rf_id = self.find_last_cpu_node_before_timestamp(ops_by_tid, tid, op.timestamp)
+                last_cpu_node_rf_id = self.find_last_cpu_node_before_timestamp(
+                    ops_by_tid, tid, op.timestamp, timeline_index
+                )
                 if last_cpu_node_rf_id:
                     logging.debug(
                         f"Thread {tid}: Linking op '{op.name}' to CPU node before gap with rf_id "
@@ -154,6 +176,7 @@ class TraceLinker:
         ops_by_tid: Dict[int, List[KinetoOperator]],
         exclude_tid: int,
         timestamp: int,
+        timeline_index: Optional[CpuTimelineIndex] = None,
     ) -> Optional[int]:
         """
         Find the last CPU node ID before a given timestamp in threads other than the excluded one.
@@ -164,33 +187,25 @@ class TraceLinker:
             ops_by_tid (Dict[int, List[KinetoOperator]]): Operators grouped by thread ID.
             exclude_tid (int): Thread ID to exclude from the search.
             timestamp (int): Timestamp to compare against.
+            timeline_index (Optional[CpuTimelineIndex]): Index of the CPU operators of ops_by_tid. Built from
+                ops_by_tid if not provided; callers issuing many queries should build it once and pass it in.
 
         Returns:
             Optional[int]: The ID of the last CPU node found, or None if not found.
         """
         logging.debug(f"Finding last CPU node before timestamp {timestamp} excluding thread {exclude_tid}.")
-        last_cpu_node = None
-        last_cpu_node_rf_id = None
-        latest_timestamp = 0
-        for tid, ops in ops_by_tid.items():
-            if tid != exclude_tid:
-                for op in sorted(ops, key=lambda op: op.timestamp):
-                    if (
-                        (op.category in ["cpu_op", "user_annotation"])
-                        and (op.timestamp < timestamp)
-                        and (op.timestamp > latest_timestamp)
-                    ):
-                        last_cpu_node = op
-                        latest_timestamp = op.timestamp
-                        last_cpu_node_rf_id = op.rf_id
+        if timeline_index is None:
+            timeline_index = CpuTimelineIndex(ops_by_tid)
+        last_cpu_node = timeline_index.find_last_before(exclude_tid, timestamp)
         if last_cpu_node:
             logging.debug(f"Last CPU node before timestamp {timestamp} found: {last_cpu_node}")
-        return last_cpu_node_rf_id
+            return last_cpu_node.rf_id
+        return None
 
     def link_traces(
         self,
-        chakra_host_trace: str,
-        host_ops: List[PyTorchOperator],
+        chakra_host_trace_data: Dict,
+        host_ops: Iterable[HostOp],
         kineto_cpu_ops: List[KinetoOperator],
         sorted_kineto_cpu_ops: List[KinetoOperator],
         sorted_kineto_cpu_op_ts: List[int],
@@ -205,8 +220,8 @@ class TraceLinker:
         Link Chakra Host ET and Chakra Device ET to produce an enhanced Chakra ET (ET +).
 
         Args:
-            chakra_host_trace (str): Path to the Chakra host execution trace file.
-            host_ops (List[PyTorchOperator]): List of Chakra host operators.
+            chakra_host_trace_data (Dict): Raw data of the Chakra host execution trace, extended in place.
+            host_ops (Iterable[HostOp]): Chakra host operators.
             kineto_cpu_ops (List[KinetoOperator]): List of Kineto CPU operators.
             sorted_kineto_cpu_ops (List[KinetoOperator]): Sorted list of Kineto CPU operators.
             sorted_kineto_cpu_op_ts (List[int]): Sorted list of timestamps for the Kineto CPU operators.
@@ -223,41 +238,44 @@ class TraceLinker:
             Dict: The enhanced Chakra Host Execution Trace (ET+).
         """
         logging.debug("Starting the process of linking Chakra host and device traces.")
-        (
-            kineto_cpu_ops,
-            sorted_kineto_cpu_ops,
-            sorted_kineto_cpu_op_ts,
-        ) = self.add_thread_and_process_annotations(
-            kineto_cpu_ops,
-            sorted_kineto_cpu_ops,
-            sorted_kineto_cpu_op_ts,
-            kineto_thread_debug,
-            kineto_process_start_time,
-            kineto_process_end_time,
-        )
-        (
-            host_op_id_to_kineto_ops_map,
-            host_op_id_to_inclusive_dur_map,
-            host_op_id_to_exclusive_dur_map,
-            host_op_id_to_timestamp_map,
-            host_op_id_to_inter_thread_dep_map,
-        ) = self.map_host_to_device_ops(
-            host_ops,
-            kineto_cpu_ops,
-            sorted_kineto_cpu_ops,
-            sorted_kineto_cpu_op_ts,
-            kineto_correlation_cuda_runtime_map,
-            kineto_rf_id_to_device_op_map,
-            kineto_gpu_ops,
-        )
-        chakra_execution_trace_plus_data = self.construct_et_plus_data(
-            chakra_host_trace,
-            host_op_id_to_kineto_ops_map,
-            host_op_id_to_inclusive_dur_map,
-            host_op_id_to_exclusive_dur_map,
-            host_op_id_to_timestamp_map,
-            host_op_id_to_inter_thread_dep_map,
-        )
+        with self.stage_timer.stage("annotations"):
+            (
+                kineto_cpu_ops,
+                sorted_kineto_cpu_ops,
+                sorted_kineto_cpu_op_ts,
+            ) = self.add_thread_and_process_annotations(
+                kineto_cpu_ops,
+                sorted_kineto_cpu_ops,
+                sorted_kineto_cpu_op_ts,
+                kineto_thread_debug,
+                kineto_process_start_time,
+                kineto_process_end_time,
+            )
+        with self.stage_timer.stage("map host to device operators"):
+            (
+                host_op_id_to_kineto_ops_map,
+                host_op_id_to_inclusive_dur_map,
+                host_op_id_to_exclusive_dur_map,
+                host_op_id_to_timestamp_map,
+                host_op_id_to_inter_thread_dep_map,
+            ) = self.map_host_to_device_ops(
+                host_ops,
+                kineto_cpu_ops,
+                sorted_kineto_cpu_ops,
+                sorted_kineto_cpu_op_ts,
+                kineto_correlation_cuda_runtime_map,
+                kineto_rf_id_to_device_op_map,
+                kineto_gpu_ops,
+            )
+        with self.stage_timer.stage("construct ET+"):
+            chakra_execution_trace_plus_data = self.construct_et_plus_data(
+                chakra_host_trace_data,
+                host_op_id_to_kineto_ops_map,
+                host_op_id_to_inclusive_dur_map,
+                host_op_id_to_exclusive_dur_map,
+                host_op_id_to_timestamp_map,
+                host_op_id_to_inter_thread_dep_map,
+            )
         logging.debug("Traces have been successfully linked.")
         return chakra_execution_trace_plus_data
 
@@ -280,8 +298,7 @@ class TraceLinker:
         """
         logging.debug("Adding process and thread annotations to Kineto operators.")
 
-        # Insert process annotation operator. This operator represents the
-        # overall time span of the trace process.
+        # Process annotation operator. This operator represents the overall time span of the trace process.
         process_annotation_op = KinetoOperator(
             {
                 "name": EXECUTION_TRACE_PROCESS_ANNOTATION,
@@ -290,7 +307,6 @@ class TraceLinker:
                 "exclusive_dur": 0,  # Process exclusive duration not applicable
             }
         )
-        kineto_cpu_ops.insert(0, process_annotation_op)
         logging.debug(
             "Process annotation added with start time {} and duration {}.".format(
                 kineto_process_start_time,
@@ -298,8 +314,9 @@ class TraceLinker:
             )
         )
 
-        # Insert thread annotation operators for each thread. These annotations
-        # are crucial for understanding thread-level execution within the trace.
+        # Thread annotation operators for each thread. These annotations are crucial for understanding thread-level
+        # execution within the trace.
+        thread_annotation_ops = []
         for tid, (start_ts, end_ts) in kineto_thread_debug.items():
             inclusive_dur = end_ts - start_ts
             thread_annotation_op = KinetoOperator(
@@ -313,27 +330,33 @@ class TraceLinker:
                     "exclusive_dur": 0,
                 }
             )
-            # Find the correct position to insert the thread annotation
-            position = next(
-                (i for i, op in enumerate(kineto_cpu_ops) if op.tid == tid and op.timestamp >= start_ts),
-                None,
-            )
-            if position is not None:
-                kineto_cpu_ops.insert(position, thread_annotation_op)
-            else:
-                kineto_cpu_ops.append(thread_annotation_op)
+            thread_annotation_ops.append((tid, thread_annotation_op))
             logging.debug(
                 "Thread {} annotation added with start time {} and duration {}.".format(tid, start_ts, inclusive_dur)
             )
 
-        sorted_kineto_cpu_ops = sorted(kineto_cpu_ops, key=lambda op: op.timestamp)
-        sorted_kineto_cpu_op_ts = [op.timestamp for op in sorted_kineto_cpu_ops]
+        # Every annotation goes right before the first operator of its thread starting at or after it. The positions
+        # of all annotations are found in a single pass, and the operators are updated in place.
+        annotated_ops, anchored_annotations = insert_annotations(
+            kineto_cpu_ops, process_annotation_op, thread_annotation_ops
+        )
+        kineto_cpu_op_ts = list(map(operator.attrgetter("timestamp"), kineto_cpu_ops))
+        if all(map(operator.le, kineto_cpu_op_ts, itertools.islice(kineto_cpu_op_ts, 1, None))):
+            # The loader lists the operators sorted by timestamp, so the annotations are merged into them instead of
+            # sorting everything again.
+            sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts = merge_sorted_annotations(
+                kineto_cpu_ops, kineto_cpu_op_ts, anchored_annotations
+            )
+        else:
+            sorted_kineto_cpu_ops = sorted(annotated_ops, key=lambda op: op.timestamp)
+            sorted_kineto_cpu_op_ts = [op.timestamp for op in sorted_kineto_cpu_ops]
+        kineto_cpu_ops[:] = annotated_ops
 
         return kineto_cpu_ops, sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts
 
     def map_host_to_device_ops(
         self,
-        host_ops: List[PyTorchOperator],
+        host_ops: Iterable[HostOp],
         kineto_cpu_ops: List[KinetoOperator],
         sorted_kineto_cpu_ops: List[KinetoOperator],
         sorted_kineto_cpu_op_ts: List[int],
@@ -417,9 +440,14 @@ class TraceLinker:
             ValueError: If 'ev_idx' is missing for any GPU operator.
         """
         cpu_ev_idx_to_gpu_ops_map = {}
+        launcher_index = LauncherIndex(sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts)
         for gpu_op in kineto_gpu_ops:
             parent_cpu_op = self.find_parent_cpu_op(
-                gpu_op, kineto_correlation_cuda_runtime_map, sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts
+                gpu_op,
+                kineto_correlation_cuda_runtime_map,
+                sorted_kineto_cpu_ops,
+                sorted_kineto_cpu_op_ts,
+                launcher_index,
             )
             if not parent_cpu_op:
                 # warning_msg = f"Missing parent CPU operator for GPU op '{gpu_op.name}'. Orphaned GPU operator."
@@ -446,6 +474,7 @@ class TraceLinker:
         kineto_correlation_cuda_runtime_map: Dict[int, KinetoOperator],
         sorted_kineto_cpu_ops: List[KinetoOperator],
         sorted_kineto_cpu_op_ts: List[int],
+        launcher_index: Optional[LauncherIndex] = None,
     ) -> Optional[KinetoOperator]:
         """
         Find the parent CPU operator for a given GPU operator by identifying the corresponding CUDA runtime operator.
@@ -460,6 +489,8 @@ class TraceLinker:
             sorted_kineto_cpu_ops (List[KinetoOperator]): Sorted list of Kineto CPU operators.
             sorted_kineto_cpu_op_ts (List[int]): Sorted list of timestamps extracted from Kineto operators for
                 efficient temporal queries.
+            launcher_index (Optional[LauncherIndex]): Index of sorted_kineto_cpu_ops by thread, passed on to
+                find_closest_op.
 
         Returns:
             Optional[KinetoOperator]: The parent CPU operator if found.
@@ -490,7 +521,7 @@ class TraceLinker:
 
         # Find the closest CPU operator that precedes the CUDA runtime operation
         parent_cpu_op = self.find_closest_op(
-            kineto_gpu_op, sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts, kineto_runtime_op.timestamp
+            kineto_gpu_op, sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts, kineto_runtime_op.timestamp, launcher_index
         )
         if not parent_cpu_op:
             logging.warning(
@@ -507,59 +538,33 @@ class TraceLinker:
         sorted_kineto_cpu_ops: List[KinetoOperator],
         sorted_kineto_cpu_op_ts: List[int],
         ts: int,
+        launcher_index: Optional[LauncherIndex] = None,
     ) -> Optional[KinetoOperator]:
         """
         Find the Kineto operator that is closest in start time to a given timestamp and that covers the timestamp.
 
+        The operator is the last one starting before the timestamp on the thread of the GPU operator. For NCCL
+        operations, 'nccl:coalesced' operators are skipped, unless the thread has no other operator before the
+        timestamp and the closest operator of all threads is a 'nccl:coalesced' one of the thread.
+
         Args:
             kineto_gpu_op (KinetoOperator): The GPU operator being compared.
             sorted_kineto_cpu_ops (List[KinetoOperator]): List of Kineto operators.
             sorted_kineto_cpu_op_ts (List[int]): List of timestamps for the sorted Kineto operators.
             ts (int): The timestamp to compare against.
+            launcher_index (Optional[LauncherIndex]): Index of sorted_kineto_cpu_ops by thread. Built from the sorted
+                operators if not provided; callers issuing many queries should build it once and pass it in.
 
         Returns:
             Optional[KinetoOperator]: The closest Kineto operator if found.
         """
-        # Searching for the closest timestamp index
-        index = bisect.bisect_left(sorted_kineto_cpu_op_ts, ts)
-
-        if index == 0:
-            # All operators are later than the timestamp
-            return None
-        else:
-            # The operator immediately before the index is the closest one before the timestamp
-            closest_op = sorted_kineto_cpu_ops[index - 1]
-
-            # Check for NCCL specifics: if it's an NCCL operation and 'nccl:coalesced' should be skipped
-            if "nccl" in kineto_gpu_op.name.lower() and closest_op.name == "nccl:coalesced":
-                # Move back to find a non-'nccl:coalesced' operator, if available
-                for new_index in range(index - 2, -1, -1):
-                    potential_op = sorted_kineto_cpu_ops[new_index]
-                    if potential_op.tid == kineto_gpu_op.tid and potential_op.name != "nccl:coalesced":
-                        return potential_op
-                # If no valid alternative found before 'nccl:coalesced', continue search forward
-                index = index - 1  # Adjust index to skip 'nccl:coalesced'
-
-            # After skipping 'nccl:coalesced', verify that the closest operation is on the same thread
-            # as the GPU operation
-            if closest_op.tid == kineto_gpu_op.tid:
-                return closest_op
-
-            # If the tids do not match, search forward to find the closest matching tid
-            for i in range(index - 1, -1, -1):
-                op = sorted_kineto_cpu_ops[i]
-                if op.tid == kineto_gpu_op.tid:
-                    if "nccl" in kineto_gpu_op.name.lower() and op.name == "nccl:coalesced":
-                        continue  # Skip 'nccl:coalesced' if it's an NCCL-related GPU operation
-                    if op.timestamp <= ts:
-                        return op
-
-            # If no matching tid is found going forward, return None
-            return None
+        if launcher_index is None:
+            launcher_index = LauncherIndex(sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts)
+        return launcher_index.find_launcher(kineto_gpu_op.tid, ts, "nccl" in kineto_gpu_op.name.lower())
 
     def link_ops(
         self,
-        host_op: PyTorchOperator,
+        host_op: HostOp,
         kineto_op: KinetoOperator,
         cpu_ev_idx_to_gpu_ops_map: Dict[int, List[KinetoOperator]],
         kineto_rf_id_to_device_op_map: Dict[int, KinetoOperator],
@@ -568,7 +573,7 @@ class TraceLinker:
         Link a Chakra host operator to its corresponding Kineto operator and any associated GPU operators.
 
         Args:
-            host_op (PyTorchOperator): Chakra host operator to link.
+            host_op (HostOp): Chakra host operator to link.
             kineto_op (KinetoOperator): Corresponding Kineto operator.
             cpu_ev_idx_to_gpu_ops_map (Dict[int, List[KinetoOperator]]): GPU ops mapping.
             kineto_rf_id_to_device_op_map (Dict[int, KinetoOperator]): Kineto operator mapping.
@@ -612,12 +617,12 @@ class TraceLinker:
                 return inter_thread_dep_kineto_op.host_op.id
         return None
 
-    def link_gpu_ops(self, host_op: PyTorchOperator, kineto_gpu_ops: List[KinetoOperator]) -> None:
+    def link_gpu_ops(self, host_op: HostOp, kineto_gpu_ops: List[KinetoOperator]) -> None:
         """
         Link GPU operators to a Chakra host operator.
 
         Args:
-            host_op (PyTorchOperator): The Chakra host operator to link to.
+            host_op (HostOp): The Chakra host operator to link to.
             kineto_gpu_ops (List[KinetoOperator]): GPU operators to link.
         """
         for gpu_op in kineto_gpu_ops:
@@ -625,7 +630,7 @@ class TraceLinker:
 
     def construct_et_plus_data(
         self,
-        chakra_host_trace: str,
+        chakra_host_trace_data: Dict,
         host_op_id_to_kineto_ops_map: Dict[int, List[KinetoOperator]],
         host_op_id_to_inclusive_dur_map: Dict[int, int],
         host_op_id_to_exclusive_dur_map: Dict[int, int],
@@ -636,10 +641,11 @@ class TraceLinker:
         Construct the enhanced Chakra Host Execution Trace (ET+) data structure.
 
         This method enriches the Chakra host execution trace with detailed performance data from the Kineto trace,
-        offering a comprehensive view of the execution.
+        offering a comprehensive view of the execution. The raw host trace data, already parsed by the host trace
+        loader, is extended in place rather than read from the file again.
 
         Args:
-            chakra_host_trace (str): Path to the Chakra host execution trace file.
+            chakra_host_trace_data (Dict): Raw data of the Chakra host execution trace.
             host_op_id_to_kineto_ops_map (Dict[int, List[KinetoOperator]]): Map from Chakra host op IDs to Kineto
                 GPU ops.
             host_op_id_to_inclusive_dur_map (Dict[int, int]): Inclusive duration map for Chakra host ops.
@@ -652,12 +658,14 @@ class TraceLinker:
             Dict: The constructed ET+ data.
         """
         logging.info("Constructing ET+ data.")
-        pytorch_et_data = read_dictionary_from_json_file(chakra_host_trace)
-
-        sorted_nodes = sorted(pytorch_et_data["nodes"], key=lambda x: x["id"])
-        gpu_ops = []
-        for op in sorted_nodes:
-            gpu_ops += self.process_op_and_dependents(
+        pytorch_et_data = chakra_host_trace_data
+
+        # New IDs are assigned in increasing order as operators are processed, so listing every operator right before
+        # the GPU operators created for it keeps the nodes sorted by their new IDs.
+        nodes = []
+        for op in self.sort_nodes_by_id(pytorch_et_data["nodes"]):
+            nodes.append(op)
+            nodes += self.process_op_and_dependents(
                 op,
                 host_op_id_to_kineto_ops_map,
                 host_op_id_to_inclusive_dur_map,
@@ -665,12 +673,11 @@ class TraceLinker:
                 host_op_id_to_timestamp_map,
                 host_op_id_to_inter_thread_dep_map,
             )
-        pytorch_et_data["nodes"] += gpu_ops
+        pytorch_et_data["nodes"] = self.sort_nodes_by_id(nodes)
 
         # Update parent-child relationships with new IDs
         logging.info("Updating parent-child relationships with new IDs.")
-        sorted_nodes = sorted(pytorch_et_data["nodes"], key=lambda x: x["id"])
-        for op in sorted_nodes:
+        for op in pytorch_et_data["nodes"]:
             if "ctrl_deps" in op:
                 op["ctrl_deps"] = self.id_assigner.assign_or_retrieve_id(op["ctrl_deps"])
 
@@ -728,8 +735,10 @@ class TraceLinker:
         """
         Create and return a list of GPU operators that are dependent on a specific CPU operator.
 
-        The GPU operators are deep copies of the existing operators with updated IDs and other relevant
-        fields from the CPU operator.
+        The GPU operators are shallow copies of the CPU operator with updated IDs and other relevant fields from the
+        device operators. The nested fields of the CPU operator, such as its inputs, outputs, and attributes, are
+        never modified once the operator is read, so they are shared by the GPU operators instead of being copied for
+        every one of them.
 
         Args:
             cpu_op (Dict): The Chakra host CPU operator.
@@ -743,50 +752,63 @@ class TraceLinker:
         updated_gpu_ops = []
         dependent_gpu_ops = host_op_id_to_kineto_ops_map.get(orig_op_id, [])
         for gpu_op in sorted(dependent_gpu_ops, key=lambda x: x.timestamp):
-            new_gpu_op = copy.deepcopy(cpu_op)
             new_gpu_op_id = self.id_assigner.generate_new_id()
-            new_gpu_op.update(
-                {
-                    "id": new_gpu_op_id,
-                    "ctrl_deps": orig_op_id,
-                    "inputs": cpu_op["inputs"],
-                    "outputs": cpu_op["outputs"],
-                    "cat": gpu_op.category,
-                    "name": gpu_op.name,
-                    "ph": gpu_op.phase,
-                    "inclusive_dur": gpu_op.inclusive_dur,
-                    "exclusive_dur": gpu_op.exclusive_dur,
-                    "ts": gpu_op.timestamp,
-                    "stream": gpu_op.stream,
-                    **(
-                        {"pg_name": gpu_op.pg_name}
-                        if gpu_op.is_inter_gpu_comms_op() and gpu_op.pg_name is not None
-                        else {}
-                    ),
-                }
-            )
+            new_gpu_op = {
+                **cpu_op,
+                "id": new_gpu_op_id,
+                "ctrl_deps": orig_op_id,
+                "cat": gpu_op.category,
+                "name": gpu_op.name,
+                "ph": gpu_op.phase,
+                "inclusive_dur": gpu_op.inclusive_dur,
+                "exclusive_dur": gpu_op.exclusive_dur,
+                "ts": gpu_op.timestamp,
+                "stream": gpu_op.stream,
+            }
+            if gpu_op.is_inter_gpu_comms_op() and gpu_op.pg_name is not None:
+                new_gpu_op["pg_name"] = gpu_op.pg_name
 
             updated_gpu_ops.append(new_gpu_op)
 
         return updated_gpu_ops
 
     @staticmethod
-    def write_dictionary_to_json_file(file_path: str, data: Dict[Any, Any]) -> None:
-        """Write input dictionary to a json file."""
-        if file_path.endswith("gz"):
-            with gzip.open(file_path, "w") as f:
-                f.write(orjson.dumps(data))
+    def sort_nodes_by_id(nodes: List[Dict]) -> List[Dict]:
+        """Return the nodes sorted by ID, checking in a single pass whether they already are before sorting them."""
+        if all(prev["id"] <= node["id"] for prev, node in zip(nodes, itertools.islice(nodes, 1, None))):
+            return nodes
+        return sorted(nodes, key=lambda x: x["id"])
+
+    @staticmethod
+    def write_dictionary_to_json_file(file_path: str, data: Dict[Any, Any], compress_threads: int = 1) -> None:
+        """
+        Write input dictionary to a json file.
+
+        The file is gzip-compressed if its name ends with 'gz'. With more than one compression thread, the JSON is
+        split into blocks that are deflated in parallel and written as a multi-member gzip file. Nodes are serialized
+        and written one at a time rather than encoding the whole dictionary at once. An existing file is removed
+        first, so that an output placed from a trace cache is replaced rather than written through.
+        """
+        detach_output(file_path)
+        if file_path.endswith("gz") and compress_threads > 1:
+            f = BlockGzipWriter(file_path, threads=compress_threads)
+        elif file_path.endswith("gz"):
+            f = gzip.open(file_path, "wb")
         else:
-            with open(file_path, "wb") as f:
-                f.write(orjson.dumps(data))
+            f = open(file_path, "wb")  # noqa: SIM115
+        with f:
+            dump_json_stream(data, f)
 
-    def dump_chakra_execution_trace_plus(self, chakra_execution_trace_plus_data: Dict, output_file: str) -> None:
+    def dump_chakra_execution_trace_plus(
+        self, chakra_execution_trace_plus_data: Dict, output_file: str, compress_threads: int = 1
+    ) -> None:
         """
         Dump the enhanced Chakra execution trace plus data to a file.
 
         Args:
             chakra_execution_trace_plus_data (Dict): The constructed ET+ data.
             output_file (str): The file path where the ET+ data will be saved.
+            compress_threads (int): Number of threads compressing the output file if its name ends with 'gz'.
         """
         logging.info(f"Dumping ET+ data to {output_file}.")
 
@@ -795,9 +817,7 @@ class TraceLinker:
             return
 
         if "nodes" in chakra_execution_trace_plus_data:
-            chakra_execution_trace_plus_data["nodes"] = sorted(
-                chakra_execution_trace_plus_data["nodes"], key=lambda x: x["id"]
-            )
+            chakra_execution_trace_plus_data["nodes"] = self.sort_nodes_by_id(chakra_execution_trace_plus_data["nodes"])
 
-        self.write_dictionary_to_json_file(output_file, chakra_execution_trace_plus_data)
+        self.write_dictionary_to_json_file(output_file, chakra_execution_trace_plus_data, compress_threads)
         logging.debug(f"ET+ data dumped to {output_file}.")
@@ -1,12 +1,14 @@
 import argparse
 import re
+from typing import IO, Iterator
 
 import graphviz
 import networkx as nx
 
 from ...schema.protobuf.et_def_pb2 import GlobalMetadata, Node
+from ..et_io.block_gzip import open_et_file
+from ..et_io.string_table import StringTable
 from ..third_party.utils.protolib import decodeMessage as decode_message
-from ..third_party.utils.protolib import openFileRd as open_file_rd
 
 
 def escape_label(label: str) -> str:
@@ -25,6 +27,16 @@ def escape_label(label: str) -> str:
     return re.sub(f"([{special_chars}])", r"\\\1", label)
 
 
+def iter_nodes(et: IO[bytes]) -> Iterator[Node]:
+    """Decode the nodes following the global metadata, resolving interned node names if needed."""
+    node = Node()
+    gm = GlobalMetadata()
+    decode_message(et, gm)
+    string_table = StringTable.from_global_metadata(gm)
+    while decode_message(et, node):
+        yield node if string_table is None else string_table.resolve_node(node)
+
+
 def main() -> None:
     """Generate an output graph file in the specified format (PDF, DOT, or GraphML)."""
     parser = argparse.ArgumentParser(description="Execution Trace Visualizer")
@@ -40,15 +52,12 @@ def main() -> None:
     )
     args = parser.parse_args()
 
-    et = open_file_rd(args.input_filename)
-    node = Node()
-    gm = GlobalMetadata()
+    et = open_et_file(args.input_filename)
 
     # Determine the file type to be created based on the output filename
     if args.output_filename.endswith((".pdf", ".dot")):
         f = graphviz.Digraph()
-        decode_message(et, gm)
-        while decode_message(et, node):
+        for node in iter_nodes(et):
             escaped_label = escape_label(node.name)
             f.node(name=f"{node.id}", label=escaped_label, id=str(node.id), shape="record")
 
@@ -66,8 +75,7 @@ def main() -> None:
             f.render(args.output_filename.replace(".dot", ""), format="dot", cleanup=True)
     elif args.output_filename.endswith(".graphml"):
         G = nx.DiGraph()
-        decode_message(et, gm)
-        while decode_message(et, node):
+        for node in iter_nodes(et):
             G.add_node(node.id, label=node.name)
 
             # Handling data dependencies
@@ -0,0 +1,166 @@
+import gzip
+import random
+
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import GlobalMetadata
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.converter.pytorch_converter import PyTorchConverter
+from chakra.src.et_io.block_gzip import (
+    NO_SYNC,
+    BlockGzipReader,
+    BlockGzipWriter,
+    is_block_gzip,
+    iter_blocks,
+    open_et_file,
+)
+from chakra.src.et_io.et_index import IndexedEtReader
+from chakra.src.third_party.utils.protolib import DelimitedReader, DelimitedWriter, decodeMessage
+
+
+@pytest.fixture
+def records():
+    rng = random.Random(0)
+    return [bytes(rng.getrandbits(8) for _ in range(rng.randint(1, 40))) for _ in range(4000)]
+
+
+@pytest.fixture
+def block_gzip_path(tmp_path, records) -> str:
+    path = (tmp_path / "data.bgz").as_posix()
+    with BlockGzipWriter(path, block_size=16) as writer:
+        for record in records:
+            writer.write(record)
+    return path
+
+
+def test_readable_by_gzip(block_gzip_path: str, records) -> None:
+    with open(block_gzip_path, "rb") as f:
+        assert gzip.decompress(f.read()) == b"".join(records)
+    assert is_block_gzip(block_gzip_path)
+
+
+def test_seek_and_read(block_gzip_path: str, records) -> None:
+    data = b"".join(records)
+    rng = random.Random(1)
+    with BlockGzipReader(block_gzip_path) as reader:
+        assert reader.size == len(data)
+        # More blocks than fit in a single index member.
+        assert reader.num_blocks > 4095
+        assert reader.read() == data
+        for _ in range(200):
+            offset = rng.randrange(len(data))
+            size = rng.randrange(100)
+            reader.seek(offset)
+            assert reader.read(size) == data[offset : offset + size]
+            assert reader.tell() == min(offset + size, len(data))
+
+
+def test_sync_offsets(block_gzip_path: str, records) -> None:
+    record_starts = set()
+    offset = 0
+    for record in records:
+        record_starts.add(offset)
+        offset += len(record)
+    with BlockGzipReader(block_gzip_path) as reader:
+        for block_id, sync in enumerate(reader.sync_offsets):
+            block_start = block_id * reader.block_size
+            starts = [o for o in range(block_start, block_start + reader.block_size) if o in record_starts]
+            assert sync == (starts[0] if starts else NO_SYNC)
+
+
+def test_delimited_writer_syncs_every_block_starting_a_frame(tmp_path) -> None:
+    path = (tmp_path / "trace.bgz").as_posix()
+    nodes = [ChakraNode(id=nid, name="n" * (nid % 50)) for nid in range(1, 3001)]
+    # Every flush of the writer spans many blocks.
+    with BlockGzipWriter(path, block_size=64) as f, DelimitedWriter(f, buffer_size=4096) as writer:
+        writer.write(nodes[0])
+        writer.write_many(nodes[1:])
+
+    frame_starts = set()
+    with BlockGzipReader(path) as reader:
+        frames = DelimitedReader(reader)
+        while True:
+            offset = frames.tell()
+            if frames.read_frame() is None:
+                break
+            frame_starts.add(offset)
+        assert len(frame_starts) == len(nodes)
+        for block_id, sync in enumerate(reader.sync_offsets):
+            block_start = block_id * reader.block_size
+            starts = [o for o in range(block_start, block_start + reader.block_size) if o in frame_starts]
+            assert sync == (starts[0] if starts else NO_SYNC)
+        assert sum(sync != NO_SYNC for sync in reader.sync_offsets) > reader.num_blocks // 2
+
+
+def test_iter_blocks(block_gzip_path: str, records) -> None:
+    assert b"".join(iter_blocks(block_gzip_path, workers=2, blocks_per_task=100)) == b"".join(records)
+    with BlockGzipReader(block_gzip_path) as reader:
+        expected = b"".join(reader.read_block(block_id) for block_id in range(10, 20))
+    assert b"".join(iter_blocks(block_gzip_path, 10, 20, workers=2, blocks_per_task=3)) == expected
+
+
+def test_threaded_writer_matches_single_threaded(tmp_path, block_gzip_path: str, records) -> None:
+    path = (tmp_path / "threaded.bgz").as_posix()
+    with BlockGzipWriter(path, block_size=16, threads=4) as writer:
+        for record in records:
+            writer.write(record)
+    with open(path, "rb") as threaded, open(block_gzip_path, "rb") as single:
+        assert threaded.read() == single.read()
+
+
+def test_write_spanning_blocks(tmp_path) -> None:
+    path = (tmp_path / "large.bgz").as_posix()
+    data = bytes(random.Random(2).getrandbits(8) for _ in range(10000))
+    with BlockGzipWriter(path, block_size=1000, threads=3) as writer:
+        writer.write(b"head")
+        writer.write(data)
+    with open(path, "rb") as f:
+        assert gzip.decompress(f.read()) == b"head" + data
+    with BlockGzipReader(path) as reader:
+        assert list(reader.sync_offsets) == [0] + [NO_SYNC] * 10
+
+
+def test_plain_gzip_is_not_block_gzip(tmp_path) -> None:
+    path = (tmp_path / "plain.gz").as_posix()
+    with gzip.open(path, "wb") as f:
+        f.write(b"x" * 1000)
+    assert not is_block_gzip(path)
+    with pytest.raises(ValueError):
+        BlockGzipReader(path)
+
+
+def test_converter_block_gzip_output(tmp_path) -> None:
+    path = (tmp_path / "trace.et.gz").as_posix()
+    nodes = {nid: ChakraNode(id=nid, name=f"node{nid}", duration_micros=nid) for nid in range(1, 20001)}
+    metadata = {"schema": "1.0.2-chakra.0.0.4", "pid": 1, "time": "", "start_ts": 0, "finish_ts": 1}
+    PyTorchConverter().write_protobuf_execution_trace(path, metadata, nodes, write_index=True, block_gzip=True)
+
+    et = open_et_file(path)
+    assert isinstance(et, BlockGzipReader)
+    global_metadata = GlobalMetadata()
+    assert decodeMessage(et, global_metadata)
+    node = ChakraNode()
+    decoded = []
+    while decodeMessage(et, node):
+        decoded.append(node.id)
+    et.close()
+    assert decoded == list(nodes)
+
+    with IndexedEtReader(path) as reader:
+        assert reader.get_node(12345) == nodes[12345]
+
+
+def test_converter_compress_threads(tmp_path) -> None:
+    path = (tmp_path / "trace.et.gz").as_posix()
+    nodes = {nid: ChakraNode(id=nid, name=f"node{nid}") for nid in range(1, 20001)}
+    metadata = {"schema": "1.0.2-chakra.0.0.4", "pid": 1, "time": "", "start_ts": 0, "finish_ts": 1}
+    PyTorchConverter().write_protobuf_execution_trace(path, metadata, nodes, compress_threads=2)
+
+    assert is_block_gzip(path)
+    et = open_et_file(path)
+    assert decodeMessage(et, GlobalMetadata())
+    node = ChakraNode()
+    decoded = []
+    while decodeMessage(et, node):
+        decoded.append(node.id)
+    et.close()
+    assert decoded == list(nodes)
@@ -0,0 +1,101 @@
+import argparse
+from typing import Dict
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import COMM_COLL_NODE, COMP_NODE
+from chakra.schema.protobuf.et_def_pb2 import AttributeProto as ChakraAttr
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.converter.pytorch_converter import PyTorchConverter
+from chakra.src.et_io.columnar import build_columns, load_columns, main, save_columns
+
+JSON_METADATA = {
+    "schema": "1.0.2-chakra.0.0.4",
+    "pid": 1234,
+    "time": "2023-01-01 12:00:00",
+    "start_ts": 1000,
+    "finish_ts": 2000,
+}
+
+
+@pytest.fixture
+def sample_nodes() -> Dict[int, ChakraNode]:
+    nodes = {}
+    for nid in range(1, 51):
+        node = ChakraNode(
+            id=nid,
+            name=f"op{nid % 5}",
+            type=COMM_COLL_NODE if nid % 10 == 0 else COMP_NODE,
+            start_time_micros=nid * 10,
+            duration_micros=nid,
+        )
+        node.data_deps.extend(range(max(1, nid - 2), nid))
+        node.ctrl_deps.extend([nid - 1] if nid % 3 == 0 else [])
+        node.attr.append(ChakraAttr(name="stream", int64_val=nid % 4))
+        if nid % 10 == 0:
+            node.attr.extend(
+                [
+                    ChakraAttr(name="comm_type", int64_val=1),
+                    ChakraAttr(name="comm_size", int64_val=nid * 1024),
+                    ChakraAttr(name="pg_name", string_val=f"pg{nid % 20}"),
+                ]
+            )
+        nodes[nid] = node
+    return nodes
+
+
+@pytest.fixture
+def et_path(tmp_path, sample_nodes: Dict[int, ChakraNode]) -> str:
+    path = (tmp_path / "trace.et").as_posix()
+    PyTorchConverter().write_protobuf_execution_trace(path, JSON_METADATA, sample_nodes)
+    return path
+
+
+def check_columns(columns: Dict[str, np.ndarray], sample_nodes: Dict[int, ChakraNode]) -> None:
+    nodes = list(sample_nodes.values())
+    assert columns["id"].tolist() == [node.id for node in nodes]
+    assert columns["type"].tolist() == [node.type for node in nodes]
+    assert columns["start_time_micros"].tolist() == [node.start_time_micros for node in nodes]
+    assert columns["duration_micros"].tolist() == [node.duration_micros for node in nodes]
+    assert [columns["name_dict"][code] for code in columns["name"]] == [node.name for node in nodes]
+    for deps in ("data_deps", "ctrl_deps"):
+        indptr, indices = columns[f"{deps}_indptr"], columns[f"{deps}_indices"]
+        for i, node in enumerate(nodes):
+            assert indices[indptr[i] : indptr[i + 1]].tolist() == list(getattr(node, deps))
+    assert columns["attr.stream"].tolist() == [node.id % 4 for node in nodes]
+    assert columns["attr.stream_valid"].all()
+    assert columns["attr.comm_size_valid"].tolist() == [node.id % 10 == 0 for node in nodes]
+    assert columns["attr.comm_size"].tolist() == [node.id * 1024 if node.id % 10 == 0 else 0 for node in nodes]
+
+
+def test_build_columns(et_path: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    check_columns(build_columns(et_path), sample_nodes)
+
+
+def test_string_attr(et_path: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    columns = build_columns(et_path, ["pg_name"])
+    expected = [f"pg{node.id % 20}" if node.id % 10 == 0 else None for node in sample_nodes.values()]
+    decoded = [columns["attr.pg_name_dict"][code] if code >= 0 else None for code in columns["attr.pg_name"]]
+    assert decoded == expected
+    assert columns["attr.pg_name_valid"].tolist() == [value is not None for value in expected]
+
+
+@pytest.mark.parametrize("output", ["columns", "columns.npz"])
+def test_save_and_load(tmp_path, et_path: str, sample_nodes: Dict[int, ChakraNode], output: str) -> None:
+    output_path = (tmp_path / output).as_posix()
+    save_columns(build_columns(et_path), output_path)
+    columns = load_columns(output_path)
+    if not output.endswith(".npz"):
+        assert isinstance(columns["id"], np.memmap)
+    check_columns(columns, sample_nodes)
+
+
+def test_main(tmp_path, et_path: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    output_path = (tmp_path / "columns").as_posix()
+    args = argparse.Namespace(input_filename=et_path, output_path=output_path, attrs=["stream", "comm_size"])
+    with patch("argparse.ArgumentParser.parse_args", return_value=args):
+        main()
+    columns = load_columns(output_path)
+    assert "attr.comm_type" not in columns
+    check_columns(columns, sample_nodes)
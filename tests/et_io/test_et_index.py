@@ -0,0 +1,79 @@
+from typing import Dict
+
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.converter.pytorch_converter import PyTorchConverter
+from chakra.src.et_io.et_index import EtIndex, IndexedEtReader, build_index, get_index_path
+
+JSON_METADATA = {
+    "schema": "1.0.2-chakra.0.0.4",
+    "pid": 1234,
+    "time": "2023-01-01 12:00:00",
+    "start_ts": 1000,
+    "finish_ts": 2000,
+}
+
+
+@pytest.fixture
+def sample_nodes() -> Dict[int, ChakraNode]:
+    nodes = {}
+    for nid in range(10, 1010, 2):
+        node = ChakraNode(id=nid, name=f"node{nid}" * (nid % 13), duration_micros=nid)
+        node.data_deps.extend([nid - 2] if nid > 10 else [])
+        nodes[nid] = node
+    return nodes
+
+
+@pytest.fixture(params=["trace.et", "trace.et.gz"])
+def indexed_trace(request, tmp_path, sample_nodes: Dict[int, ChakraNode]) -> str:
+    et_path = (tmp_path / request.param).as_posix()
+    PyTorchConverter().write_protobuf_execution_trace(et_path, JSON_METADATA, sample_nodes, write_index=True)
+    return et_path
+
+
+def test_converter_index_matches_rebuilt_index(indexed_trace: str) -> None:
+    written = EtIndex.load(get_index_path(indexed_trace))
+    rebuilt = build_index(indexed_trace)
+    assert written.node_ids == rebuilt.node_ids
+    assert written.offsets == rebuilt.offsets
+    assert written.lengths == rebuilt.lengths
+    assert written.global_metadata_offset == rebuilt.global_metadata_offset == 0
+    assert written.global_metadata_length == rebuilt.global_metadata_length
+
+
+def test_get_node(indexed_trace: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    with IndexedEtReader(indexed_trace) as reader:
+        assert len(reader) == len(sample_nodes)
+        assert reader.get_global_metadata().attr[0].string_val == JSON_METADATA["schema"]
+        for nid in (998, 10, 500, 1008):
+            assert reader.get_node(nid) == sample_nodes[nid]
+        with pytest.raises(KeyError):
+            reader.get_node(11)
+
+
+def test_iter_range(indexed_trace: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    with IndexedEtReader(indexed_trace) as reader:
+        nodes = list(reader.iter_range(101, 301))
+        assert nodes == [sample_nodes[nid] for nid in range(102, 301, 2)]
+        assert list(reader.iter_range(2000, 3000)) == []
+
+
+def test_stale_index_is_rejected(indexed_trace: str) -> None:
+    with open(indexed_trace, "ab") as f:
+        f.write(b"\x00")
+    with pytest.raises(ValueError):
+        IndexedEtReader(indexed_trace)
+
+
+def test_index_sorts_and_rejects_duplicates(tmp_path) -> None:
+    index = EtIndex()
+    index.add_node(5, 100, 10)
+    index.add_node(3, 0, 100)
+    index.save((tmp_path / "a.idx").as_posix(), 110)
+    loaded = EtIndex.load((tmp_path / "a.idx").as_posix())
+    assert list(loaded.node_ids) == [3, 5]
+    assert list(loaded.offsets) == [0, 100]
+
+    index.add_node(3, 110, 10)
+    with pytest.raises(ValueError):
+        index.sort()
@@ -0,0 +1,86 @@
+import gzip
+import os
+from typing import Dict
+
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.converter.pytorch_converter import PyTorchConverter
+from chakra.src.et_io.et_index import get_index_path
+from chakra.src.et_io.mmap_reader import MmapEtReader
+
+JSON_METADATA = {
+    "schema": "1.0.2-chakra.0.0.4",
+    "pid": 1234,
+    "time": "2023-01-01 12:00:00",
+    "start_ts": 1000,
+    "finish_ts": 2000,
+}
+
+
+@pytest.fixture
+def sample_nodes() -> Dict[int, ChakraNode]:
+    nodes = {}
+    for nid in range(1, 301):
+        node = ChakraNode(id=nid, name=f"node{nid}" * (nid % 40), duration_micros=nid)
+        node.data_deps.extend([nid - 1] if nid > 1 else [])
+        nodes[nid] = node
+    return nodes
+
+
+@pytest.fixture
+def et_path(tmp_path, sample_nodes: Dict[int, ChakraNode]) -> str:
+    path = (tmp_path / "trace.et").as_posix()
+    PyTorchConverter().write_protobuf_execution_trace(path, JSON_METADATA, sample_nodes, write_index=True)
+    return path
+
+
+def test_iter_nodes(et_path: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    os.remove(get_index_path(et_path))
+    with MmapEtReader(et_path) as reader:
+        assert reader.index is None
+        assert reader.get_global_metadata().attr[0].string_val == JSON_METADATA["schema"]
+        assert list(reader) == list(sample_nodes.values())
+        with pytest.raises(ValueError):
+            reader.get_node(1)
+
+
+def test_random_access(et_path: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    with MmapEtReader(et_path) as reader:
+        for nid in (300, 1, 150):
+            assert reader.get_node(nid) == sample_nodes[nid]
+        with pytest.raises(KeyError):
+            reader.get_node(301)
+        assert list(reader.iter_range(100, 110)) == [sample_nodes[nid] for nid in range(100, 110)]
+
+
+def test_close_with_pending_iterator(et_path: str) -> None:
+    reader = MmapEtReader(et_path)
+    nodes = iter(reader)
+    next(nodes)
+    frame = next(reader.iter_frames())
+    reader.close()
+    del nodes
+    assert len(frame.tobytes()) == len(frame)
+
+
+def test_rejects_gzip(et_path: str) -> None:
+    gz_path = et_path + ".gz"
+    with open(et_path, "rb") as f, gzip.open(gz_path, "wb") as g:
+        g.write(f.read())
+    with pytest.raises(ValueError, match="gzip"):
+        MmapEtReader(gz_path)
+
+
+def test_truncated_trace(tmp_path, et_path: str) -> None:
+    truncated_path = (tmp_path / "truncated.et").as_posix()
+    with open(et_path, "rb") as f, open(truncated_path, "wb") as g:
+        g.write(f.read()[:-3])
+    with MmapEtReader(truncated_path) as reader, pytest.raises(IOError):
+        list(reader)
+
+
+def test_empty_trace(tmp_path) -> None:
+    path = (tmp_path / "empty.et").as_posix()
+    open(path, "wb").close()
+    with MmapEtReader(path) as reader:
+        assert list(reader) == []
@@ -0,0 +1,96 @@
+import os
+from typing import Dict, Iterator, List
+
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.converter.pytorch_converter import PyTorchConverter
+from chakra.src.et_io.block_gzip import is_block_gzip
+from chakra.src.et_io.et_index import get_index_path
+from chakra.src.et_io.parallel_reader import parallel_iter_nodes, parallel_map_reduce, plan_ranges
+
+JSON_METADATA = {
+    "schema": "1.0.2-chakra.0.0.4",
+    "pid": 1234,
+    "time": "2023-01-01 12:00:00",
+    "start_ts": 1000,
+    "finish_ts": 2000,
+}
+
+
+def sum_durations(nodes: Iterator[ChakraNode]) -> int:
+    return sum(node.duration_micros for node in nodes)
+
+
+def get_names(nodes: Iterator[ChakraNode]) -> List[str]:
+    return [node.name for node in nodes]
+
+
+def add(total: int, partial: int) -> int:
+    return total + partial
+
+
+@pytest.fixture
+def sample_nodes() -> Dict[int, ChakraNode]:
+    nodes = {}
+    for nid in range(1, 5001):
+        node = ChakraNode(id=nid, name=f"node{nid}" * (nid % 7 + 40), duration_micros=nid)
+        node.data_deps.extend([nid - 1] if nid > 1 else [])
+        nodes[nid] = node
+    return nodes
+
+
+@pytest.fixture(
+    params=[
+        ("trace.et", True, False),
+        ("trace.et", False, False),
+        ("trace.et.gz", True, False),
+        ("trace.et.gz", False, True),
+        ("trace.et.gz", True, True),
+    ],
+    ids=["plain-index", "plain", "gzip-index", "block-gzip", "block-gzip-index"],
+)
+def trace(request, tmp_path, sample_nodes: Dict[int, ChakraNode]) -> str:
+    filename, write_index, block_gzip = request.param
+    path = (tmp_path / filename).as_posix()
+    PyTorchConverter().write_protobuf_execution_trace(path, JSON_METADATA, sample_nodes, write_index, block_gzip)
+    return path
+
+
+@pytest.fixture(params=[("trace.et", True, False), ("trace.et.gz", False, False), ("trace.et.gz", False, True)])
+def interned_trace(request, tmp_path, sample_nodes: Dict[int, ChakraNode]) -> str:
+    filename, write_index, block_gzip = request.param
+    path = (tmp_path / filename).as_posix()
+    PyTorchConverter().write_protobuf_execution_trace(
+        path, JSON_METADATA, sample_nodes, write_index, block_gzip, intern_strings=True
+    )
+    return path
+
+
+def test_parallel_iter_nodes(trace: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    serialized = [frame for batch in parallel_iter_nodes(trace, workers=3, batch_bytes=4096) for frame in batch]
+    assert [ChakraNode.FromString(frame) for frame in serialized] == list(sample_nodes.values())
+
+
+def test_parallel_map_reduce(trace: str, sample_nodes: Dict[int, ChakraNode]) -> None:
+    assert parallel_map_reduce(trace, sum_durations, add, 0, workers=3) == sum(range(1, 5001))
+
+
+def test_parallel_iter_nodes_resolves_interned_strings(
+    interned_trace: str, sample_nodes: Dict[int, ChakraNode]
+) -> None:
+    serialized = [
+        frame for batch in parallel_iter_nodes(interned_trace, workers=3, batch_bytes=4096) for frame in batch
+    ]
+    assert [ChakraNode.FromString(frame) for frame in serialized] == list(sample_nodes.values())
+    names = [name for batch in parallel_iter_nodes(interned_trace, workers=3, map_fn=get_names) for name in batch]
+    assert names == [node.name for node in sample_nodes.values()]
+
+
+def test_plan_ranges(trace: str) -> None:
+    ranges = plan_ranges(trace, 12)
+    # Plain gzip traces and uncompressed traces without an index cannot be split.
+    if not is_block_gzip(trace) and not (trace.endswith(".et") and os.path.exists(get_index_path(trace))):
+        assert ranges is None
+        return
+    assert ranges is not None and len(ranges) > 1
+    assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
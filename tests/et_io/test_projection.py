@@ -0,0 +1,77 @@
+from typing import List
+
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import COMM_COLL_NODE, COMP_NODE
+from chakra.schema.protobuf.et_def_pb2 import AttributeProto as ChakraAttr
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.converter.pytorch_converter import PyTorchConverter
+from chakra.src.et_io.projection import NodeProjection, iter_projected_nodes
+
+
+@pytest.fixture
+def sample_nodes() -> List[ChakraNode]:
+    nodes = []
+    for nid in range(1, 101):
+        node = ChakraNode(
+            id=nid,
+            name=f"node{nid}",
+            type=COMM_COLL_NODE if nid % 10 == 0 else COMP_NODE,
+            duration_micros=nid * 3,
+            start_time_micros=nid * 10,
+        )
+        node.data_deps.extend(range(max(1, nid - 3), nid))
+        node.ctrl_deps.extend([nid - 1] if nid > 1 else [])
+        node.inputs.values = str(list(range(nid)))
+        node.attr.extend([ChakraAttr(name="rf_id", int64_val=nid), ChakraAttr(name="op_schema", string_val="x" * nid)])
+        nodes.append(node)
+    return nodes
+
+
+def test_default_projection(sample_nodes: List[ChakraNode]) -> None:
+    projection = NodeProjection()
+    records = list(projection.decode_frames(node.SerializeToString() for node in sample_nodes))
+    assert [record._asdict() for record in records] == [
+        {"id": node.id, "type": node.type, "data_deps": list(node.data_deps), "duration_micros": node.duration_micros}
+        for node in sample_nodes
+    ]
+
+
+def test_message_fields(sample_nodes: List[ChakraNode]) -> None:
+    projection = NodeProjection(["attr", "inputs", "id"])
+    records = list(projection.decode_frames(node.SerializeToString() for node in sample_nodes))
+    for node, record in zip(sample_nodes, records):
+        assert record.id == node.id
+        assert record.inputs == node.inputs
+        assert list(record.attr) == list(node.attr)
+
+
+def test_single_field(sample_nodes: List[ChakraNode]) -> None:
+    record = NodeProjection(["start_time_micros"]).decode(sample_nodes[4].SerializeToString())
+    assert record == (50,)
+    assert record.start_time_micros == 50
+
+
+def test_invalid_projection() -> None:
+    with pytest.raises(ValueError):
+        NodeProjection(["id", "bogus"])
+    with pytest.raises(ValueError):
+        NodeProjection(["id", "id"])
+
+
+def test_iter_projected_nodes(tmp_path, sample_nodes: List[ChakraNode]) -> None:
+    path = (tmp_path / "trace.et.gz").as_posix()
+    metadata = {"schema": "1.0.2-chakra.0.0.4", "pid": 1, "time": "", "start_ts": 0, "finish_ts": 1}
+    PyTorchConverter().write_protobuf_execution_trace(path, metadata, {node.id: node for node in sample_nodes})
+    records = list(iter_projected_nodes(path, ["id", "ctrl_deps"]))
+    assert records == [(node.id, list(node.ctrl_deps)) for node in sample_nodes]
+
+
+def test_iter_projected_nodes_resolves_interned_strings(tmp_path, sample_nodes: List[ChakraNode]) -> None:
+    path = (tmp_path / "trace.et").as_posix()
+    metadata = {"schema": "1.0.2-chakra.0.0.4", "pid": 1, "time": "", "start_ts": 0, "finish_ts": 1}
+    nodes = {node.id: node for node in sample_nodes}
+    PyTorchConverter().write_protobuf_execution_trace(path, metadata, nodes, intern_strings=True)
+
+    assert list(iter_projected_nodes(path, ["id", "name"])) == [(node.id, node.name) for node in sample_nodes]
+    records = list(iter_projected_nodes(path, ["attr"]))
+    assert [list(record.attr) for record in records] == [list(node.attr) for node in sample_nodes]
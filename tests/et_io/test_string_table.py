@@ -0,0 +1,104 @@
+import os
+from typing import Dict
+
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import AttributeProto as ChakraAttr
+from chakra.schema.protobuf.et_def_pb2 import GlobalMetadata
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.converter.pytorch_converter import PyTorchConverter
+from chakra.src.et_io.columnar import build_columns
+from chakra.src.et_io.et_index import IndexedEtReader
+from chakra.src.et_io.mmap_reader import MmapEtReader
+from chakra.src.et_io.string_table import NAME_REF_ATTR, OP_SCHEMA_REF_ATTR, StringTable
+from chakra.src.third_party.utils.protolib import decodeMessage, openFileRd
+
+JSON_METADATA = {
+    "schema": "1.0.2-chakra.0.0.4",
+    "pid": 1234,
+    "time": "2023-01-01 12:00:00",
+    "start_ts": 1000,
+    "finish_ts": 2000,
+}
+
+SCHEMAS = [
+    "aten::mm(Tensor self, Tensor mat2) -> Tensor",
+    "aten::add.Tensor(Tensor self, Tensor other, *, Scalar alpha=1) -> Tensor",
+    "",
+]
+
+
+@pytest.fixture
+def sample_nodes() -> Dict[int, ChakraNode]:
+    nodes = {}
+    for nid in range(1, 501):
+        node = ChakraNode(id=nid, name=f"aten::op{nid % 7}", duration_micros=nid)
+        node.attr.extend(
+            [
+                ChakraAttr(name="rf_id", int64_val=nid),
+                ChakraAttr(name="op_schema", string_val=SCHEMAS[nid % 3]),
+                ChakraAttr(name="is_cpu_op", bool_val=True),
+            ]
+        )
+        nodes[nid] = node
+    return nodes
+
+
+def write_trace(path: str, nodes: Dict[int, ChakraNode], intern_strings: bool) -> None:
+    PyTorchConverter().write_protobuf_execution_trace(
+        path, JSON_METADATA, nodes, write_index=True, intern_strings=intern_strings
+    )
+
+
+def test_intern_and_resolve_node(sample_nodes: Dict[int, ChakraNode]) -> None:
+    table = StringTable()
+    node = ChakraNode()
+    node.CopyFrom(sample_nodes[5])
+    table.intern_node(node)
+    assert table.strings == [SCHEMAS[2], "aten::op5"]
+    assert node.name == ""
+    assert [attr.name for attr in node.attr] == ["rf_id", OP_SCHEMA_REF_ATTR, "is_cpu_op", NAME_REF_ATTR]
+    assert table.resolve_node(node) == sample_nodes[5]
+    assert table.resolve_node(node) == sample_nodes[5]
+
+
+def test_global_metadata_round_trip(sample_nodes: Dict[int, ChakraNode]) -> None:
+    table = StringTable(SCHEMAS)
+    loaded = StringTable.from_global_metadata(GlobalMetadata(attr=[table.to_attr()]))
+    assert loaded is not None
+    assert loaded.strings == table.strings
+    assert loaded.intern(SCHEMAS[0]) == table.intern(SCHEMAS[0])
+    assert StringTable.from_global_metadata(GlobalMetadata(version="1")) is None
+
+
+def test_converter_interned_output(tmp_path, sample_nodes: Dict[int, ChakraNode]) -> None:
+    plain_path = (tmp_path / "plain.et").as_posix()
+    interned_path = (tmp_path / "interned.et").as_posix()
+    write_trace(plain_path, sample_nodes, intern_strings=False)
+    write_trace(interned_path, sample_nodes, intern_strings=True)
+    assert os.path.getsize(interned_path) < 0.7 * os.path.getsize(plain_path)
+    # The in-memory nodes are left unchanged.
+    assert sample_nodes[3].name == "aten::op3"
+
+    et = openFileRd(interned_path)
+    global_metadata = GlobalMetadata()
+    assert decodeMessage(et, global_metadata)
+    node = ChakraNode()
+    assert decodeMessage(et, node)
+    et.close()
+    assert node.name == ""
+    assert StringTable.from_global_metadata(global_metadata) is not None
+
+    with IndexedEtReader(interned_path) as reader:
+        assert reader.get_node(42) == sample_nodes[42]
+        assert list(reader.iter_range(1, 501)) == list(sample_nodes.values())
+    with MmapEtReader(interned_path) as reader:
+        assert list(reader) == list(sample_nodes.values())
+        assert reader.get_node(7) == sample_nodes[7]
+
+
+def test_columnar_resolves_names(tmp_path, sample_nodes: Dict[int, ChakraNode]) -> None:
+    path = (tmp_path / "interned.et").as_posix()
+    write_trace(path, sample_nodes, intern_strings=True)
+    columns = build_columns(path, attrs=())
+    names = columns["name_dict"][columns["name"]]
+    assert list(names) == [node.name for node in sample_nodes.values()]
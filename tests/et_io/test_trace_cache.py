@@ -0,0 +1,142 @@
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from chakra.src.et_io.trace_cache import TraceCache, detach_output, generate_cached
+
+
+@pytest.fixture
+def cache(tmp_path) -> TraceCache:
+    return TraceCache((tmp_path / "cache").as_posix())
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    host, device = tmp_path / "host.json", tmp_path / "device.json"
+    host.write_bytes(b'{"nodes": []}')
+    device.write_bytes(b'{"traceEvents": []}')
+    return [host.as_posix(), device.as_posix()]
+
+
+def make_generator(output_file, contents):
+    def generate():
+        with open(output_file, "wb") as f:
+            f.write(contents)
+
+    return MagicMock(side_effect=generate)
+
+
+def test_key_depends_on_contents_and_options(cache, inputs, tmp_path):
+    key = cache.make_key("link", inputs, {"compress": False})
+    moved = tmp_path / "moved.json"
+    os.rename(inputs[0], moved)
+
+    assert cache.make_key("link", [moved.as_posix(), inputs[1]], {"compress": False}) == key
+    assert cache.make_key("link", [moved.as_posix(), inputs[1]], {"compress": True}) != key
+    assert cache.make_key("convert", [moved.as_posix(), inputs[1]], {"compress": False}) != key
+    moved.write_bytes(b'{"nodes": [1]}')
+    assert cache.make_key("link", [moved.as_posix(), inputs[1]], {"compress": False}) != key
+
+
+def test_hit_places_hard_link(cache, inputs, tmp_path):
+    output = (tmp_path / "linked.json").as_posix()
+    generate = make_generator(output, b"linked")
+
+    assert not generate_cached(cache, "link", inputs, {}, output, generate)
+    assert generate.call_count == 1
+    assert generate_cached(cache, "link", inputs, {}, output, generate)
+    assert generate.call_count == 1
+
+    os.remove(output)
+    assert generate_cached(cache, "link", inputs, {}, output, generate)
+    assert generate.call_count == 1
+    assert os.path.samefile(output, cache.entry_path(cache.make_key("link", inputs, {})))
+
+
+def test_miss_removes_stale_output_without_changing_entry(cache, inputs, tmp_path):
+    output = (tmp_path / "linked.json").as_posix()
+    generate_cached(cache, "link", inputs, {}, output, make_generator(output, b"old"))
+    old_entry = cache.entry_path(cache.make_key("link", inputs, {}))
+
+    with open(inputs[1], "wb") as f:
+        f.write(b'{"traceEvents": [{}]}')
+    assert not generate_cached(cache, "link", inputs, {}, output, make_generator(output, b"new"))
+
+    assert old_entry.read_bytes() == b"old"
+    with open(output, "rb") as f:
+        assert f.read() == b"new"
+
+
+def test_output_rewritten_in_place_after_store(cache, inputs, tmp_path):
+    output = (tmp_path / "linked.json").as_posix()
+    generate_cached(cache, "link", inputs, {"compress": False}, output, make_generator(output, b"linked"))
+    with open(output, "wb") as f:
+        f.write(b"other")
+
+    assert generate_cached(cache, "link", inputs, {"compress": False}, output, make_generator(output, b"unused"))
+    with open(output, "rb") as f:
+        assert f.read() == b"linked"
+
+
+def test_uncached_rerun_after_hit(cache, inputs, tmp_path):
+    output = (tmp_path / "linked.json").as_posix()
+    entry = cache.entry_path(cache.make_key("link", inputs, {}))
+    generate_cached(cache, "link", inputs, {}, output, make_generator(output, b"linked"))
+    assert generate_cached(cache, "link", inputs, {}, output, make_generator(output, b"unused"))
+    assert os.path.samefile(output, entry)
+
+    generate = make_generator(output, b"uncached")
+    assert not generate_cached(None, "link", inputs, {}, output, generate)
+    assert generate.call_count == 1
+    with open(output, "rb") as f:
+        assert f.read() == b"uncached"
+    assert entry.read_bytes() == b"linked"
+
+    assert generate_cached(cache, "link", inputs, {}, output, make_generator(output, b"unused"))
+    with open(output, "rb") as f:
+        assert f.read() == b"linked"
+
+
+def test_detach_output(tmp_path):
+    entry, output = tmp_path / "entry", tmp_path / "output"
+    entry.write_bytes(b"cached")
+    os.link(entry, output)
+    detach_output(output.as_posix())
+    assert not output.exists()
+    assert entry.read_bytes() == b"cached"
+    detach_output(output.as_posix())
+
+
+def test_copies_across_file_systems(cache, inputs, tmp_path):
+    output = (tmp_path / "linked.json").as_posix()
+    with patch("os.link", side_effect=OSError):
+        generate_cached(cache, "link", inputs, {}, output, make_generator(output, b"linked"))
+        os.remove(output)
+        assert generate_cached(cache, "link", inputs, {}, output, make_generator(output, b"other"))
+    with open(output, "rb") as f:
+        assert f.read() == b"linked"
+    assert not os.path.samefile(output, cache.entry_path(cache.make_key("link", inputs, {})))
+
+
+def test_evicts_least_recently_used(tmp_path, inputs):
+    cache = TraceCache((tmp_path / "cache").as_posix(), max_bytes=25)
+    outputs = [(tmp_path / f"out{i}").as_posix() for i in range(3)]
+    keys = [cache.make_key("link", inputs, {"i": i}) for i in range(3)]
+    for i in range(2):
+        generate_cached(cache, "link", inputs, {"i": i}, outputs[i], make_generator(outputs[i], b"x" * 10))
+        os.utime(cache.entry_path(keys[i]), (i, i))
+    # A hit makes the first entry the most recently used one.
+    assert cache.fetch(keys[0], outputs[0])
+
+    generate_cached(cache, "link", inputs, {"i": 2}, outputs[2], make_generator(outputs[2], b"x" * 10))
+
+    assert [cache.entry_path(key).exists() for key in keys] == [True, False, True]
+    assert os.path.exists(outputs[1])
+
+
+def test_without_cache_always_generates(inputs, tmp_path):
+    output = (tmp_path / "linked.json").as_posix()
+    generate = make_generator(output, b"linked")
+    assert not generate_cached(None, "link", inputs, {}, output, generate)
+    assert not generate_cached(None, "link", inputs, {}, output, generate)
+    assert generate.call_count == 2
@@ -9,15 +9,15 @@ from chakra.src.jsonizer.jsonizer import main
 from google.protobuf.json_format import MessageToDict
 
 
-@patch("chakra.src.jsonizer.jsonizer.open_file_rd")
+@patch("chakra.src.jsonizer.jsonizer.open_et_file")
 @patch("chakra.src.jsonizer.jsonizer.decode_message")
 @patch("builtins.open", new_callable=mock_open)
-def test_main(mock_file_open, mock_decode_message, mock_open_file_rd) -> None:
+def test_main(mock_file_open, mock_decode_message, mock_open_et_file) -> None:
     """
     Tests the main function for converting Chakra execution trace to JSON format.
     """
     with tempfile.NamedTemporaryFile(suffix=".json") as temp_output:
-        args = argparse.Namespace(input_filename="input_file", output_filename=temp_output.name)
+        args = argparse.Namespace(input_filename="input_file", output_filename=temp_output.name, num_workers=1)
         mock_node = ChakraNode()
         mock_global_metadata = GlobalMetadata()
         mock_json_data = orjson.dumps(
@@ -29,7 +29,7 @@ def test_main(mock_file_open, mock_decode_message, mock_open_file_rd) -> None:
         with patch("argparse.ArgumentParser.parse_args", return_value=args):
             main()
 
-        mock_open_file_rd.assert_called_with("input_file")
+        mock_open_et_file.assert_called_with("input_file")
         mock_decode_message.assert_called()
         mock_file_open.assert_called_with(temp_output.name, "wb")
         mock_file_open().write.assert_any_call(mock_json_data)
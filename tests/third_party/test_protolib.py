@@ -0,0 +1,102 @@
+import gzip
+import io
+from typing import List
+
+import pytest
+from chakra.schema.protobuf.et_def_pb2 import GlobalMetadata
+from chakra.schema.protobuf.et_def_pb2 import Node as ChakraNode
+from chakra.src.third_party.utils.protolib import (
+    DelimitedReader,
+    DelimitedWriter,
+    _EncodeVarint32,
+    decodeMessage,
+    encodeMessage,
+    openFileRd,
+)
+
+
+@pytest.fixture
+def sample_nodes() -> List[ChakraNode]:
+    return [ChakraNode(id=i, name="node" * (i % 50), data_deps=list(range(i % 7))) for i in range(1, 500)]
+
+
+def encode_trace(nodes: List[ChakraNode]) -> bytes:
+    out = io.BytesIO()
+    encodeMessage(out, GlobalMetadata(version="0.0.4"))
+    for node in nodes:
+        encodeMessage(out, node)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 64, 1 << 20])
+def test_delimited_reader_chunk_boundaries(sample_nodes: List[ChakraNode], chunk_size: int) -> None:
+    reader = DelimitedReader(io.BytesIO(encode_trace(sample_nodes)), chunk_size=chunk_size)
+    global_metadata = GlobalMetadata()
+    assert reader.decode(global_metadata)
+    assert global_metadata.version == "0.0.4"
+
+    decoded = []
+    for frame in reader:
+        assert isinstance(frame, memoryview)
+        node = ChakraNode()
+        node.ParseFromString(frame)
+        decoded.append(node)
+    assert decoded == sample_nodes
+
+
+def test_delimited_reader_truncated_message(sample_nodes: List[ChakraNode]) -> None:
+    reader = DelimitedReader(io.BytesIO(encode_trace(sample_nodes)[:-1]))
+    with pytest.raises(IOError):
+        list(reader)
+
+
+def test_decode_message_compatibility(tmp_path, sample_nodes: List[ChakraNode]) -> None:
+    trace_path = tmp_path / "trace.et.gz"
+    with gzip.open(trace_path, "wb") as f:
+        f.write(encode_trace(sample_nodes))
+
+    trace = openFileRd(trace_path.as_posix())
+    global_metadata = GlobalMetadata()
+    assert decodeMessage(trace, global_metadata)
+    node = ChakraNode()
+    count = 0
+    while decodeMessage(trace, node):
+        assert node == sample_nodes[count]
+        count += 1
+    trace.close()
+    assert count == len(sample_nodes)
+
+
+def encode_per_byte(nodes: List[ChakraNode]) -> bytes:
+    out = io.BytesIO()
+    for node in nodes:
+        serialized = node.SerializeToString()
+        _EncodeVarint32(out, len(serialized))
+        out.write(serialized)
+    return out.getvalue()
+
+
+def test_encode_message_matches_per_byte_encoding(sample_nodes: List[ChakraNode]) -> None:
+    out = io.BytesIO()
+    for node in sample_nodes:
+        encodeMessage(out, node)
+    assert out.getvalue() == encode_per_byte(sample_nodes)
+
+
+@pytest.mark.parametrize("buffer_size", [1, 100, 1 << 20])
+def test_delimited_writer_byte_identical(sample_nodes: List[ChakraNode], buffer_size: int) -> None:
+    out = io.BytesIO()
+    with DelimitedWriter(out, buffer_size=buffer_size) as writer:
+        writer.write(sample_nodes[0])
+        encodeMessage(writer, sample_nodes[1])
+        writer.write_many(sample_nodes[2:])
+    assert out.getvalue() == encode_per_byte(sample_nodes)
+
+
+def test_delimited_writer_buffers_until_flush(sample_nodes: List[ChakraNode]) -> None:
+    out = io.BytesIO()
+    writer = DelimitedWriter(out)
+    writer.write_many(sample_nodes)
+    assert out.getvalue() == b""
+    writer.flush()
+    assert out.getvalue() == encode_per_byte(sample_nodes)
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+from chakra.src.trace_link.annotation_merge import insert_annotations, merge_sorted_annotations
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+from chakra.src.trace_link.trace_linker import TraceLinker
+
+
+def make_annotation(timestamp):
+    return KinetoOperator({"name": "annotation", "ts": timestamp})
+
+
+def insert_one_by_one(ops, process_annotation_op, thread_annotation_ops):
+    """Reference insertion with a search and a list.insert per annotation."""
+    ops = [process_annotation_op, *ops]
+    for tid, annotation in thread_annotation_ops:
+        position = next(
+            (i for i, op in enumerate(ops) if op.tid == tid and op.timestamp >= annotation.timestamp),
+            None,
+        )
+        if position is not None:
+            ops.insert(position, annotation)
+        else:
+            ops.append(annotation)
+    return ops
+
+
+def make_case(seed, presorted):
+    rng = random.Random(seed)
+    ops = [
+        KinetoOperator({"cat": "cpu_op", "ts": rng.randint(0, 30), "tid": rng.choice([0, 1, 2, 3])})
+        for _ in range(rng.randint(0, 40))
+    ]
+    if presorted:
+        ops.sort(key=lambda op: op.timestamp)
+    tids = rng.sample([0, 1, 2, 3, 4], rng.randint(0, 5))
+    thread_info = {tid: (rng.randint(0, 30), 40) for tid in tids}
+    return ops, thread_info
+
+
+def test_insert_annotations():
+    ops = [KinetoOperator({"ts": ts, "tid": tid}) for ts, tid in [(10, 1), (20, 2), (30, 1), (40, 2)]]
+    process_annotation_op = make_annotation(5)
+    thread_1, thread_2, thread_3 = make_annotation(25), make_annotation(5), make_annotation(5)
+
+    annotated, anchored = insert_annotations(ops, process_annotation_op, [(1, thread_1), (2, thread_2), (3, thread_3)])
+
+    assert annotated == [process_annotation_op, ops[0], thread_2, ops[1], thread_1, ops[2], ops[3], thread_3]
+    assert anchored == [(process_annotation_op, 0), (thread_2, 1), (thread_1, 2), (thread_3, 4)]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_insert_annotations_matches_one_by_one(seed):
+    ops, thread_info = make_case(seed, presorted=seed % 2 == 0)
+    process_annotation_op = make_annotation(random.Random(seed).randint(0, 30))
+    thread_annotation_ops = [(tid, make_annotation(start)) for tid, (start, _) in thread_info.items()]
+
+    annotated, anchored = insert_annotations(ops, process_annotation_op, thread_annotation_ops)
+
+    assert annotated == insert_one_by_one(ops, process_annotation_op, thread_annotation_ops)
+    annotations = {id(annotation) for annotation, _ in anchored}
+    assert [op for op in annotated if id(op) in annotations] == [annotation for annotation, _ in anchored]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_merge_sorted_annotations_matches_stable_sort(seed):
+    ops, thread_info = make_case(seed, presorted=True)
+    process_annotation_op = make_annotation(random.Random(seed).randint(0, 30))
+    thread_annotation_ops = [(tid, make_annotation(start)) for tid, (start, _) in thread_info.items()]
+    annotated, anchored = insert_annotations(ops, process_annotation_op, thread_annotation_ops)
+
+    merged, merged_ts = merge_sorted_annotations(ops, [op.timestamp for op in ops], anchored)
+
+    expected = sorted(annotated, key=lambda op: op.timestamp)
+    assert merged == expected
+    assert merged_ts == [op.timestamp for op in expected]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_add_thread_and_process_annotations_matches_sort(seed):
+    ops, thread_info = make_case(seed, presorted=seed % 2 == 0)
+    kineto_cpu_ops, sorted_ops, sorted_ts = TraceLinker().add_thread_and_process_annotations(
+        list(ops), [], [], thread_info, 0, 40
+    )
+
+    assert sorted_ops == sorted(kineto_cpu_ops, key=lambda op: op.timestamp)
+    assert sorted_ts == [op.timestamp for op in sorted_ops]
+    assert len(kineto_cpu_ops) == len(ops) + len(thread_info) + 1
@@ -1,6 +1,10 @@
+import json
+import random
+
 import pytest
 from chakra.src.trace_link.chakra_device_trace_loader import ChakraDeviceTraceLoader
 from chakra.src.trace_link.kineto_operator import KinetoOperator
+from chakra.src.trace_link.sorted_views import SortedViews
 
 
 @pytest.fixture
@@ -29,14 +33,26 @@ def trace_loader():
         ),
     ],
 )
-def test_calculate_exclusive_dur(trace_loader, kineto_ops, expected_exclusive_durs):
+@pytest.mark.parametrize("method", ["calculate_exclusive_dur", "calculate_exclusive_dur_sweep"])
+def test_calculate_exclusive_dur(trace_loader, kineto_ops, expected_exclusive_durs, method):
     kineto_tid_cpu_ops_map = {1: [KinetoOperator(op) for op in kineto_ops]}
-    trace_loader.calculate_exclusive_dur(kineto_tid_cpu_ops_map)
+    getattr(trace_loader, method)(kineto_tid_cpu_ops_map)
 
     for i, op in enumerate(kineto_tid_cpu_ops_map[1]):
         assert op.exclusive_dur == expected_exclusive_durs[i]
 
 
+@pytest.mark.parametrize("seed", range(20))
+def test_exclusive_dur_sweep_matches_per_op_scan(trace_loader, seed):
+    # Ties, zero durations, and partially overlapping operators exercise the fallback for unnested operators.
+    rng = random.Random(seed)
+    ops = [KinetoOperator({"ts": rng.randint(0, 60) / 2, "dur": rng.randint(0, 20) / 2}) for _ in range(80)]
+    trace_loader.sorted_kineto_ops[1] = sorted(ops, key=lambda op: (op.timestamp, op.inclusive_dur))
+
+    expected = [trace_loader.get_exclusive_dur_for_op((1, i)) for i in range(len(ops))]
+    assert trace_loader.get_exclusive_durs_for_thread(1) == expected
+
+
 @pytest.mark.parametrize(
     "intervals, expected_result",
     [
@@ -50,3 +66,43 @@ def test_calculate_exclusive_dur(trace_loader, kineto_ops, expected_exclusive_du
 def test_merge_overlapping_intervals(intervals, expected_result):
     result = ChakraDeviceTraceLoader.merge_overlapping_intervals(intervals)
     assert result == expected_result
+
+
+def test_calculate_exclusive_dur_matches_sweep(trace_loader):
+    rng = random.Random(0)
+    events = [{"ts": rng.randint(0, 400) / 4, "dur": rng.randint(0, 80) / 4} for _ in range(3000)]
+    pooled_ops = {1: [KinetoOperator(event) for event in events]}
+    swept_ops = {1: [KinetoOperator(event) for event in events]}
+
+    trace_loader.calculate_exclusive_dur(pooled_ops)
+    ChakraDeviceTraceLoader().calculate_exclusive_dur_sweep(swept_ops)
+    assert [op.exclusive_dur for op in pooled_ops[1]] == [op.exclusive_dur for op in swept_ops[1]]
+
+
+def test_exclusive_dur_with_sorted_views_matches_sorting(trace_loader):
+    rng = random.Random(0)
+    ops = sorted(
+        (KinetoOperator({"ts": rng.randint(0, 100), "dur": rng.randint(0, 20), "tid": 1}) for _ in range(300)),
+        key=lambda op: op.timestamp,
+    )
+    sorted_views = SortedViews(ops, {1: ops})
+    trace_loader.calculate_exclusive_dur_sweep({1: ops}, sorted_views)
+
+    expected_ops = [KinetoOperator({"ts": op.timestamp, "dur": op.inclusive_dur}) for op in ops]
+    ChakraDeviceTraceLoader().calculate_exclusive_dur_sweep({1: expected_ops})
+    assert trace_loader.sorted_kineto_ops[1] is sorted_views.ops_by_start_and_dur(1)
+    assert [op.exclusive_dur for op in ops] == [op.exclusive_dur for op in expected_ops]
+
+
+def test_load_with_exclusive_dur_workers(tmp_path):
+    rng = random.Random(0)
+    events = [
+        {"ph": "X", "cat": "cpu_op", "name": "aten::op", "ts": rng.randint(0, 400), "dur": rng.randint(0, 80), "tid": 1}
+        for _ in range(500)
+    ]
+    trace_file = tmp_path / "kineto.json"
+    trace_file.write_text(json.dumps({"traceEvents": events}))
+
+    swept_ops = ChakraDeviceTraceLoader().load(str(trace_file))[0]
+    pooled_ops = ChakraDeviceTraceLoader(exclusive_dur_workers=2).load(str(trace_file))[0]
+    assert [op.exclusive_dur for op in pooled_ops] == [op.exclusive_dur for op in swept_ops]
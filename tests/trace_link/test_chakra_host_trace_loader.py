@@ -1,17 +1,19 @@
+import gzip
+import json
 from unittest.mock import MagicMock
 
 import pytest
 from chakra.src.trace_link.chakra_host_trace_loader import ChakraHostTraceLoader
-from et_replay.execution_trace import Node as PyTorchOperator
 
 
 @pytest.fixture
 def mock_trace():
-    """Fixture to create a mock trace with a specific structure."""
+    """Fixture to create a mock trace with a specific structure, which requires et_replay."""
+    execution_trace = pytest.importorskip("et_replay.execution_trace")
     # Create a mock trace node structure
-    root_node = MagicMock(spec=PyTorchOperator)
-    child_node1 = MagicMock(spec=PyTorchOperator)
-    child_node2 = MagicMock(spec=PyTorchOperator)
+    root_node = MagicMock(spec=execution_trace.Node)
+    child_node1 = MagicMock(spec=execution_trace.Node)
+    child_node2 = MagicMock(spec=execution_trace.Node)
 
     # Setup mock hierarchy
     root_node.children = [child_node1, child_node2]
@@ -43,3 +45,28 @@ def test_extract_chakra_host_ops(loader, mock_trace):
     assert result[0].id == 1
     assert result[1].id == 2
     assert result[2].id == 3
+
+
+@pytest.mark.parametrize("file_name", ["host_trace.json", "host_trace.json.gz"])
+def test_load_parses_once(loader, tmp_path, file_name):
+    """Test that load keeps the parsed data the operators were extracted from."""
+    data = {
+        "schema": "1.0.2-chakra.0.0.4",
+        "nodes": [
+            {"id": 3, "name": "aten::mm", "ctrl_deps": 1, "attrs": [{"name": "rf_id", "type": "uint64", "value": 7}]},
+            {"id": 1, "name": "root", "ctrl_deps": 0, "attrs": []},
+            {"id": 2, "name": "aten::add", "ctrl_deps": 1, "attrs": [{"name": "rf_id", "type": "uint64", "value": 5}]},
+        ],
+    }
+    trace_file = (tmp_path / file_name).as_posix()
+    with gzip.open(trace_file, "wt") if file_name.endswith("gz") else open(trace_file, "w") as f:
+        json.dump(data, f)
+
+    host_trace = loader.load(trace_file)
+
+    assert host_trace.data == data
+    assert [(op.id, op.rf_id, op.name) for op in host_trace.ops] == [
+        (1, None, "root"),
+        (2, 5, "aten::add"),
+        (3, 7, "aten::mm"),
+    ]
@@ -0,0 +1,64 @@
+import random
+from unittest.mock import MagicMock
+
+import pytest
+from chakra.src.trace_link.cpu_timeline_index import CpuTimelineIndex
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+
+
+def make_op(timestamp, category="cpu_op", rf_id=None):
+    return MagicMock(spec=KinetoOperator, timestamp=timestamp, category=category, rf_id=rf_id)
+
+
+def scan_last_before(ops_by_tid, exclude_tid, timestamp):
+    """Reference linear scan over every other thread."""
+    last_cpu_node = None
+    latest_timestamp = 0
+    for tid, ops in ops_by_tid.items():
+        if tid != exclude_tid:
+            for op in sorted(ops, key=lambda op: op.timestamp):
+                if op.category in ["cpu_op", "user_annotation"] and latest_timestamp < op.timestamp < timestamp:
+                    last_cpu_node = op
+                    latest_timestamp = op.timestamp
+    return last_cpu_node
+
+
+def test_excludes_thread():
+    ops_by_tid = {
+        1: [make_op(100, rf_id=1), make_op(300, rf_id=2)],
+        2: [make_op(150, rf_id=3), make_op(200, category="cuda_runtime", rf_id=4)],
+    }
+    index = CpuTimelineIndex(ops_by_tid)
+    assert index.find_last_before(1, 400).rf_id == 3
+    assert index.find_last_before(2, 400).rf_id == 2
+    assert index.find_last_before(3, 250).rf_id == 3
+    assert index.find_last_before(2, 100) is None
+
+
+def test_ties_prefer_first_thread_and_first_op():
+    ops_by_tid = {
+        1: [make_op(100, rf_id=1)],
+        2: [make_op(100, category="user_annotation", rf_id=2), make_op(100, rf_id=3)],
+        3: [make_op(100, rf_id=4)],
+    }
+    index = CpuTimelineIndex(ops_by_tid)
+    assert index.find_last_before(0, 101).rf_id == 1
+    assert index.find_last_before(1, 101).rf_id == 2
+    assert index.find_last_before(2, 101).rf_id == 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    ops_by_tid = {
+        tid: [
+            make_op(rng.randint(-2, 60), rng.choice(["cpu_op", "user_annotation", "kernel"]), rf_id)
+            for rf_id in range(rng.randint(0, 30))
+        ]
+        for tid in rng.sample(range(100), 5)
+    }
+    index = CpuTimelineIndex(ops_by_tid)
+    for _ in range(200):
+        exclude_tid = rng.choice(list(ops_by_tid))
+        timestamp = rng.randint(-2, 65)
+        assert index.find_last_before(exclude_tid, timestamp) is scan_last_before(ops_by_tid, exclude_tid, timestamp)
@@ -0,0 +1,50 @@
+import pytest
+from chakra.src.trace_link.host_op_table import HostOp, HostOpTable
+
+
+def make_node(node_id, parent, rf_id=None, name="aten::op"):
+    attrs = [{"name": "rf_id", "type": "uint64", "value": rf_id}] if rf_id is not None else []
+    return {"id": node_id, "name": name, "ctrl_deps": parent, "attrs": attrs}
+
+
+def test_keeps_operators_reachable_from_root_sorted_by_id():
+    nodes = [
+        make_node(4, 2, rf_id=40),
+        make_node(1, 0, name="root"),
+        make_node(2, 1, rf_id=20),
+        make_node(3, 1, rf_id=30),
+        make_node(5, 99),  # Its parent is not in the trace.
+    ]
+
+    table = HostOpTable.from_nodes(nodes)
+
+    assert list(table) == [
+        HostOp(1, None, "root", None),
+        HostOp(2, 20, "aten::op", 1),
+        HostOp(3, 30, "aten::op", 1),
+        HostOp(4, 40, "aten::op", 2),
+    ]
+    assert len(table) == 4
+    assert table[3] == HostOp(4, 40, "aten::op", 2)
+
+
+def test_reads_older_schema_fields():
+    nodes = [{"id": 1, "name": "root", "parent": 0}, {"id": 2, "name": "aten::add", "parent": 1, "rf_id": 8}]
+    assert list(HostOpTable.from_nodes(nodes)) == [HostOp(1, None, "root", None), HostOp(2, 8, "aten::add", 1)]
+
+
+def test_later_node_replaces_earlier_node_with_same_id():
+    nodes = [make_node(1, 0), make_node(2, 1, rf_id=1), make_node(2, 1, rf_id=2)]
+    assert [op.rf_id for op in HostOpTable.from_nodes(nodes)] == [None, 2]
+
+
+def test_deep_trace_does_not_recurse():
+    nodes = [make_node(node_id, node_id - 1, rf_id=node_id) for node_id in range(1, 200_001)]
+    table = HostOpTable.from_nodes(nodes)
+    assert len(table) == 200_000
+    assert table[-1] == HostOp(200_000, 200_000, "aten::op", 199_999)
+
+
+def test_missing_root_raises():
+    with pytest.raises(ValueError):
+        HostOpTable.from_nodes([make_node(2, 1)])
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+from chakra.src.trace_link.inter_thread_order import compute_inter_thread_deps, enforce_inter_thread_order
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+from chakra.src.trace_link.trace_linker import TraceLinker
+
+
+def make_op(rng, tid, rf_id):
+    return KinetoOperator(
+        {
+            "cat": rng.choice(["cpu_op", "user_annotation", "cuda_runtime"]),
+            "ts": rng.choice([rng.randint(-5, 400), rng.randint(0, 400) + 0.5]),
+            "dur": rng.randint(0, 40),
+            "tid": tid,
+            "args": {"Record function id": rng.choice([rf_id, rf_id, None, 0])},
+        }
+    )
+
+
+def make_ops_by_tid(seed):
+    rng = random.Random(seed)
+    rf_ids = iter(range(1, 10_000))
+    return {
+        tid: [make_op(rng, tid, next(rf_ids)) for _ in range(rng.randint(0, 40))]
+        for tid in rng.sample(range(1, 100), rng.randint(1, 6))
+    }
+
+
+def test_empty():
+    ops, deps = compute_inter_thread_deps({})
+    assert ops == []
+    assert len(deps) == 0
+    enforce_inter_thread_order({1: [], 2: []})
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("threshold", [0, 15, 1000])
+def test_matches_per_thread_processing(seed, threshold):
+    expected = make_ops_by_tid(seed)
+    trace_linker = TraceLinker()
+    for tid, ops in expected.items():
+        trace_linker.process_thread_inter_thread_order(tid, ops, expected, threshold)
+
+    actual = make_ops_by_tid(seed)
+    enforce_inter_thread_order(actual, threshold)
+    assert [[op.inter_thread_dep for op in ops] for ops in actual.values()] == [
+        [op.inter_thread_dep for op in ops] for ops in expected.values()
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_presorted_matches_sorting(seed):
+    ops_by_tid = {tid: sorted(ops, key=lambda op: op.timestamp) for tid, ops in make_ops_by_tid(seed).items()}
+    ops, deps = compute_inter_thread_deps(ops_by_tid, 15)
+    presorted_ops, presorted_deps = compute_inter_thread_deps(ops_by_tid, 15, presorted=True)
+    assert presorted_ops == ops
+    assert presorted_deps.tolist() == deps.tolist()
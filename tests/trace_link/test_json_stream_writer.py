@@ -0,0 +1,36 @@
+import io
+
+import orjson
+import pytest
+from chakra.src.trace_link.json_stream_writer import dump_json_stream
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {},
+        {"nodes": []},
+        {"schema": "1.1.0", "nodes": [{"id": 1, "inputs": {"values": [[1, 2]]}}, {"id": 2, "ts": 1.5}]},
+        {"nodes": [{"id": i, "name": "n" * (i % 50)} for i in range(1000)], "finish_ts": 10, "unicode": "µs"},
+        {"nodes": {"id": 1}, "other": [1, 2]},
+    ],
+)
+@pytest.mark.parametrize("buffer_size", [1, 64, 1 << 20])
+def test_matches_orjson_dumps(data, buffer_size):
+    f = io.BytesIO()
+    dump_json_stream(data, f, buffer_size=buffer_size)
+    assert f.getvalue() == orjson.dumps(data)
+
+
+def test_writes_in_bounded_chunks():
+    writes = []
+
+    class Recorder:
+        def write(self, data):
+            writes.append(len(data))
+
+    data = {"nodes": [{"id": i} for i in range(10_000)]}
+    dump_json_stream(data, Recorder(), buffer_size=4096)
+    assert len(writes) > 1
+    assert max(writes) < 4096 + 100
+    assert sum(writes) == len(orjson.dumps(data))
@@ -0,0 +1,91 @@
+import json
+import random
+
+import pytest
+from chakra.src.trace_link.chakra_device_trace_loader import ChakraDeviceTraceLoader
+from chakra.src.trace_link.kineto_event_filter import KinetoEventFilter, parse_categories
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+
+
+def make_events(seed):
+    rng = random.Random(seed)
+    events = []
+    for i in range(200):
+        event = {
+            "cat": rng.choice(["cpu_op", "python_function", "cuda_runtime", "kernel", "gpu_memset", "ac2g"]),
+            "name": rng.choice(["aten::add", "cudaLaunchKernel", "cudaStreamSynchronize", "ProfilerStep#1"]),
+            "ph": rng.choice(["s", "f"]),
+            "ts": rng.randint(0, 100),
+            "dur": rng.randint(0, 20),
+            "tid": rng.choice([1, 2, 3, 4, None]),
+            "id": i,
+            "args": {"correlation": i, "External id": i},
+        }
+        if rng.random() < 0.1:
+            del event["cat"]
+        events.append(event)
+    return events
+
+
+def test_filter_drops_unlisted_categories():
+    events = make_events(0)
+    event_filter = KinetoEventFilter(["cpu_op", "kernel"])
+    kept = list(event_filter.filter(events))
+
+    assert kept == [event for event in events if event.get("cat") in ("cpu_op", "kernel")]
+    assert sum(event_filter.dropped_counts.values()) == len(events) - len(kept)
+    assert event_filter.dropped_counts[""] == sum("cat" not in event for event in events)
+
+
+def test_filter_drops_cuda_api_calls_other_than_launches():
+    events = make_events(2)
+    event_filter = KinetoEventFilter(["cuda_runtime"])
+    kept = list(event_filter.filter(events))
+
+    runtime_events = [event for event in events if event.get("cat") == "cuda_runtime"]
+    assert kept == [event for event in runtime_events if event["name"] == "cudaLaunchKernel"]
+    assert event_filter.dropped_counts["cuda_runtime (not a launch)"] == len(runtime_events) - len(kept) > 0
+    assert all(KinetoOperator(event).is_kernel_launch_op() for event in kept)
+
+
+def test_filter_keeps_everything_without_categories():
+    events = make_events(1)
+    event_filter = KinetoEventFilter(None)
+    assert list(event_filter.filter(events)) == events
+    assert not event_filter.dropped_counts
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_timing_boundaries_cover_dropped_events(seed):
+    events = make_events(seed)
+    sorted_ops = sorted(map(KinetoOperator, events), key=lambda op: op.timestamp)
+    expected = ChakraDeviceTraceLoader().construct_dev_data_structures(sorted_ops, "trace.json")
+
+    event_filter = KinetoEventFilter(["cpu_op"])
+    list(event_filter.filter(events))
+    assert event_filter.process_start_time == expected["kineto_process_start_time"]
+    assert event_filter.process_end_time == expected["kineto_process_end_time"]
+    assert list(event_filter.thread_info.items()) == list(expected["kineto_thread_info"].items())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_load_matches_unfiltered(tmp_path, seed):
+    events = make_events(seed)
+    trace_file = tmp_path / "kineto.json"
+    trace_file.write_text(json.dumps({"traceEvents": events}))
+
+    expected = ChakraDeviceTraceLoader(None).load(str(trace_file))
+    actual = ChakraDeviceTraceLoader().load(str(trace_file))
+    assert repr(actual) == repr(expected)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("cpu_op,kernel", ["cpu_op", "kernel"]),
+        (" cpu_op , kernel,", ["cpu_op", "kernel"]),
+        ("all", None),
+    ],
+)
+def test_parse_categories(value, expected):
+    assert parse_categories(value) == expected
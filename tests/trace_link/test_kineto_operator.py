@@ -1,3 +1,5 @@
+import copy
+
 import pytest
 
 from src.trace_link.kineto_operator import KinetoOperator
@@ -205,3 +207,15 @@ def test_is_gpu_op(category, expected):
     }
     operator = KinetoOperator(operator_data)
     assert operator.is_gpu_op() == expected
+
+
+def test_compact_representation(sample_operator_data):
+    """Test that operators have no per-instance dict and share their strings."""
+    first = KinetoOperator(sample_operator_data)
+    second = KinetoOperator({**sample_operator_data, "name": "".join(["cuda", "LaunchKernel"])})
+    assert not hasattr(first, "__dict__")
+    assert first.name is second.name
+    assert first.category is second.category
+
+    clone = copy.deepcopy(first)
+    assert repr(clone) == repr(first)
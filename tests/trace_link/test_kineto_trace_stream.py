@@ -0,0 +1,52 @@
+import gzip
+import json
+
+import pytest
+from chakra.src.trace_link.kineto_trace_stream import iter_trace_events
+
+TRACE = {
+    "schemaVersion": 1,
+    "deviceProperties": [{"id": 0, "name": "GPU {0}", "props": {"nested": [1, {"deep": "]}"}]}}],
+    "traceEvents": [
+        {"ph": "X", "cat": "cpu_op", "name": "aten::mm", "ts": 1.5, "dur": 2, "args": {"External id": 1}},
+        {"ph": "X", "cat": "kernel", "name": 'gemm<"}, {">', "ts": 3.25, "dur": 1.0, "args": {"stream": 7}},
+        {"ph": "i", "cat": "cpu_instant_event", "name": "x", "args": {"shapes": [[1, 2], [{"a": None}]]}},
+        {"ph": "X", "cat": "cpu_op", "name": "café\\", "ts": -1, "dur": 0, "args": {}},
+    ],
+    "traceName": "trace",
+}
+
+
+def write_trace(path, trace, indent=None):
+    data = json.dumps(trace, indent=indent).encode()
+    with gzip.open(path, "wb") if str(path).endswith("gz") else open(path, "wb") as f:
+        f.write(data)
+
+
+@pytest.mark.parametrize("file_name", ["trace.json", "trace.json.gz"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_trace_events(tmp_path, file_name, chunk_size, indent):
+    path = tmp_path / file_name
+    write_trace(path, TRACE, indent)
+    assert list(iter_trace_events(str(path), chunk_size)) == TRACE["traceEvents"]
+
+
+def test_empty_trace_events(tmp_path):
+    path = tmp_path / "trace.json"
+    write_trace(path, {"traceName": "trace", "traceEvents": []})
+    assert list(iter_trace_events(str(path))) == []
+
+
+def test_missing_trace_events(tmp_path):
+    path = tmp_path / "trace.json"
+    write_trace(path, {"traceName": "trace"})
+    with pytest.raises(ValueError, match="No traceEvents"):
+        list(iter_trace_events(str(path)))
+
+
+def test_truncated_trace(tmp_path):
+    path = tmp_path / "trace.json"
+    path.write_bytes(json.dumps(TRACE).encode()[:-40])
+    with pytest.raises(ValueError):
+        list(iter_trace_events(str(path), chunk_size=8))
@@ -0,0 +1,79 @@
+import random
+from unittest.mock import MagicMock
+
+import pytest
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+from chakra.src.trace_link.launcher_index import LauncherIndex
+from chakra.src.trace_link.trace_linker import TraceLinker
+
+
+def make_op(timestamp, tid, name="aten::op"):
+    op = MagicMock(spec=KinetoOperator, timestamp=timestamp, tid=tid)
+    op.name = name
+    return op
+
+
+def scan_closest_op(kineto_gpu_op, sorted_ops, sorted_ts, ts):
+    """Reference backward scan over the operators of all threads."""
+    index = sum(op_ts < ts for op_ts in sorted_ts)
+    if index == 0:
+        return None
+    closest_op = sorted_ops[index - 1]
+    is_nccl = "nccl" in kineto_gpu_op.name.lower()
+    if is_nccl and closest_op.name == "nccl:coalesced":
+        for new_index in range(index - 2, -1, -1):
+            potential_op = sorted_ops[new_index]
+            if potential_op.tid == kineto_gpu_op.tid and potential_op.name != "nccl:coalesced":
+                return potential_op
+        index = index - 1
+    if closest_op.tid == kineto_gpu_op.tid:
+        return closest_op
+    for i in range(index - 1, -1, -1):
+        op = sorted_ops[i]
+        if op.tid == kineto_gpu_op.tid:
+            if is_nccl and op.name == "nccl:coalesced":
+                continue
+            if op.timestamp <= ts:
+                return op
+    return None
+
+
+def make_sorted_ops(ops):
+    sorted_ops = sorted(ops, key=lambda op: op.timestamp)
+    return sorted_ops, [op.timestamp for op in sorted_ops]
+
+
+def test_finds_last_op_of_thread():
+    ops = [make_op(100, 1), make_op(150, 2), make_op(200, 1), make_op(250, 2)]
+    index = LauncherIndex(*make_sorted_ops(ops))
+    assert index.find_launcher(1, 260, False) is ops[2]
+    assert index.find_launcher(2, 250, False) is ops[1]
+    assert index.find_launcher(1, 100, False) is None
+    assert index.find_launcher(3, 300, False) is None
+
+
+def test_skips_nccl_coalesced_for_nccl_kernels():
+    ops = [make_op(100, 1), make_op(200, 1, "nccl:coalesced"), make_op(300, 2, "nccl:coalesced")]
+    index = LauncherIndex(*make_sorted_ops(ops))
+    assert index.find_launcher(1, 250, True) is ops[0]
+    assert index.find_launcher(1, 250, False) is ops[1]
+    assert index.find_launcher(2, 350, True) is ops[2]
+    assert index.find_launcher(2, 300, True) is None
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_backward_scan(seed):
+    rng = random.Random(seed)
+    ops = [
+        make_op(rng.randint(0, 50), rng.randint(1, 4), rng.choice(["aten::op", "nccl:coalesced", "nccl:all_reduce"]))
+        for _ in range(rng.randint(0, 60))
+    ]
+    sorted_ops, sorted_ts = make_sorted_ops(ops)
+    trace_linker = TraceLinker()
+    launcher_index = LauncherIndex(sorted_ops, sorted_ts)
+    for _ in range(100):
+        gpu_op = make_op(0, rng.randint(1, 5), rng.choice(["kernel", "ncclDevKernel"]))
+        ts = rng.randint(0, 55)
+        expected = scan_closest_op(gpu_op, sorted_ops, sorted_ts, ts)
+        assert trace_linker.find_closest_op(gpu_op, sorted_ops, sorted_ts, ts, launcher_index) is expected
+        assert trace_linker.find_closest_op(gpu_op, sorted_ops, sorted_ts, ts) is expected
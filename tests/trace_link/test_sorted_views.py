@@ -0,0 +1,39 @@
+import random
+
+import pytest
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+from chakra.src.trace_link.sorted_views import SortedViews
+
+
+def make_views(seed):
+    rng = random.Random(seed)
+    ops = sorted(
+        (
+            KinetoOperator(
+                {"cat": "cpu_op", "ts": rng.randint(0, 30), "dur": rng.randint(0, 10), "tid": rng.randint(1, 3)}
+            )
+            for _ in range(rng.randint(0, 50))
+        ),
+        key=lambda op: op.timestamp,
+    )
+    ops_by_tid = {}
+    for op in ops:
+        ops_by_tid.setdefault(op.tid, []).append(op)
+    return ops, ops_by_tid, SortedViews(ops, ops_by_tid)
+
+
+def test_views_copy_the_sorted_operators():
+    ops, ops_by_tid, views = make_views(0)
+    assert views.cpu_ops == ops
+    assert views.cpu_ops is not ops
+    assert views.cpu_op_ts == [op.timestamp for op in ops]
+    assert views.cpu_ops_by_tid is ops_by_tid
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ops_by_start_and_dur_matches_sort(seed):
+    _, ops_by_tid, views = make_views(seed)
+    for tid, ops in ops_by_tid.items():
+        expected = sorted(ops, key=lambda op: (op.timestamp, op.inclusive_dur))
+        assert views.ops_by_start_and_dur(tid) == expected
+        assert views.ops_by_start_and_dur(tid) is views.ops_by_start_and_dur(tid)
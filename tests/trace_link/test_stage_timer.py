@@ -0,0 +1,24 @@
+from unittest.mock import patch
+
+import pytest
+from chakra.src.trace_link.stage_timer import StageTimer
+
+
+def test_stages_accumulate_in_first_run_order():
+    timer = StageTimer()
+    with patch("time.perf_counter", side_effect=[0.0, 1.5, 2.0, 2.25, 3.0, 3.5]):
+        with timer.stage("load"):
+            pass
+        with timer.stage("link"):
+            pass
+        with timer.stage("load"):
+            pass
+    assert timer.durations == {"load": 2.0, "link": 0.25}
+    assert timer.report().splitlines() == ["load       2.000 s", "link       0.250 s", "total      2.250 s"]
+
+
+def test_stage_is_recorded_when_it_raises():
+    timer = StageTimer()
+    with pytest.raises(ValueError), timer.stage("load"):
+        raise ValueError
+    assert list(timer.durations) == ["load"]
@@ -1,14 +1,18 @@
+import copy
+import gzip
+import os
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
-from chakra.src.trace_link.kineto_operator import KinetoOperator
-from chakra.src.trace_link.trace_linker import TraceLinker
-from chakra.src.trace_link.unique_id_assigner import UniqueIdAssigner
-from et_replay.execution_trace import (
+from chakra.src.trace_link.host_op_table import (
     EXECUTION_TRACE_PROCESS_ANNOTATION,
     EXECUTION_TRACE_THREAD_ANNOTATION,
+    HostOp,
 )
-from et_replay.execution_trace import Node as PyTorchOperator
+from chakra.src.trace_link.kineto_operator import KinetoOperator
+from chakra.src.trace_link.trace_linker import TraceLinker
+from chakra.src.trace_link.unique_id_assigner import UniqueIdAssigner
 
 
 @pytest.fixture
@@ -28,7 +32,7 @@ def test_link_traces(mock_map_ops, mock_add_annotations, mock_construct_et_plus,
     mock_map_ops.return_value = ({}, {}, {}, {}, {})
     mock_construct_et_plus.return_value = {}
 
-    host_ops = [MagicMock(spec=PyTorchOperator)]
+    host_ops = [MagicMock(spec=HostOp)]
     kineto_cpu_ops = [MagicMock(spec=KinetoOperator)]
     sorted_kineto_cpu_ops = [MagicMock(spec=KinetoOperator)]
     sorted_kineto_cpu_op_ts = [100]
@@ -40,7 +44,7 @@ def test_link_traces(mock_map_ops, mock_add_annotations, mock_construct_et_plus,
     kineto_process_end_time = 300
 
     trace_linker.link_traces(
-        "pytorch_et_file",
+        {"nodes": []},
         host_ops,
         kineto_cpu_ops,
         sorted_kineto_cpu_ops,
@@ -80,14 +84,24 @@ def test_process_thread_inter_thread_order(mock_find_last, trace_linker):
     mock_find_last.assert_called()
 
 
-@patch("concurrent.futures.Future.result")
-@patch("chakra.src.trace_link.trace_linker.TraceLinker.process_thread_inter_thread_order")
-def test_enforce_inter_thread_order_exception(mock_process_thread, mock_future_result, trace_linker):
-    mock_future_result.side_effect = Exception("Test Exception")
-    kineto_tid_cpu_ops_map = {1: [MagicMock(spec=KinetoOperator)]}
+def test_enforce_inter_thread_order(trace_linker):
+    def make_op(timestamp, rf_id):
+        return MagicMock(
+            spec=KinetoOperator,
+            timestamp=timestamp,
+            inclusive_dur=10,
+            category="cpu_op",
+            rf_id=rf_id,
+            inter_thread_dep=None,
+        )
+
+    thread1_ops = [make_op(100, 1), make_op(2000, 2)]
+    thread2_ops = [make_op(150, 3), make_op(170, 4)]
+    kineto_tid_cpu_ops_map = {1: thread1_ops, 2: thread2_ops}
 
-    with pytest.raises(Exception, match="Test Exception"):
-        trace_linker.enforce_inter_thread_order(kineto_tid_cpu_ops_map)
+    assert trace_linker.enforce_inter_thread_order(kineto_tid_cpu_ops_map) is kineto_tid_cpu_ops_map
+    assert [op.inter_thread_dep for op in thread1_ops] == [None, 4]
+    assert [op.inter_thread_dep for op in thread2_ops] == [1, 1]
 
 
 @pytest.mark.parametrize(
@@ -247,7 +261,7 @@ def test_find_parent_cpu_op(mock_find_closest_op, trace_linker):
 
     assert result == kineto_runtime_op
     mock_find_closest_op.assert_called_once_with(
-        kineto_gpu_op, sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts, kineto_runtime_op.timestamp
+        kineto_gpu_op, sorted_kineto_cpu_ops, sorted_kineto_cpu_op_ts, kineto_runtime_op.timestamp, None
     )
 
 
@@ -256,7 +270,7 @@ def test_find_parent_cpu_op(mock_find_closest_op, trace_linker):
     "expected_timestamp, expected_inter_thread_dep",
     [
         (
-            MagicMock(spec=PyTorchOperator, id=1),
+            MagicMock(spec=HostOp, id=1),
             MagicMock(
                 spec=KinetoOperator,
                 ev_idx="1",
@@ -272,7 +286,7 @@ def test_find_parent_cpu_op(mock_find_closest_op, trace_linker):
             None,
         ),
         (
-            MagicMock(spec=PyTorchOperator, id=2),
+            MagicMock(spec=HostOp, id=2),
             MagicMock(
                 spec=KinetoOperator,
                 ev_idx="2",
@@ -326,7 +340,7 @@ def test_link_ops(
 
 
 def test_link_ops_with_no_gpu_ops(trace_linker):
-    host_op = MagicMock(spec=PyTorchOperator, id=1)
+    host_op = MagicMock(spec=HostOp, id=1)
     kineto_op = MagicMock(
         spec=KinetoOperator,
         ev_idx="1",
@@ -373,8 +387,8 @@ def test_get_inter_thread_dep_none(trace_linker):
 
 
 def test_link_gpu_ops(trace_linker):
-    # Create a mock PyTorch operator
-    host_op = MagicMock(spec=PyTorchOperator)
+    # Create a mock host operator
+    host_op = MagicMock(spec=HostOp)
     host_op.id = 123
 
     # Create mock Kineto GPU operators
@@ -387,10 +401,7 @@ def test_link_gpu_ops(trace_linker):
 
 
 @patch("chakra.src.trace_link.trace_linker.TraceLinker.process_op_and_dependents")
-@patch("builtins.open", new_callable=MagicMock)
-@patch("json.load")
-def test_construct_et_plus_data(mock_json_load, mock_open, mock_process_op_and_dependents, trace_linker):
-    mock_json_load.return_value = {"nodes": [{"id": 1}, {"id": 2}]}
+def test_construct_et_plus_data(mock_process_op_and_dependents, trace_linker):
     mock_process_op_and_dependents.side_effect = lambda x, *args: [{"id": x["id"] + 2}]
 
     host_op_id_to_kineto_ops_map = {1: [], 2: []}
@@ -400,7 +411,7 @@ def test_construct_et_plus_data(mock_json_load, mock_open, mock_process_op_and_d
     host_op_id_to_inter_thread_dep_map = {1: None, 2: None}
 
     pytorch_et_plus_data = trace_linker.construct_et_plus_data(
-        "path/to/pytorch_et_file",
+        {"nodes": [{"id": 1}, {"id": 2}]},
         host_op_id_to_kineto_ops_map,
         host_op_id_to_inclusive_dur_map,
         host_op_id_to_exclusive_dur_map,
@@ -502,13 +513,81 @@ def test_process_dependent_gpu_ops(trace_linker, orig_op_id, cpu_op, kineto_gpu_
             assert updated_gpu_op["pg_name"] == kineto_gpu_op_objects[i].pg_name
 
 
-@patch("builtins.open", new_callable=MagicMock)
-@patch("orjson.dumps")
-def test_dump_chakra_execution_trace_plus(mock_json_dump, mock_open, trace_linker):
-    trace_linker.pytorch_et_plus_data = {"nodes": [{"id": 1}, {"id": 2}]}
-    trace_linker.dump_chakra_execution_trace_plus(trace_linker.pytorch_et_plus_data, "output.json")
+@pytest.mark.parametrize(
+    "file_name, compress_threads", [("output.json", 1), ("output.json.gz", 1), ("output.json.gz", 2)]
+)
+def test_dump_chakra_execution_trace_plus(trace_linker, tmp_path, file_name, compress_threads):
+    data = {"schema": "1.1.0", "pid": 7, "nodes": [{"id": 2, "name": "b"}, {"id": 1, "name": "a"}], "finish_ts": 9}
+    output_file = (tmp_path / file_name).as_posix()
+    # An earlier output placed from a trace cache is replaced, not written through.
+    cache_entry = tmp_path / "cache_entry"
+    cache_entry.write_bytes(b"cached")
+    os.link(cache_entry, output_file)
+
+    trace_linker.dump_chakra_execution_trace_plus(data, output_file, compress_threads)
+
+    assert cache_entry.read_bytes() == b"cached"
+
+    with gzip.open(output_file, "rb") if file_name.endswith("gz") else open(output_file, "rb") as f:
+        assert f.read() == orjson.dumps(
+            {"schema": "1.1.0", "pid": 7, "nodes": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}], "finish_ts": 9}
+        )
+
+
+def test_sort_nodes_by_id(trace_linker):
+    nodes = [{"id": 0}, {"id": 1}, {"id": 1}, {"id": 5}]
+    assert trace_linker.sort_nodes_by_id(nodes) is nodes
+    # New IDs are assigned to every host node right before the GPU nodes created for it, so the ET+ nodes are
+    # already sorted and kept as they are.
+    et_plus_nodes = [{"id": 1, "name": "host"}, {"id": 2, "name": "gpu"}, {"id": 3, "name": "host"}]
+    assert trace_linker.sort_nodes_by_id(et_plus_nodes) is et_plus_nodes
+    assert trace_linker.sort_nodes_by_id([{"id": 3}, {"id": 1}, {"id": 2}]) == [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert trace_linker.sort_nodes_by_id([]) == []
+
+
+def test_process_dependent_gpu_ops_matches_deep_copies(trace_linker):
+    cpu_op = {
+        "id": 7,
+        "name": "aten::all_reduce",
+        "ctrl_deps": 3,
+        "inputs": {"values": [[1, 2, 3, 4, 5, 6]], "shapes": [[4, 8]], "types": ["Tensor(float)"]},
+        "outputs": {"values": [[7, 8, 9, 4, 5, 6]], "shapes": [[4, 8]], "types": ["Tensor(float)"]},
+        "attrs": [{"name": "rf_id", "type": "uint64", "value": 2}],
+        "ts": 100,
+    }
+    gpu_ops = [
+        KinetoOperator({"cat": "kernel", "name": name, "ph": "X", "ts": ts, "dur": 5, "args": {"stream": 7, **args}})
+        for name, ts, args in [
+            ("ncclDevKernel_AllReduce", 300, {"Process Group Name": "0"}),
+            ("vectorized_elementwise_kernel", 200, {}),
+        ]
+    ]
+
+    expected_ids = iter([100, 101])
+    expected = []
+    for gpu_op in sorted(gpu_ops, key=lambda x: x.timestamp):
+        gpu_node = copy.deepcopy(cpu_op)
+        gpu_node.update(
+            {
+                "id": next(expected_ids),
+                "ctrl_deps": 7,
+                "inputs": cpu_op["inputs"],
+                "outputs": cpu_op["outputs"],
+                "cat": gpu_op.category,
+                "name": gpu_op.name,
+                "ph": gpu_op.phase,
+                "inclusive_dur": gpu_op.inclusive_dur,
+                "exclusive_dur": gpu_op.exclusive_dur,
+                "ts": gpu_op.timestamp,
+                "stream": gpu_op.stream,
+                **({"pg_name": gpu_op.pg_name} if gpu_op.is_inter_gpu_comms_op() else {}),
+            }
+        )
+        expected.append(gpu_node)
+
+    trace_linker.id_assigner.generate_new_id = MagicMock(side_effect=[100, 101])
+    gpu_nodes = trace_linker.process_dependent_gpu_ops(cpu_op, 7, {7: gpu_ops})
 
-    mock_open.assert_called_once_with("output.json", "w")
-    mock_open.return_value.__enter__.assert_called_once()
-    mock_open.return_value.__exit__.assert_called_once()
-    mock_json_dump.assert_called_once_with({"nodes": [{"id": 1}, {"id": 2}]})
+    assert orjson.dumps(gpu_nodes) == orjson.dumps(expected)
+    assert all(gpu_node["attrs"] is cpu_op["attrs"] for gpu_node in gpu_nodes)
+    assert cpu_op["id"] == 7 and cpu_op["name"] == "aten::all_reduce"